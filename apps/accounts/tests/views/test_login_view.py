@@ -4,6 +4,8 @@ from rest_framework import status
 from django.core.cache import cache
 from unittest.mock import patch
 
+from apps.shop.tests.factories import ProductFactory
+
 @pytest.mark.django_db
 def test_login_with_valid_email(api_client, user_factory):
     user = user_factory
@@ -52,3 +54,20 @@ def test_login_missing_username(api_client):
     response = api_client.post(reverse('accounts:login-request'),data={})
     assert response.status_code == status.HTTP_400_BAD_REQUEST
     assert 'username' in response.data
+
+@pytest.mark.django_db
+def test_login_verify_merges_session_cart(api_client, user_factory):
+    user = user_factory
+    user.set_password('secret-password')
+    user.save()
+    product = ProductFactory(stock=10)
+    api_client.post(reverse('cart:cart-add'), {'product': product.id})
+    cache.set('user_email:merge-request', user.email)
+
+    response = api_client.post(reverse('accounts:login-verify'), {'request_id': 'merge-request', 'password': 'secret-password'})
+    assert response.status_code == status.HTTP_200_OK
+    assert api_client.get(reverse('cart:cart-list')).data['items'] == []
+
+    api_client.credentials(HTTP_AUTHORIZATION=f"Bearer {response.data['access']}")
+    items = api_client.get(reverse('cart:cart-list')).data['items']
+    assert [(item['product']['id'], item['quantity']) for item in items] == [(product.id, 1)]
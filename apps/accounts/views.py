@@ -14,6 +14,8 @@ from drf_spectacular.utils import (
 )
 from drf_spectacular.types import OpenApiTypes
 
+from apps.cart.cart import Cart
+
 from .swagger.user_schema import (
     USER_ID_PARAMETER,
     DUPLICATE_USER_EXAMPLES,
@@ -723,6 +725,7 @@ class LoginVerify(views.APIView):
                 user = ShopUser.objects.get(email=stored_email)
 
                 if user.check_password(password):
+                    Cart(request).merge_into(user)
                     return Response(JwtService.generate_token(user))
 
             except ShopUser.DoesNotExist:
@@ -736,6 +739,7 @@ class LoginVerify(views.APIView):
                 if stored_otp != password:
                     return Response({'error': 'Invalid otp'}, status=status.HTTP_400_BAD_REQUEST)
 
+                Cart(request).merge_into(user)
                 return Response(JwtService.generate_token(user))
 
             except ShopUser.DoesNotExist:
@@ -1,3 +1,15 @@
 from django.contrib import admin
 
-# Register your models here.
+from .models import Cart, CartLine
+
+
+class CartLineInline(admin.TabularInline):
+    model = CartLine
+    raw_id_fields = ['product']
+
+
+@admin.register(Cart)
+class CartAdmin(admin.ModelAdmin):
+    list_display = ['user', 'updated']
+    raw_id_fields = ['user']
+    inlines = [CartLineInline]
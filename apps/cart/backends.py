@@ -0,0 +1,215 @@
+import uuid
+
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+from django_redis import get_redis_connection
+
+from .selectors.cart_selectors import get_user_cart_lines
+
+CART_SESSION_KEY = 'cart'
+CART_ID_SESSION_KEY = 'cart_id'
+
+ADD = 'add'
+DECREASE = 'decrease'
+REMOVE = 'remove'
+OPERATIONS = [ADD, DECREASE, REMOVE]
+
+# Applies a whole batch of line operations to one cart hash atomically, so parallel
+# requests never lose an update. ARGV[1] is the TTL, then five values per operation.
+APPLY_OPERATIONS_SCRIPT = '''
+for i = 2, #ARGV, 5 do
+    local product, op, amount = ARGV[i], ARGV[i + 1], tonumber(ARGV[i + 2])
+    local field = product .. ':quantity'
+    local quantity = tonumber(redis.call('HGET', KEYS[1], field) or '0')
+    if op == 'add' then
+        if quantity == 0 then
+            redis.call('HSET', KEYS[1], product .. ':price', ARGV[i + 3], product .. ':weight', ARGV[i + 4])
+        end
+        redis.call('HINCRBY', KEYS[1], field, amount)
+    elseif op == 'decrease' then
+        if quantity > 1 then
+            redis.call('HINCRBY', KEYS[1], field, math.max(quantity - amount, 1) - quantity)
+        end
+    elseif op == 'remove' then
+        redis.call('HDEL', KEYS[1], field, product .. ':price', product .. ':weight')
+    end
+end
+redis.call('EXPIRE', KEYS[1], ARGV[1])
+'''
+
+LINE_FIELDS = ['quantity', 'price', 'weight']
+
+USER_CART_KEY_PREFIX = 'user_cart:'
+DIRTY_USER_CARTS_KEY = 'user_carts:dirty'
+LOADED_FIELD = 'loaded'
+
+# Fills a user's hash from the database unless a concurrent request already did.
+# ARGV[1] is the TTL, then field/value pairs.
+LOAD_USER_CART_SCRIPT = '''
+if redis.call('EXISTS', KEYS[1]) == 0 then
+    redis.call('HSET', KEYS[1], unpack(ARGV, 2))
+    redis.call('EXPIRE', KEYS[1], ARGV[1])
+end
+'''
+
+
+def get_cart_backend(request):
+    user = getattr(request, 'user', None)
+    if user is not None and user.is_authenticated:
+        return UserCartBackend(user)
+    return import_string(settings.CART['BACKEND'])(request.session)
+
+
+def get_cart_id(session):
+    return session.setdefault(CART_ID_SESSION_KEY, uuid.uuid4().hex)
+
+
+def build_operation(product, op, quantity=1):
+    # Lines keep the list price; a discount code is taken off the subtotal once, at pricing.
+    return {
+        'product_id': str(product.id),
+        'op': op,
+        'quantity': quantity,
+        'price': product.price,
+        'weight': product.weight,
+        'stock': product.stock,
+    }
+
+
+def apply_operations(lines, operations):
+    # Same rules as the Redis script.
+    for operation in operations:
+        product_id = operation['product_id']
+        quantity = lines[product_id]['quantity'] if product_id in lines else 0
+        if operation['op'] == ADD:
+            if not quantity:
+                lines[product_id] = {'quantity': 0, 'price': operation['price'], 'weight': operation['weight']}
+            lines[product_id]['quantity'] += operation['quantity']
+        elif operation['op'] == DECREASE:
+            if quantity > 1:
+                lines[product_id]['quantity'] = max(quantity - operation['quantity'], 1)
+        elif operation['op'] == REMOVE:
+            lines.pop(product_id, None)
+    return lines
+
+
+class SessionCartBackend:
+    """
+    Keeps the cart as a dict inside the session, which is rewritten on every change.
+    """
+    def __init__(self, session):
+        self.session = session
+        self.cart_id = get_cart_id(self.session)
+        if not self.session.get(CART_SESSION_KEY):
+            self.session[CART_SESSION_KEY] = {}
+
+    def get_lines(self):
+        return self.session[CART_SESSION_KEY]
+
+    def apply(self, operations):
+        apply_operations(self.get_lines(), operations)
+        self.save()
+
+    def clear(self):
+        self.session[CART_SESSION_KEY] = {}
+        self.save()
+
+    def save(self):
+        self.session.modified = True
+
+
+class RedisCartBackend:
+    """
+    Keeps every cart in its own Redis hash with `<product>:quantity|price|weight`
+    fields. Changes touch single fields, and the session only stores the cart id.
+    """
+    script = APPLY_OPERATIONS_SCRIPT
+
+    def __init__(self, session):
+        self.session = session
+        self.connection = get_redis_connection('default')
+        self.cart_id = get_cart_id(self.session)
+        self.key = f'cart:{self.cart_id}'
+        self.ttl = settings.CART['TTL']
+
+    def get_lines(self):
+        return self.parse_lines(self.connection.hgetall(self.key))
+
+    @staticmethod
+    def parse_lines(fields):
+        lines = {}
+        for field, value in fields.items():
+            product_id, name = field.decode().rsplit(':', 1)
+            lines.setdefault(product_id, {})[name] = int(value)
+        # A line is only complete once its quantity exists; skip leftovers of a concurrent remove.
+        return {product_id: line for product_id, line in lines.items() if 'quantity' in line}
+
+    def apply(self, operations):
+        args = [self.ttl]
+        for operation in operations:
+            args += [
+                operation['product_id'], operation['op'], operation['quantity'], operation['price'], operation['weight'],
+            ]
+        return self.connection.register_script(self.script)(keys=self.get_script_keys(), args=args)
+
+    def get_script_keys(self):
+        return [self.key]
+
+    def clear(self):
+        self.connection.delete(self.key)
+
+    def save(self):
+        pass
+
+
+class UserCartBackend(RedisCartBackend):
+    """
+    Write-behind cache in front of the Cart and CartLine tables. Reads and changes go to
+    the user's Redis hash, filled from the database on a miss; changed carts are queued
+    in a set and written back in batches by CartPersistenceService.flush().
+    """
+    # Returns 0 for a cart that is not cached yet so it can be loaded first. A loaded hash
+    # always carries LOADED_FIELD, so an empty cart is still a cache hit.
+    script = (
+        "if redis.call('EXISTS', KEYS[1]) == 0 then\n    return 0\nend\n"
+        + APPLY_OPERATIONS_SCRIPT
+        + "redis.call('SADD', KEYS[2], KEYS[1])\nreturn 1\n"
+    )
+
+    def __init__(self, user):
+        self.user = user
+        self.connection = get_redis_connection('default')
+        self.cart_id = f'user-{user.pk}'
+        self.key = f'{USER_CART_KEY_PREFIX}{user.pk}'
+        self.ttl = settings.CART['TTL']
+
+    def get_script_keys(self):
+        return [self.key, DIRTY_USER_CARTS_KEY]
+
+    def get_lines(self):
+        fields = self.connection.hgetall(self.key)
+        if not fields:
+            self.load()
+            fields = self.connection.hgetall(self.key)
+        fields.pop(LOADED_FIELD.encode(), None)
+        return self.parse_lines(fields)
+
+    def load(self):
+        args = [self.ttl, LOADED_FIELD, 1]
+        for product_id, quantity, price, weight in get_user_cart_lines(self.user.pk):
+            args += [f'{product_id}:quantity', quantity, f'{product_id}:price', price, f'{product_id}:weight', weight]
+        self.connection.register_script(LOAD_USER_CART_SCRIPT)(keys=[self.key], args=args)
+
+    def apply(self, operations):
+        if not super().apply(operations):
+            self.load()
+            super().apply(operations)
+
+    def clear(self):
+        with self.connection.pipeline() as pipeline:
+            pipeline.delete(self.key)
+            pipeline.hset(self.key, LOADED_FIELD, 1)
+            pipeline.expire(self.key, self.ttl)
+            pipeline.sadd(DIRTY_USER_CARTS_KEY, self.key)
+            pipeline.execute()
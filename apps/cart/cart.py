@@ -1,88 +1,156 @@
-from apps.shop.models import Product, Discount
+from django.conf import settings
+
+from apps.shop.models import Discount
+from apps.shop.services.discount_services import DiscountRegistry
+from apps.shop.services.reservation_services import StockReservationService
+from apps.shop.selectors.product_selectors import filter_products_by_ids
+
+from .backends import ADD, DECREASE, REMOVE, UserCartBackend, apply_operations, build_operation, get_cart_backend
+from .services import CartPricingService
 
 class Cart:
     def __init__(self, request):
         self.session = request.session
-        cart = self.session.get('cart')
-        if not cart:
-            cart = self.session['cart'] = {}
-        self.cart = cart
+        self.backend = get_cart_backend(request)
+        self.holder = StockReservationService.get_cart_holder(self.backend.cart_id)
+        self._lines = None
+
+    @property
+    def cart(self):
+        # Read once per instance; every change below drops the copy.
+        if self._lines is None:
+            self._lines = self.backend.get_lines()
+            self._pricing = None
+        return self._lines
 
     def add(self, product):
-        product_id = str(product.id)
-        if product_id not in self.cart:
-            self.cart[product_id] = {'quantity': 1, 'price': product.price, 'weight': product.weight}
-        else:
-            if self.cart[product_id]['quantity'] < product.stock:
-                self.cart[product_id]['quantity'] += 1
-        self.save()
+        self.apply([build_operation(product, ADD)])
 
     def decrease(self, product):
-        product_id = str(product.id)
-        if self.cart[product_id]['quantity'] > 1:
-            self.cart[product_id]['quantity'] -= 1
-        self.save()
+        self.apply([build_operation(product, DECREASE)])
 
     def remove(self, product):
-        product_id = str(product.id)
-        if self.cart[product_id]['quantity'] > 0:
-            del self.cart[product_id]
-        self.save()
+        self.apply([build_operation(product, REMOVE)])
+
+    def apply(self, operations, strict=False):
+        # Holds grow and shrink by what the operations change, so parallel requests add up;
+        # adds alone change them by their own quantities and skip reading the lines. Adds
+        # that fell short are trimmed to what was reserved, and in strict mode a shortage
+        # applies nothing. Returns the ids of the products that fell short.
+        lines = self.cart if any(operation['op'] != ADD for operation in operations) else {}
+        after = apply_operations({product_id: dict(line) for product_id, line in lines.items()}, operations)
+        changes = {}
+        for operation in operations:
+            product_id = operation['product_id']
+            quantity = after[product_id]['quantity'] if product_id in after else 0
+            before = lines[product_id]['quantity'] if product_id in lines else 0
+            changes[product_id] = (quantity - before, operation['stock'])
+        shortfalls = StockReservationService.reserve(
+            self.holder, changes, settings.STOCK_RESERVATIONS['CART_TTL'], strict=strict, relative=True
+        )
+        short = [int(product_id) for product_id, shortfall in shortfalls.items() if shortfall]
+        if strict and short:
+            return short
+
+        trimmed = []
+        for operation in reversed(operations):
+            if operation['op'] == ADD and shortfalls[operation['product_id']]:
+                cut = min(shortfalls[operation['product_id']], operation['quantity'])
+                shortfalls[operation['product_id']] -= cut
+                operation = {**operation, 'quantity': operation['quantity'] - cut}
+            if operation['quantity']:
+                trimmed.append(operation)
+        self.backend.apply(trimmed[::-1])
+        self._lines = None
+        return short
+
+    def reserve(self, strict=True, items=None):
+        # Renews the holds of every line, e.g. before checkout once they may have expired.
+        # Callers that already iterated the cart pass its items to skip reloading the products.
+        items = self if items is None else items
+        quantities = {str(item['product'].id): (item['quantity'], item['product'].stock) for item in items}
+        shortfalls = StockReservationService.reserve(
+            self.holder, quantities, settings.STOCK_RESERVATIONS['CART_TTL'], strict=strict
+        )
+        return [int(product_id) for product_id, shortfall in shortfalls.items() if shortfall]
+
+    def transfer_reservations(self, order_id):
+        # An order keeps the cart's holds until it is paid or its own TTL runs out.
+        StockReservationService.transfer(
+            self.holder,
+            StockReservationService.get_order_holder(order_id),
+            self.cart.keys(),
+            settings.STOCK_RESERVATIONS['ORDER_TTL'],
+        )
+
+    def merge_into(self, user):
+        # Adds every line to the user's cart in one write and hands the holds over with them.
+        lines = self.cart
+        if not lines:
+            return
+        backend = UserCartBackend(user)
+        backend.apply([
+            {'product_id': product_id, 'op': ADD, **line}
+            for product_id, line in lines.items()
+        ])
+        StockReservationService.transfer(
+            self.holder,
+            StockReservationService.get_cart_holder(backend.cart_id),
+            lines.keys(),
+            settings.STOCK_RESERVATIONS['CART_TTL'],
+        )
+        self.backend.clear()
+        self._lines = None
 
     def clear(self):
-        del self.session['cart']
-        self.save()
+        StockReservationService.release(self.holder, self.cart.keys())
+        self.backend.clear()
+        self._lines = None
 
     def apply_discount(self, code):
-        try:
-            discount = Discount.objects.get(code=code)
-        except Discount.DoesNotExist:
+        discount = DiscountRegistry.get(code)
+        if discount is None and not Discount.objects.filter(code=code).exists():
             return {'error': 'Invalid discount code'}
-        if not discount.is_valid():
+        if discount is None or not DiscountRegistry.is_valid(discount):
             return {'error': 'This discount code has expired'}
         self.session['discount_code'] = code
+        self._pricing = None
         self.save()
         return {'message': 'discount code Successfully applied'}
 
+    def get_pricing(self, subscription=None):
+        # Priced once per instance and subscription; reloading the lines after a change drops it.
+        lines = self.cart
+        if self._pricing is None or self._pricing[0] is not subscription:
+            pricing = CartPricingService.price(lines.values(), self.session.get('discount_code'), subscription)
+            self._pricing = (subscription, pricing)
+        return self._pricing[1]
+
     def get_discount_amount(self):
-        code = self.session.get('discount_code')
-        try:
-            discount = Discount.objects.get(code=code)
-        except Discount.DoesNotExist:
-            return 0
-        if not discount.is_valid():
-            return 0
-        return discount.value / 100 * self.get_total_price()
+        return self.get_pricing().discount
 
     def subscription_amount(self, subscription):
-        return subscription.discount() / 100 * self.get_total_price()
+        return self.get_pricing(subscription).subscription_discount
 
     def get_post_price(self):
-        weight = sum(item['weight'] * item['quantity'] for item in self.cart.values())
-        if weight < 1000:
-            return 0
-        elif 1000 <= weight <= 2000:
-            return 30000
-        else:
-            return 50000
+        return self.get_pricing().shipping
 
     def get_total_price(self):
-        price = sum(item['price'] * item['quantity'] for item in self.cart.values())
-        return price
+        return self.get_pricing().subtotal
 
     def get_final_price(self):
-        return self.get_total_price() + self.get_post_price() - self.get_discount_amount()
+        return self.get_pricing().final_price
 
     def __len__(self):
         return sum(item['quantity'] for item in self.cart.values())
 
     def __iter__(self):
         product_ids = self.cart.keys()
-        products = Product.objects.filter(id__in=product_ids)
+        products = filter_products_by_ids(product_ids)
         for product in products:
             self.cart[str(product.id)]['product'] = product
         for item in self.cart.values():
             yield item
 
     def save(self):
-        self.session.modified = True
\ No newline at end of file
+        self.backend.save()
\ No newline at end of file
@@ -0,0 +1,81 @@
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+from importlib import import_module
+from types import SimpleNamespace
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.test import override_settings
+
+from apps.cart.cart import Cart
+
+BACKENDS = {
+    'session': 'apps.cart.backends.SessionCartBackend',
+    'redis': 'apps.cart.backends.RedisCartBackend',
+}
+
+
+class Command(BaseCommand):
+    help = (
+        'Compare cart backends by replaying add requests against one cart: load the session, '
+        'add a product, save the session if it changed.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--lines', type=int, default=50, help='Distinct products already in the cart.')
+        parser.add_argument('--requests', type=int, default=2_000)
+        parser.add_argument('--workers', type=int, default=8, help='Requests replayed in parallel.')
+        parser.add_argument('--output', help='Write results to this JSON file.')
+
+    def handle(self, *args, **options):
+        session_store = import_module(settings.SESSION_ENGINE).SessionStore
+        products = [
+            SimpleNamespace(id=product_id, price=1000, weight=100, stock=10 ** 9)
+            for product_id in range(1, options['lines'] + 1)
+        ]
+
+        results = []
+        for name, backend in BACKENDS.items():
+            with override_settings(CART={**settings.CART, 'BACKEND': backend}):
+                result = self.replay(name, session_store, products, options['requests'], options['workers'])
+            results.append(result)
+            self.stdout.write(
+                f"{name:<8} {result['requests_per_second']:>9.0f} req/s  "
+                f"{result['lost_updates']:>6} lost updates"
+            )
+
+        if options['output']:
+            with open(options['output'], 'w') as output:
+                json.dump(results, output, indent=2)
+            self.stdout.write(self.style.SUCCESS(f"Results written to {options['output']}"))
+
+    @staticmethod
+    def replay(name, session_store, products, requests, workers):
+        session = session_store()
+        cart = Cart(SimpleNamespace(session=session))
+        for product in products:
+            cart.add(product)
+        session.save()
+
+        def request_cycle(index):
+            request_session = session_store(session.session_key)
+            Cart(SimpleNamespace(session=request_session)).add(products[index % len(products)])
+            if request_session.modified:
+                request_session.save()
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            list(executor.map(request_cycle, range(requests)))
+        elapsed = time.perf_counter() - start
+
+        cart = Cart(SimpleNamespace(session=session_store(session.session_key)))
+        added = len(cart) - len(products)
+        cart.clear()
+        session.delete()
+        return {
+            'backend': name,
+            'requests': requests,
+            'requests_per_second': requests / elapsed,
+            'lost_updates': requests - added,
+        }
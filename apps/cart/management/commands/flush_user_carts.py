@@ -0,0 +1,23 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from apps.cart.services import CartPersistenceService
+
+
+class Command(BaseCommand):
+    help = (
+        'Write the cached carts of signed-in users that changed since the last flush back to the database. '
+        'Run it with --interval as a long-lived worker, or schedule it every few seconds.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--interval', type=float, default=0, help='Keep flushing every this many seconds.')
+
+    def handle(self, *args, **options):
+        while True:
+            flushed = CartPersistenceService.flush()
+            self.stdout.write(self.style.SUCCESS(f'Flushed {flushed} carts'))
+            if not options['interval']:
+                break
+            time.sleep(options['interval'])
@@ -1,3 +1,28 @@
+from django.conf import settings
 from django.db import models
 
-# Create your models here.
+from apps.shop.models import Product
+
+
+class Cart(models.Model):
+    user = models.OneToOneField(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, primary_key=True, related_name='cart')
+    updated = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f'cart {self.user_id}'
+
+
+class CartLine(models.Model):
+    cart = models.ForeignKey(Cart, related_name='lines', on_delete=models.CASCADE)
+    product = models.ForeignKey(Product, related_name='cart_lines', on_delete=models.CASCADE)
+    quantity = models.PositiveIntegerField(default=1)
+    price = models.PositiveIntegerField(default=0)
+    weight = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['cart', 'product'], name='cart_line_unique_product'),
+        ]
+
+    def __str__(self):
+        return f'{self.cart_id}: {self.product_id} x {self.quantity}'
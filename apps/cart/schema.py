@@ -24,6 +24,42 @@ CART_REMOVE_EXAMPLES = [
     )
 ]
 
+CART_BATCH_REQUEST_EXAMPLES = [
+    OpenApiExample(
+        name='Batch Operations',
+        value={
+            'operations': [
+                {'product': 1, 'op': 'add', 'quantity': 2},
+                {'product': 2, 'op': 'decrease', 'quantity': 1},
+                {'product': 3, 'op': 'remove'},
+            ]
+        },
+        description='Operations are applied in order and saved together.',
+        request_only=True
+    )
+]
+
+CART_BATCH_EXAMPLES = [
+    OpenApiExample(
+        name='Batch Applied Success',
+        value={'message': 'Cart updated'},
+        description='Response indicating every operation of the batch was applied.'
+    )
+]
+
+CART_BATCH_ERROR_EXAMPLES = [
+    OpenApiExample(
+        name='Unknown Products',
+        value={'operations': ['Products do not exist: [42]']},
+        description='Response when some products of the batch do not exist; nothing is applied.'
+    ),
+    OpenApiExample(
+        name='Not Enough Stock',
+        value={'operations': ['Not enough stock for products: [7]']},
+        description='Response when the batch would put more units in the cart than are in stock.'
+    )
+]
+
 CART_CLEAR_EXAMPLES = [
     OpenApiExample(
         name='Cart Cleared Success',
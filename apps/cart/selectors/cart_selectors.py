@@ -0,0 +1,9 @@
+from apps.cart.models import CartLine
+from apps.shop.models import Product
+
+
+def get_user_cart_lines(user_id):
+    return CartLine.objects.filter(cart_id=user_id).values_list('product_id', 'quantity', 'price', 'weight')
+
+def filter_existing_product_ids(product_ids):
+    return set(Product.objects.filter(id__in=product_ids).values_list('id', flat=True))
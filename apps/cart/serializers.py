@@ -1,6 +1,10 @@
 from rest_framework import serializers
 from apps.shop.serializers import ProductSerializer
 
+from .backends import OPERATIONS
+
+MAX_BATCH_OPERATIONS = 100
+
 class CartItemSerializer(serializers.Serializer):
     product = ProductSerializer()
     quantity = serializers.IntegerField()
@@ -25,12 +29,13 @@ class CartSerializer(serializers.Serializer):
             }
             for item in instance
         ]
+        pricing = instance.get_pricing()
         return {
             'items': items,
-            'discount_amount': instance.get_discount_amount(),
-            'post_price': instance.get_post_price(),
-            'total_price': instance.get_total_price(),
-            'final_price': instance.get_final_price()
+            'discount_amount': pricing.discount,
+            'post_price': pricing.shipping,
+            'total_price': pricing.subtotal,
+            'final_price': pricing.final_price
         }
 
 
@@ -38,5 +43,15 @@ class CartActionSerializer(serializers.Serializer):
     product = serializers.IntegerField()
 
 
+class CartOperationSerializer(serializers.Serializer):
+    product = serializers.IntegerField()
+    op = serializers.ChoiceField(choices=OPERATIONS)
+    quantity = serializers.IntegerField(min_value=1, default=1)
+
+
+class CartBatchSerializer(serializers.Serializer):
+    operations = CartOperationSerializer(many=True, allow_empty=False, max_length=MAX_BATCH_OPERATIONS)
+
+
 class DiscountSerializer(serializers.Serializer):
     code = serializers.CharField()
\ No newline at end of file
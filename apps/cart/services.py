@@ -1,5 +1,64 @@
+from dataclasses import dataclass
+
+from django.db import transaction
+
+from django_redis import get_redis_connection
+
 from apps.shop.models import Product, Discount
-from rest_framework.exceptions import NotFound
+from apps.shop.selectors.product_selectors import filter_cart_products_by_ids
+from apps.shop.services.discount_services import DiscountRegistry
+from rest_framework.exceptions import NotFound, ValidationError
+
+from .backends import DIRTY_USER_CARTS_KEY, LOADED_FIELD, USER_CART_KEY_PREFIX, RedisCartBackend, build_operation
+from .models import Cart as UserCart, CartLine
+from .selectors.cart_selectors import filter_existing_product_ids
+
+FLUSH_BATCH_SIZE = 1000
+
+# Shipping cost by total cart weight: up to each limit, else the heavy rate.
+SHIPPING_RATES = [(999, 0), (2000, 30000)]
+HEAVY_SHIPPING_COST = 50000
+
+
+@dataclass(frozen=True)
+class PriceBreakdown:
+    subtotal: int
+    weight: int
+    shipping: int
+    discount: float
+    subscription_discount: float
+    final_price: float
+
+
+class CartPricingService:
+    @staticmethod
+    def get_shipping_cost(weight):
+        for limit, cost in SHIPPING_RATES:
+            if weight <= limit:
+                return cost
+        return HEAVY_SHIPPING_COST
+
+    @staticmethod
+    def price(lines, discount_code=None, subscription=None):
+        subtotal = 0
+        weight = 0
+        for line in lines:
+            subtotal += line['price'] * line['quantity']
+            weight += line['weight'] * line['quantity']
+
+        discount = DiscountRegistry.get_valid(discount_code)
+        discount_amount = discount['value'] / 100 * subtotal if discount else 0
+        subscription_amount = subscription.discount() / 100 * subtotal if subscription else 0
+        shipping = CartPricingService.get_shipping_cost(weight)
+        return PriceBreakdown(
+            subtotal=subtotal,
+            weight=weight,
+            shipping=shipping,
+            discount=discount_amount,
+            subscription_discount=subscription_amount,
+            final_price=subtotal + shipping - discount_amount,
+        )
+
 
 class CartService:
     @staticmethod
@@ -25,3 +84,65 @@ class CartService:
         except Product.DoesNotExist:
             raise NotFound('Product does not exist')
         cart.remove(product)
+
+    @staticmethod
+    def apply_operations(cart, operations):
+        products = filter_cart_products_by_ids({operation['product'] for operation in operations}).in_bulk()
+        missing = sorted({operation['product'] for operation in operations} - products.keys())
+        if missing:
+            raise ValidationError({'operations': [f'Products do not exist: {missing}']})
+
+        short = cart.apply(
+            [
+                build_operation(products[operation['product']], operation['op'], operation['quantity'])
+                for operation in operations
+            ],
+            strict=True,
+        )
+        if short:
+            raise ValidationError({'operations': [f'Not enough stock for products: {sorted(short)}']})
+
+
+class CartPersistenceService:
+    @staticmethod
+    def flush(batch_size=FLUSH_BATCH_SIZE):
+        # Every changed cart is written once per flush, however many times it changed since.
+        connection = get_redis_connection('default')
+        flushed = 0
+        while keys := connection.spop(DIRTY_USER_CARTS_KEY, batch_size):
+            try:
+                flushed += CartPersistenceService.flush_batch(connection, [key.decode() for key in keys])
+            except Exception:
+                connection.sadd(DIRTY_USER_CARTS_KEY, *keys)
+                raise
+        return flushed
+
+    @staticmethod
+    def flush_batch(connection, keys):
+        with connection.pipeline(transaction=False) as pipeline:
+            for key in keys:
+                pipeline.hgetall(key)
+            hashes = pipeline.execute()
+
+        # An evicted hash has nothing to write; its last flushed state stays in the database.
+        carts = {}
+        for key, fields in zip(keys, hashes):
+            if fields.pop(LOADED_FIELD.encode(), None) is not None:
+                carts[int(key.removeprefix(USER_CART_KEY_PREFIX))] = RedisCartBackend.parse_lines(fields)
+
+        product_ids = filter_existing_product_ids({int(product_id) for lines in carts.values() for product_id in lines})
+        with transaction.atomic():
+            UserCart.objects.bulk_create(
+                [UserCart(user_id=user_id) for user_id in carts],
+                update_conflicts=True,
+                unique_fields=['user'],
+                update_fields=['updated'],
+            )
+            CartLine.objects.filter(cart_id__in=carts).delete()
+            CartLine.objects.bulk_create([
+                CartLine(cart_id=user_id, product_id=int(product_id), **line)
+                for user_id, lines in carts.items()
+                for product_id, line in lines.items()
+                if int(product_id) in product_ids
+            ])
+        return len(carts)
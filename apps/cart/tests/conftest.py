@@ -1,8 +1,15 @@
 import pytest
 
+from django.core.cache import cache
+
 from apps.shop.tests.factories import ProductFactory, DiscountFactory
 from rest_framework.test import APIClient
 
+@pytest.fixture(autouse=True)
+def clear_cache():
+    # Stock reservations are keyed by product id and outlive the rolled back products.
+    cache.clear()
+
 @pytest.fixture
 def api_client():
     return APIClient()
@@ -13,6 +20,6 @@ def discount_factory():
 
 @pytest.fixture
 def products_data():
-    product = ProductFactory()
-    second_product = ProductFactory()
+    product = ProductFactory(stock=10)
+    second_product = ProductFactory(stock=10)
     return product, second_product
\ No newline at end of file
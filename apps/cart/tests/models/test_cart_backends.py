@@ -0,0 +1,118 @@
+import json
+from concurrent.futures import ThreadPoolExecutor
+from importlib import import_module
+from types import SimpleNamespace
+
+from django.conf import settings
+from django.core.management import call_command
+
+import pytest
+
+from apps.cart.backends import ADD, DECREASE, REMOVE, build_operation
+from apps.cart.cart import Cart
+
+SessionStore = import_module(settings.SESSION_ENGINE).SessionStore
+
+def build_product(product_id=1, stock=1000):
+    return SimpleNamespace(id=product_id, price=100, weight=10, stock=stock)
+
+def open_cart(session_key=None):
+    session = SessionStore(session_key)
+    return Cart(SimpleNamespace(session=session)), session
+
+@pytest.fixture(params=['apps.cart.backends.RedisCartBackend', 'apps.cart.backends.SessionCartBackend'])
+def cart_backend(request, settings):
+    settings.CART = {**settings.CART, 'BACKEND': request.param}
+
+def test_cart_keeps_its_api_on_every_backend(cart_backend):
+    cart, session = open_cart()
+    first, second = build_product(1), build_product(2, stock=1)
+    for product in [first, first, first, second, second]:
+        cart.add(product)
+    cart.decrease(first)
+    assert cart.cart == {
+        '1': {'quantity': 2, 'price': 100, 'weight': 10},
+        '2': {'quantity': 1, 'price': 100, 'weight': 10},
+    }
+    assert len(cart) == 3
+    assert cart.get_total_price() == 300
+
+    cart.remove(first)
+    assert list(cart.cart) == ['2']
+    cart.clear()
+    assert len(cart) == 0
+
+def test_cart_applies_batches_on_every_backend(cart_backend):
+    cart, session = open_cart()
+    first, second, third = build_product(1), build_product(2, stock=3), build_product(3)
+    cart.add(third)
+    cart.apply([
+        build_operation(first, ADD, 5),
+        build_operation(second, ADD, 10),
+        build_operation(first, DECREASE, 2),
+        build_operation(third, REMOVE),
+        build_operation(second, DECREASE, 10),
+    ])
+    assert cart.cart == {
+        '1': {'quantity': 3, 'price': 100, 'weight': 10},
+        '2': {'quantity': 1, 'price': 100, 'weight': 10},
+    }
+
+def test_carts_share_stock_through_reservations(cart_backend):
+    (first, _), (second, _) = open_cart(), open_cart()
+    product = build_product(stock=3)
+    assert first.apply([build_operation(product, ADD, 2)]) == []
+    assert second.apply([build_operation(product, ADD, 2)]) == [1]
+    assert second.cart['1']['quantity'] == 1
+
+    first.remove(product)
+    second.add(product)
+    assert second.cart['1']['quantity'] == 2
+    assert first.apply([build_operation(product, ADD, 2)], strict=True) == [1]
+    assert first.cart == {}
+
+def test_redis_cart_survives_across_requests():
+    cart, session = open_cart()
+    cart.add(build_product())
+    session.save()
+
+    cart, _ = open_cart(session.session_key)
+    assert len(cart) == 1
+
+def test_redis_cart_does_not_rewrite_session_on_add():
+    cart, session = open_cart()
+    session.save()
+    cart, session = open_cart(session.session_key)
+    cart.add(build_product())
+    assert not session.modified
+
+def test_redis_cart_parallel_adds_are_not_lost():
+    cart, session = open_cart()
+    session.save()
+    product = build_product()
+
+    def add_from_new_request(_):
+        cart, request_session = open_cart(session.session_key)
+        cart.add(product)
+        if request_session.modified:
+            request_session.save()
+
+    with ThreadPoolExecutor(max_workers=16) as executor:
+        list(executor.map(add_from_new_request, range(200)))
+
+    cart, _ = open_cart(session.session_key)
+    assert cart.cart['1']['quantity'] == 200
+
+def test_redis_cart_parallel_adds_stop_at_stock():
+    cart, session = open_cart()
+    product = build_product(stock=25)
+    with ThreadPoolExecutor(max_workers=16) as executor:
+        list(executor.map(lambda _: Cart(SimpleNamespace(session=session)).add(product), range(100)))
+    assert cart.cart['1']['quantity'] == 25
+
+def test_benchmark_cart_backends(tmp_path):
+    output = tmp_path / 'benchmark.json'
+    call_command('benchmark_cart_backends', lines=3, requests=50, workers=4, output=str(output))
+    results = {result['backend']: result for result in json.loads(output.read_text())}
+    assert set(results) == {'session', 'redis'}
+    assert results['redis']['lost_updates'] == 0
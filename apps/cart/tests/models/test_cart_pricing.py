@@ -0,0 +1,31 @@
+import dataclasses
+
+import pytest
+
+from apps.cart.services import CartPricingService
+from apps.shop.tests.factories import DiscountFactory
+
+def build_lines(*lines):
+    return [{'price': price, 'quantity': quantity, 'weight': weight} for price, quantity, weight in lines]
+
+@pytest.mark.parametrize('weight, shipping', [(0, 0), (999, 0), (1000, 30000), (2000, 30000), (2001, 50000)])
+def test_cart_pricing_shipping_tiers(weight, shipping):
+    assert CartPricingService.price(build_lines((10, 1, weight))).shipping == shipping
+
+@pytest.mark.django_db
+def test_cart_pricing_breakdown():
+    discount = DiscountFactory(value=10)
+    pricing = CartPricingService.price(build_lines((1000, 2, 300), (500, 1, 600)), discount.code)
+    assert (pricing.subtotal, pricing.weight, pricing.shipping) == (2500, 1200, 30000)
+    assert pricing.discount == 250
+    assert pricing.subscription_discount == 0
+    assert pricing.final_price == 2500 + 30000 - 250
+
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        pricing.subtotal = 0
+
+@pytest.mark.django_db
+def test_cart_pricing_ignores_unknown_discount_code():
+    pricing = CartPricingService.price(build_lines((1000, 1, 0)), 'no-such-code')
+    assert pricing.discount == 0
+    assert pricing.final_price == 1000
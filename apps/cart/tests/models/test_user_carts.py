@@ -0,0 +1,91 @@
+from types import SimpleNamespace
+
+from django.contrib.auth.models import AnonymousUser
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from django_redis import get_redis_connection
+import pytest
+
+from apps.accounts.tests.factories import ShopUserFactory
+from apps.cart.backends import ADD, build_operation
+from apps.cart.cart import Cart
+from apps.cart.models import CartLine
+from apps.cart.services import CartPersistenceService
+from apps.shop.tests.factories import ProductFactory
+
+def open_user_cart(user, session=None):
+    return Cart(SimpleNamespace(session=session if session is not None else {}, user=user))
+
+def get_saved_lines(user):
+    return set(CartLine.objects.filter(cart_id=user.pk).values_list('product_id', 'quantity'))
+
+@pytest.mark.django_db
+def test_user_cart_writes_are_coalesced_into_one_flush():
+    user = ShopUserFactory()
+    first, second = ProductFactory.create_batch(2, stock=10)
+    cart = open_user_cart(user)
+    for product in [first, first, first, second]:
+        cart.add(product)
+    cart.decrease(first)
+    assert get_saved_lines(user) == set()
+
+    assert CartPersistenceService.flush() == 1
+    assert get_saved_lines(user) == {(first.id, 2), (second.id, 1)}
+    assert CartPersistenceService.flush() == 0
+
+@pytest.mark.django_db
+def test_user_cart_is_shared_across_devices_and_survives_eviction():
+    user = ShopUserFactory()
+    product = ProductFactory(stock=10)
+    open_user_cart(user).apply([build_operation(product, ADD, 3)])
+    CartPersistenceService.flush()
+
+    get_redis_connection('default').delete(f'user_cart:{user.pk}')
+    cart = open_user_cart(user, session={'cart_id': 'other-device'})
+    assert cart.cart == {str(product.id): {'quantity': 3, 'price': product.price, 'weight': product.weight}}
+    cart.add(product)
+    assert open_user_cart(user).cart[str(product.id)]['quantity'] == 4
+
+@pytest.mark.django_db
+def test_cleared_user_cart_is_flushed_empty():
+    user = ShopUserFactory()
+    product = ProductFactory(stock=10)
+    cart = open_user_cart(user)
+    cart.add(product)
+    CartPersistenceService.flush()
+    cart.clear()
+    CartPersistenceService.flush()
+    assert get_saved_lines(user) == set()
+    assert open_user_cart(user).cart == {}
+
+@pytest.mark.django_db
+def test_flush_query_count_does_not_grow_with_carts():
+    def flush_query_count(users):
+        for user in users:
+            open_user_cart(user).add(ProductFactory(stock=10))
+        with CaptureQueriesContext(connection) as context:
+            assert CartPersistenceService.flush() == len(users)
+        return len(context.captured_queries)
+
+    assert flush_query_count(ShopUserFactory.create_batch(1)) == flush_query_count(ShopUserFactory.create_batch(5))
+
+@pytest.mark.django_db
+def test_session_cart_merges_into_user_cart():
+    user = ShopUserFactory()
+    first, second = ProductFactory.create_batch(2, stock=3)
+    open_user_cart(user).add(first)
+
+    session = {}
+    anonymous_cart = open_user_cart(AnonymousUser(), session=session)
+    anonymous_cart.apply([build_operation(first, ADD, 2), build_operation(second, ADD)])
+    anonymous_cart.merge_into(user)
+
+    assert anonymous_cart.cart == {}
+    cart = open_user_cart(user)
+    assert {product_id: line['quantity'] for product_id, line in cart.cart.items()} == {
+        str(first.id): 3,
+        str(second.id): 1,
+    }
+    # The holds moved along with the lines, so the last unit of the first product stays taken.
+    assert cart.apply([build_operation(first, ADD)]) == [first.id]
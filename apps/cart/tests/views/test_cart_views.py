@@ -1,8 +1,19 @@
+from django.utils import timezone
+
+from datetime import timedelta
+from unittest.mock import patch
+
 from django.urls import reverse
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from rest_framework import status
+from rest_framework.test import APIClient
 
 import pytest
 
+from apps.accounts.tests.factories import ShopUserFactory
+from apps.shop.services.discount_services import DiscountRegistry
+from apps.shop.tests.factories import DiscountFactory, ProductFactory
 from apps.cart.tests.conftest import (
     api_client,
     products_data,
@@ -17,6 +28,27 @@ def test_cart_view(api_client, products_data, discount_factory):
     assert 'items' in response.data
 
 
+@pytest.mark.django_db
+def test_cart_view_query_count_is_constant(api_client):
+    def cart_view_query_count():
+        with CaptureQueriesContext(connection) as context:
+            response = api_client.get(reverse('cart:cart-list'))
+        assert response.status_code == status.HTTP_200_OK
+        return len(context.captured_queries)
+
+    def add_products(count):
+        for product in ProductFactory.create_batch(count):
+            product.tags.add('cart_tag')
+            api_client.post(reverse('cart:cart-add'), {'product': product.id})
+
+    add_products(1)
+    few_items_queries = cart_view_query_count()
+    add_products(5)
+    many_items_queries = cart_view_query_count()
+
+    assert few_items_queries == many_items_queries
+
+
 @pytest.mark.django_db
 def test_add_product_to_cart(api_client, products_data):
     products = products_data
@@ -82,3 +114,124 @@ def test_apply_discount(api_client, discount_factory, products_data):
     assert response.data['message'] == 'discount code Successfully applied'
 
 
+
+
+@pytest.mark.django_db
+def test_cart_view_with_discount_skips_discount_queries(api_client, discount_factory, products_data):
+    api_client.post(reverse('cart:cart-add'), {'product': products_data[0].id})
+    api_client.post(reverse('cart:cart-apply-discount'), {'code': discount_factory.code})
+    with CaptureQueriesContext(connection) as context:
+        response = api_client.get(reverse('cart:cart-list'))
+    assert response.status_code == status.HTTP_200_OK
+    assert not [query for query in context.captured_queries if 'shop_discount' in query['sql']]
+
+
+@pytest.mark.django_db
+def test_cart_view_prices_once(api_client, discount_factory, products_data):
+    for product in products_data:
+        api_client.post(reverse('cart:cart-add'), {'product': product.id})
+    api_client.post(reverse('cart:cart-apply-discount'), {'code': discount_factory.code})
+    with patch.object(DiscountRegistry, 'get_valid', wraps=DiscountRegistry.get_valid) as get_valid:
+        with CaptureQueriesContext(connection) as context:
+            response = api_client.get(reverse('cart:cart-list'))
+    assert response.status_code == status.HTTP_200_OK
+    # The cart's products and their tags prefetch; pricing itself never queries.
+    queries = [query['sql'] for query in context.captured_queries]
+    assert len(queries) == 2
+    assert queries[0].startswith('SELECT "shop_product"."id"')
+    assert 'taggit_taggeditem' in queries[1]
+    assert get_valid.call_count == 1
+    total = sum(product.price for product in products_data)
+    assert response.data['total_price'] == total
+    assert response.data['discount_amount'] == discount_factory.value / 100 * total
+
+
+@pytest.mark.django_db
+def test_discount_code_of_a_linked_product_is_taken_off_once(api_client):
+    product = ProductFactory(price=1000, stock=10, weight=0)
+    discount = DiscountFactory(value=10, products=[product])
+    product.refresh_from_db()
+    assert product.effective_price == 900
+
+    api_client.post(reverse('cart:cart-add'), {'product': product.id})
+    api_client.post(reverse('cart:cart-apply-discount'), {'code': discount.code})
+    response = api_client.get(reverse('cart:cart-list'))
+    assert response.data['total_price'] == 1000
+    assert response.data['discount_amount'] == 100
+    assert response.data['final_price'] == 900
+
+
+@pytest.mark.django_db
+def test_apply_expired_discount(api_client, discount_factory):
+    discount_factory.end_date = timezone.now() - timedelta(hours=1)
+    discount_factory.save()
+    response = api_client.post(reverse('cart:cart-apply-discount'), {'code': discount_factory.code})
+    assert response.data['error'] == 'This discount code has expired'
+    response = api_client.post(reverse('cart:cart-apply-discount'), {'code': 'no-such-code'})
+    assert response.data['error'] == 'Invalid discount code'
+
+
+@pytest.mark.django_db
+def test_cart_batch(api_client):
+    first, second, third = ProductFactory.create_batch(3, stock=10)
+    api_client.post(reverse('cart:cart-add'), {'product': third.id})
+    operations = [
+        {'product': first.id, 'op': 'add', 'quantity': 3},
+        {'product': second.id, 'op': 'add'},
+        {'product': first.id, 'op': 'decrease', 'quantity': 1},
+        {'product': third.id, 'op': 'remove'},
+    ]
+    with CaptureQueriesContext(connection) as context:
+        response = api_client.post(reverse('cart:cart-batch'), {'operations': operations}, format='json')
+    assert response.status_code == status.HTTP_200_OK
+    assert response.data['message'] == 'Cart updated'
+    assert len(context.captured_queries) == 1
+
+    items = {item['product']['id']: item['quantity'] for item in api_client.get(reverse('cart:cart-list')).data['items']}
+    assert items == {first.id: 2, second.id: 1}
+
+
+@pytest.mark.django_db
+def test_cart_batch_rejects_unknown_products(api_client):
+    product = ProductFactory(stock=10)
+    operations = [{'product': product.id, 'op': 'add'}, {'product': product.id + 1000, 'op': 'add'}]
+    response = api_client.post(reverse('cart:cart-batch'), {'operations': operations}, format='json')
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert response.data['operations'] == [f'Products do not exist: [{product.id + 1000}]']
+    assert api_client.get(reverse('cart:cart-list')).data['items'] == []
+
+
+@pytest.mark.django_db
+def test_cart_batch_validates_stock(api_client):
+    product = ProductFactory(stock=3)
+    api_client.post(reverse('cart:cart-add'), {'product': product.id})
+    operations = [{'product': product.id, 'op': 'add'}, {'product': product.id, 'op': 'add', 'quantity': 2}]
+    response = api_client.post(reverse('cart:cart-batch'), {'operations': operations}, format='json')
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert response.data['operations'] == [f'Not enough stock for products: [{product.id}]']
+    operations[1]['quantity'] = 1
+    response = api_client.post(reverse('cart:cart-batch'), {'operations': operations}, format='json')
+    assert response.status_code == status.HTTP_200_OK
+
+
+@pytest.mark.django_db
+def test_cart_batch_rejects_invalid_operations(api_client):
+    response = api_client.post(reverse('cart:cart-batch'), {'operations': []}, format='json')
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    response = api_client.post(
+        reverse('cart:cart-batch'), {'operations': [{'product': 1, 'op': 'swap'}]}, format='json'
+    )
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+@pytest.mark.django_db
+def test_signed_in_cart_is_shared_across_devices(api_client, products_data):
+    user = ShopUserFactory()
+    phone, laptop = api_client, APIClient()
+    for client in [phone, laptop]:
+        client.force_authenticate(user=user)
+    phone.post(reverse('cart:cart-add'), {'product': products_data[0].id})
+    laptop.post(reverse('cart:cart-add'), {'product': products_data[1].id})
+    for client in [phone, laptop]:
+        items = client.get(reverse('cart:cart-list')).data['items']
+        assert {item['product']['id'] for item in items} == {product.id for product in products_data}
@@ -14,6 +14,7 @@ from .cart import Cart
 from .serializers import (
     CartSerializer,
     CartActionSerializer,
+    CartBatchSerializer,
     DiscountSerializer
 )
 
@@ -21,6 +22,9 @@ from .services import CartService
 
 from .schema import (
     CART_ADD_EXAMPLES,
+    CART_BATCH_REQUEST_EXAMPLES,
+    CART_BATCH_EXAMPLES,
+    CART_BATCH_ERROR_EXAMPLES,
     CART_CLEAR_EXAMPLES,
     CART_DECREASE_EXAMPLES,
     CART_REMOVE_EXAMPLES,
@@ -86,6 +90,25 @@ from .schema import (
             )
         }
     ),
+    batch=extend_schema(
+        summary='Apply cart operations in batch',
+        description='Add, decrease or remove several products at once. '
+                    'Either every operation is applied or, on a validation error, none.',
+        request=CartBatchSerializer,
+        examples=CART_BATCH_REQUEST_EXAMPLES,
+        responses={
+            200: OpenApiResponse(
+                response=OpenApiTypes.OBJECT,
+                description='Operations applied successfully.',
+                examples=CART_BATCH_EXAMPLES
+            ),
+            400: OpenApiResponse(
+                response=OpenApiTypes.OBJECT,
+                description='Unknown products or not enough stock',
+                examples=CART_BATCH_ERROR_EXAMPLES
+            )
+        }
+    ),
     clear=extend_schema(
         summary='Clear cart',
         description='Clear the cart of all products.',
@@ -122,7 +145,6 @@ from .schema import (
 )
 class CartViewSet(viewsets.ViewSet):
     permission_classes = [AllowAny]
-    authentication_classes = []
 
     def list(self, request):
         cart = Cart(request)
@@ -156,6 +178,14 @@ class CartViewSet(viewsets.ViewSet):
         CartService.remove_from_cart(cart, product)
         return Response({'message': 'Product removed'}, status=status.HTTP_200_OK)
 
+    @action(detail=False, methods=['post'])
+    def batch(self, request):
+        serializer = CartBatchSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        cart = Cart(request)
+        CartService.apply_operations(cart, serializer.validated_data['operations'])
+        return Response({'message': 'Cart updated'}, status=status.HTTP_200_OK)
+
     @action(detail=False, methods=['post'])
     def clear(self,request):
         cart = Cart(request)
@@ -1,4 +1,5 @@
-from drf_spectacular.utils import OpenApiExample
+from drf_spectacular.utils import OpenApiExample, OpenApiParameter
+from drf_spectacular.types import OpenApiTypes
 
 ORDER_CREATE_ERROR_EXAMPLES = [
     OpenApiExample(
@@ -8,3 +9,11 @@ ORDER_CREATE_ERROR_EXAMPLES = [
                     "order creation due to an issue with the payment gateway."
     ),
 ]
+
+ORDER_FIELDS_PARAMETER = OpenApiParameter(
+    name='fields',
+    description='Comma separated order fields to return, e.g. `id,created,final_cost`',
+    required=False,
+    type=OpenApiTypes.STR,
+    location=OpenApiParameter.QUERY,
+)
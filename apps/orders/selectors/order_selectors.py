@@ -1,8 +1,36 @@
-from apps.orders.models import Order
+from django.db.models import Sum
+
+from apps.orders.models import Order, OrderItem
+
+ORDER_FIELD_COLUMNS = {
+    'items': [],
+    'total_cost': [],
+    'post_cost': [],
+    'final_cost': ['discount_amount'],
+}
+ORDER_ITEM_FIELDS = {'items', 'total_cost', 'post_cost', 'final_cost'}
 
 
 def get_all_orders():
     return Order.objects.all()
 
-def filter_orders_by_user(user):
-    return Order.objects.filter(buyer=user)
\ No newline at end of file
+def filter_orders_by_user(user, fields=None):
+    orders = Order.objects.filter(buyer=user)
+    if not fields:
+        return orders.prefetch_related('items')
+
+    columns = ['id']
+    for field in fields:
+        columns += ORDER_FIELD_COLUMNS.get(field, [field])
+    if fields & ORDER_ITEM_FIELDS:
+        orders = orders.prefetch_related('items')
+    return orders.only(*columns)
+
+def get_order_product_quantities(order_id):
+    return dict(
+        OrderItem.objects
+        .filter(order_id=order_id)
+        .values('product_id')
+        .annotate(quantity=Sum('quantity'))
+        .values_list('product_id', 'quantity')
+    )
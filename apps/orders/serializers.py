@@ -1,13 +1,16 @@
+from django.db import transaction
+
 from rest_framework import serializers
 
 from drf_spectacular.utils import extend_schema_field
 
 from apps.accounts.selectors.address_selectors import get_address_by_id
-from .selectors.subscription_selectors import get_subscription_by_user
+from .selectors.subscription_selectors import filter_subscription_by_user
 
 from .models import Order, OrderItem, Product, Addresses
 from apps.cart.cart import Cart
 from apps.orders.models import Subscription
+from apps.shop.sparse_fields import SparseFieldsMixin
 
 class OrderItemSerializer(serializers.ModelSerializer):
     product = serializers.PrimaryKeyRelatedField(queryset=Product.objects.all())
@@ -55,16 +58,26 @@ class OrderCreateSerializer(serializers.ModelSerializer):
         except Addresses.DoesNotExist:
             raise serializers.ValidationError('Address not found')
 
+        # Renew the cart's holds first; lines whose stock is gone cannot be ordered.
+        items = list(cart)
+        short = cart.reserve(items=items)
+        if short:
+            raise serializers.ValidationError(f'Not enough stock for products: {sorted(short)}')
+
         session_discount = request.session.get('discount_code', None)
         serialized_discount = validated_data.pop('discount_code', None)
 
+        subscription = None
+        if session_discount != serialized_discount and not serialized_discount:
+            subscription = filter_subscription_by_user(user).first()
+        pricing = cart.get_pricing(subscription)
+
         if session_discount == serialized_discount:
             discount_code = session_discount
-            discount_amount = cart.get_discount_amount()
-        elif not serialized_discount and Subscription.objects.filter(user=user).exists():
-            subscription = get_subscription_by_user(user)
+            discount_amount = pricing.discount
+        elif subscription is not None:
             discount_code = subscription.plan
-            discount_amount = cart.subscription_amount(subscription)
+            discount_amount = pricing.subscription_discount
         else:
             discount_code = None
             discount_amount = 0
@@ -77,20 +90,22 @@ class OrderCreateSerializer(serializers.ModelSerializer):
             **validated_data
         )
 
-        for item in cart:
-            product = item['product']
-            OrderItem.objects.create(
+        OrderItem.objects.bulk_create([
+            OrderItem(
                 order=order,
-                product=product,
+                product=item['product'],
                 price=item['price'],
                 quantity=item['quantity'],
                 weight=item['weight'],
             )
+            for item in items
+        ])
+        transaction.on_commit(lambda: cart.transfer_reservations(order.id))
 
         return order
 
 
-class OrderSerializer(serializers.ModelSerializer):
+class OrderSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     items = OrderItemSerializer(many=True, read_only=True)
     total_cost = serializers.SerializerMethodField()
     post_cost = serializers.SerializerMethodField()
@@ -1,4 +1,10 @@
+from django.db import transaction
+from django.utils import timezone
+
 from apps.orders.models import Order
+from apps.orders.selectors.order_selectors import get_order_product_quantities
+from apps.shop.services.reservation_services import StockReservationService
+from apps.shop.services.vendor_stats_services import VendorStatsService
 
 import requests
 
@@ -37,8 +43,14 @@ class PaymentService:
             data = response.json()
 
             if data.get('status') == 'success':
+                with transaction.atomic():
+                    # Only the callback that flips the flag counts the sale, so retries are not double counted.
+                    if Order.objects.filter(pk=obj.pk, paid=False).update(paid=True, updated=timezone.now()):
+                        VendorStatsService.record_order_paid(obj.pk)
+                        StockReservationService.commit(
+                            StockReservationService.get_order_holder(obj.pk), get_order_product_quantities(obj.pk)
+                        )
                 obj.paid = True
-                obj.save()
                 return {'message': 'Payment successful'}
 
     @staticmethod
@@ -1,8 +1,13 @@
+from types import SimpleNamespace
+
+from django.core.cache import cache
+
 from rest_framework.test import APIClient
 
 import pytest
 
 from apps.accounts.tests.factories import ShopUserFactory
+from apps.cart.cart import Cart
 from apps.shop.tests.factories import ProductFactory
 from apps.orders.tests.factories import (
     OrderFactory,
@@ -11,6 +16,11 @@ from apps.orders.tests.factories import (
 )
 
 
+@pytest.fixture(autouse=True)
+def clear_cache():
+    # Stock reservations are keyed by product id and outlive the rolled back products.
+    cache.clear()
+
 @pytest.fixture
 def api_client():
     return APIClient()
@@ -21,19 +31,12 @@ def user_factory():
 
 @pytest.fixture
 def product_factory():
-    return ProductFactory()
+    return ProductFactory(stock=10)
 
 @pytest.fixture
-def cart_session(api_client, product_factory):
+def cart_session(api_client, user_factory, product_factory):
     session = api_client.session
-    product = product_factory
-    session['cart'] = {
-        str(product.id): {
-            'quantity': 1,
-            'price': product.price,
-            'weight': product.weight,
-        }
-    }
+    Cart(SimpleNamespace(session=session, user=user_factory)).add(product_factory)
     session.save()
     return session
 
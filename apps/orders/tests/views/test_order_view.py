@@ -1,11 +1,19 @@
+from types import SimpleNamespace
+
 from django.urls import reverse
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 
 import pytest
 from unittest.mock import patch
 
-from apps.orders.tests.factories import OrderItemFactory, OrderFactory
+from apps.cart.cart import Cart
+from apps.orders.models import Order, OrderItem
+from apps.orders.tests.factories import OrderItemFactory, OrderFactory, SubscriptionFactory
 from apps.accounts.tests.factories import AddressFactory
-from apps.orders.tests.conftest import api_client, user_factory, cart_session
+from apps.shop.services.reservation_services import StockReservationService
+from apps.shop.tests.factories import DiscountFactory, ProductFactory
+from apps.orders.tests.conftest import api_client, user_factory, product_factory, cart_session
 
 @pytest.mark.django_db
 def test_list_orders(api_client, user_factory):
@@ -17,9 +25,27 @@ def test_list_orders(api_client, user_factory):
     assert response.status_code == 200
     assert len(response.data) == 1
 
+@pytest.mark.django_db
+def test_list_orders_query_count_is_constant(api_client, user_factory):
+    user = user_factory
+    api_client.force_authenticate(user=user)
+
+    def list_orders_query_count():
+        with CaptureQueriesContext(connection) as context:
+            api_client.get(reverse('orders:orders-list'))
+        return len(context.captured_queries)
+
+    OrderItemFactory.create_batch(2, order=OrderFactory(buyer=user))
+    few_orders_queries = list_orders_query_count()
+    for _ in range(4):
+        OrderItemFactory.create_batch(2, order=OrderFactory(buyer=user))
+    many_orders_queries = list_orders_query_count()
+
+    assert few_orders_queries == many_orders_queries
+
 @pytest.mark.django_db
 @patch('apps.orders.services.payment_services.PaymentService.pay_request')
-def test_create_order(mocked_pay, api_client, user_factory, cart_session):
+def test_create_order(mocked_pay, api_client, user_factory, cart_session, django_capture_on_commit_callbacks):
     user = user_factory
     address = AddressFactory(user=user)
     api_client.force_authenticate(user=user)
@@ -30,5 +56,119 @@ def test_create_order(mocked_pay, api_client, user_factory, cart_session):
         'phone': user.phone,
     }
     mocked_pay.return_value = {'status': 'success', 'transaction_id': 'mocked-transaction-id'}
+    with django_capture_on_commit_callbacks(execute=True):
+        response = api_client.post(reverse('orders:orders-list'), data=data)
+    assert response.status_code == 201
+    assert OrderItem.objects.filter(order__buyer=user).count() == 1
+    # The order now holds the unit the cart reserved.
+    item = OrderItem.objects.get(order__buyer=user)
+    holder = StockReservationService.get_order_holder(item.order_id)
+    assert StockReservationService.transfer(holder, 'cart:other', [item.product_id], ttl=60) == {item.product_id: 1}
+
+@pytest.mark.django_db
+def test_create_order_fails_once_reserved_stock_is_gone(api_client, user_factory, settings):
+    user = user_factory
+    product = ProductFactory(stock=1)
+    session = api_client.session
+    settings.STOCK_RESERVATIONS = {**settings.STOCK_RESERVATIONS, 'CART_TTL': 0}
+    Cart(SimpleNamespace(session=session, user=user)).add(product)
+    session.save()
+    # The cart's hold has lapsed and another cart took the last unit.
+    assert StockReservationService.reserve('cart:other', {product.id: (1, 1)}, ttl=60) == {product.id: 0}
+
+    api_client.force_authenticate(user=user)
+    data = {
+        'address_id': AddressFactory(user=user).id,
+        'first_name': user.first_name,
+        'last_name': user.last_name,
+        'phone': user.phone,
+    }
+    response = api_client.post(reverse('orders:orders-list'), data=data)
+    assert response.status_code == 400
+    assert response.data == [f'Not enough stock for products: [{product.id}]']
+    assert not Order.objects.filter(buyer=user).exists()
+
+@pytest.mark.django_db
+@patch('apps.orders.services.payment_services.PaymentService.pay_request')
+def test_create_order_applies_subscription_discount(mocked_pay, api_client, user_factory, product_factory, cart_session):
+    user = user_factory
+    SubscriptionFactory(buyer=user)
+    api_client.force_authenticate(user=user)
+    data = {
+        'address_id': AddressFactory(user=user).id,
+        'first_name': user.first_name,
+        'last_name': user.last_name,
+        'phone': user.phone,
+        'discount_code': '',
+    }
+    mocked_pay.return_value = {'status': 'success'}
+    response = api_client.post(reverse('orders:orders-list'), data=data)
+    assert response.status_code == 201
+    order = Order.objects.get(buyer=user)
+    assert order.discount_code == 'monthly'
+    assert order.discount_amount == int(10 / 100 * product_factory.price)
+
+@pytest.mark.django_db
+def test_list_orders_with_sparse_fields(api_client, user_factory):
+    user = user_factory
+    order = OrderFactory(buyer=user)
+    OrderItemFactory.create_batch(2, order=order)
+    api_client.force_authenticate(user=user)
+    with CaptureQueriesContext(connection) as context:
+        response = api_client.get(reverse('orders:orders-list'), {'fields': 'id,phone'})
+    assert response.data == [{'id': order.id, 'phone': order.phone}]
+    assert not [query for query in context.captured_queries if 'orders_orderitem' in query['sql']]
+
+    response = api_client.get(reverse('orders:orders-list'), {'fields': 'id,final_cost'})
+    assert response.data == [{'id': order.id, 'final_cost': order.get_final_cost()}]
+
+    response = api_client.get(reverse('orders:orders-list'), {'fields': 'buyer'})
+    assert response.status_code == 400
+
+@pytest.mark.django_db
+@patch('apps.orders.services.payment_services.PaymentService.pay_request')
+def test_create_order_takes_a_linked_discount_code_off_once(mocked_pay, api_client, user_factory):
+    user = user_factory
+    product = ProductFactory(price=1000, stock=10)
+    discount = DiscountFactory(code='LINKED10', value=10, products=[product])
+    session = api_client.session
+    Cart(SimpleNamespace(session=session, user=user)).add(product)
+    session['discount_code'] = discount.code
+    session.save()
+
+    api_client.force_authenticate(user=user)
+    data = {
+        'address_id': AddressFactory(user=user).id,
+        'first_name': user.first_name,
+        'last_name': user.last_name,
+        'phone': user.phone,
+        'discount_code': discount.code,
+    }
+    mocked_pay.return_value = {'status': 'success'}
     response = api_client.post(reverse('orders:orders-list'), data=data)
-    assert response.status_code == 201
\ No newline at end of file
+    assert response.status_code == 201
+    order = Order.objects.get(buyer=user)
+    assert order.items.get().price == 1000
+    assert order.discount_amount == 100
+
+@pytest.mark.django_db
+@patch('apps.orders.services.payment_services.PaymentService.pay_request')
+def test_create_order_loads_cart_products_once(mocked_pay, api_client, user_factory):
+    user = user_factory
+    address = AddressFactory(user=user)
+    api_client.force_authenticate(user=user)
+    session = api_client.session
+    cart = Cart(SimpleNamespace(session=session, user=user))
+    for product in ProductFactory.create_batch(3, stock=10):
+        cart.add(product)
+    session.save()
+    mocked_pay.return_value = {'status': 'success', 'transaction_id': 'mocked-transaction-id'}
+    data = {'address_id': address.id, 'first_name': 'Ali', 'last_name': 'Rezaei', 'phone': user.phone}
+
+    with CaptureQueriesContext(connection) as context:
+        response = api_client.post(reverse('orders:orders-list'), data=data)
+    assert response.status_code == 201
+    queries = [query['sql'] for query in context.captured_queries]
+    assert len([sql for sql in queries if sql.startswith('SELECT') and 'FROM "shop_product"' in sql]) == 1
+    assert len([sql for sql in queries if sql.startswith('INSERT INTO "orders_orderitem"')]) == 1
+    assert OrderItem.objects.filter(order__buyer=user).count() == 3
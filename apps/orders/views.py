@@ -5,7 +5,7 @@ from rest_framework.permissions import IsAuthenticated
 
 from drf_spectacular.utils import extend_schema, OpenApiResponse
 
-from .schema import ORDER_CREATE_ERROR_EXAMPLES
+from .schema import ORDER_CREATE_ERROR_EXAMPLES, ORDER_FIELDS_PARAMETER
 
 from .serializers import *
 
@@ -14,18 +14,22 @@ from .selectors.subscription_selectors import get_all_subscription, filter_subsc
 
 from .services.payment_services import *
 
+from apps.shop.sparse_fields import get_requested_fields
+
 class OrderViewSet(viewsets.ViewSet):
     permission_classes = [IsAuthenticated]
     queryset = get_all_orders()
 
     @extend_schema(
+        parameters=[ORDER_FIELDS_PARAMETER],
         summary='List orders',
         description='Retrieve the list of orders for a user.',
         responses={200: OrderSerializer(many=True)},
     )
     def list(self, request):
-        orders = filter_orders_by_user(request.user)
-        serializer = OrderSerializer(orders, many=True)
+        fields = get_requested_fields(request, OrderSerializer)
+        orders = filter_orders_by_user(request.user, fields)
+        serializer = OrderSerializer(orders, many=True, context={'fields': fields})
 
         return Response(serializer.data, status=status.HTTP_200_OK)
 
@@ -3,7 +3,7 @@ from django.contrib import admin
 from mptt.admin import MPTTModelAdmin
 
 from .models import Category, Product
-from apps.shop.models import Discount
+from apps.shop.models import Discount, VendorStats
 
 @admin.register(Category)
 class CategoryAdmin(MPTTModelAdmin):
@@ -14,8 +14,15 @@ class CategoryAdmin(MPTTModelAdmin):
 @admin.register(Product)
 class ProductAdmin(admin.ModelAdmin):
     list_display = ['id','vendor', 'category', 'name', 'created', 'updated']
+    list_select_related = ['vendor', 'category']
 
 
 @admin.register(Discount)
 class DiscountAdmin(admin.ModelAdmin):
-    pass
\ No newline at end of file
+    pass
+
+
+@admin.register(VendorStats)
+class VendorStatsAdmin(admin.ModelAdmin):
+    list_display = ['vendor', 'product_count', 'in_stock_count', 'inventory_value', 'units_sold', 'revenue', 'updated']
+    list_select_related = ['vendor']
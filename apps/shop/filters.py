@@ -2,13 +2,32 @@ from django.db.models import Q
 
 from django_filters import rest_framework as filters
 
+from .services.category_services import CategoryTreeService
+from .services.search_services import ProductSearchService
+
+class CharInFilter(filters.BaseInFilter, filters.CharFilter):
+    pass
+
 class ProductFilter(filters.FilterSet):
+    q = filters.CharFilter(method='filter_by_search')
     vendor = filters.NumberFilter(field_name='vendor__id', lookup_expr='exact')
-    min_price = filters.NumberFilter(field_name='price', lookup_expr='gte')
-    max_price = filters.NumberFilter(field_name='price', lookup_expr='lte')
-    category = filters.CharFilter(method='filter_by_category')
+    min_price = filters.NumberFilter(field_name='effective_price', lookup_expr='gte')
+    max_price = filters.NumberFilter(field_name='effective_price', lookup_expr='lte')
+    category = CharInFilter(method='filter_by_category')
+    in_stock = filters.BooleanFilter(method='filter_by_in_stock')
 
     def filter_by_category(self, queryset, name, value):
-        return queryset.filter(
-            Q(category__name__iexact=value) | Q(category__parent__name__iexact=value)
-        )
\ No newline at end of file
+        tree_ranges = CategoryTreeService.resolve_ranges(value)
+        if not tree_ranges:
+            return queryset.none()
+
+        subtree = Q()
+        for tree_id, lft, rght in tree_ranges:
+            subtree |= Q(category__tree_id=tree_id, category__lft__range=(lft, rght))
+        return queryset.filter(subtree)
+
+    def filter_by_in_stock(self, queryset, name, value):
+        return queryset.filter(stock__gt=0) if value else queryset.filter(stock=0)
+
+    def filter_by_search(self, queryset, name, value):
+        return ProductSearchService.search(queryset, value)
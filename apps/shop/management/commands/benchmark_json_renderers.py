@@ -0,0 +1,121 @@
+import io
+import json
+import statistics
+import time
+from importlib import import_module
+from types import SimpleNamespace
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+
+from apps.cart.cart import Cart
+from apps.cart.serializers import CartSerializer
+from apps.orders.models import Order, OrderItem
+from apps.orders.serializers import OrderSerializer
+from apps.shop.models import Product
+from apps.shop.serializers import ProductRowSerializer
+from apps.shop.services.seed_services import CatalogSeedService
+from config import parsers, renderers
+from config.parsers import FastJSONParser
+from config.renderers import FastJSONRenderer
+
+
+class Command(BaseCommand):
+    help = 'Compare the stock DRF JSON renderer and parser with the orjson-backed pair on large API payloads.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--products', type=int, default=1_000, help='Products in the product list payload.')
+        parser.add_argument('--cart-items', type=int, default=100)
+        parser.add_argument('--orders', type=int, default=100)
+        parser.add_argument('--order-items', type=int, default=10, help='Items in every order.')
+        parser.add_argument('--runs', type=int, default=5, help='Timings are the median of this many runs.')
+        parser.add_argument('--output', help='Write timings to this JSON file.')
+
+    def handle(self, *args, **options):
+        if renderers.orjson is None or parsers.orjson is None:
+            self.stdout.write(self.style.WARNING('orjson is not installed; both columns measure the stock classes.'))
+
+        with transaction.atomic():
+            self.stdout.write(f"Seeding {options['products']} products...")
+            catalog = CatalogSeedService(products=options['products'], vendors=5, tags_per_product=3).seed()
+            products = Product.objects.filter(slug__startswith=f"bench-{catalog['token']}-").order_by('-created', '-id')
+            payloads = {
+                'product list': self.build_product_payload(products),
+                'cart': self.build_cart_payload(products[:options['cart_items']]),
+                'order list': self.build_order_payload(products, options['orders'], options['order_items']),
+            }
+            transaction.set_rollback(True)
+
+        results = []
+        for name, data in payloads.items():
+            result = self.compare(name, data, options['runs'])
+            results.append(result)
+            self.stdout.write(
+                f"{name:<14} {result['bytes']:>10} B  "
+                f"render {result['render_ms']:>8.2f} -> {result['fast_render_ms']:>8.2f} ms  "
+                f"parse {result['parse_ms']:>8.2f} -> {result['fast_parse_ms']:>8.2f} ms"
+            )
+
+        if options['output']:
+            with open(options['output'], 'w') as output:
+                json.dump(results, output, indent=2)
+            self.stdout.write(self.style.SUCCESS(f"Results written to {options['output']}"))
+
+    @staticmethod
+    def build_product_payload(products):
+        row_serializer = ProductRowSerializer()
+        return {
+            'next': None,
+            'previous': None,
+            'results': row_serializer.to_representation(list(row_serializer.get_rows(products))),
+        }
+
+    @staticmethod
+    def build_cart_payload(products):
+        session = import_module(settings.SESSION_ENGINE).SessionStore()
+        cart = Cart(SimpleNamespace(session=session))
+        for product in products:
+            cart.add(product)
+        data = CartSerializer(cart).data
+        cart.clear()
+        return data
+
+    @staticmethod
+    def build_order_payload(products, orders, order_items):
+        product_ids = list(products.values_list('id', flat=True)[:order_items])
+        created = Order.objects.bulk_create(
+            [Order(first_name='Bench', last_name=f'Buyer {index}', phone='09130000000') for index in range(orders)]
+        )
+        OrderItem.objects.bulk_create([
+            OrderItem(order=order, product_id=product_id, price=1000, quantity=2, weight=300)
+            for order in created
+            for product_id in product_ids
+        ])
+        queryset = Order.objects.filter(id__in=[order.id for order in created]).prefetch_related('items')
+        return {'next': None, 'previous': None, 'results': OrderSerializer(queryset, many=True).data}
+
+    def compare(self, name, data, runs):
+        body = JSONRenderer().render(data)
+        if FastJSONRenderer().render(data) != body:
+            self.stdout.write(self.style.WARNING(f'{name}: renderers produced different bytes.'))
+        return {
+            'name': name,
+            'bytes': len(body),
+            'render_ms': self.measure(lambda: JSONRenderer().render(data), runs),
+            'fast_render_ms': self.measure(lambda: FastJSONRenderer().render(data), runs),
+            'parse_ms': self.measure(lambda: JSONParser().parse(io.BytesIO(body)), runs),
+            'fast_parse_ms': self.measure(lambda: FastJSONParser().parse(io.BytesIO(body)), runs),
+        }
+
+    @staticmethod
+    def measure(run, runs):
+        timings = []
+        for _ in range(runs):
+            start = time.perf_counter()
+            run()
+            timings.append((time.perf_counter() - start) * 1000)
+        return statistics.median(timings)
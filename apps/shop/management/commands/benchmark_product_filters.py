@@ -0,0 +1,82 @@
+import json
+import re
+import statistics
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from apps.shop.filters import ProductFilter
+from apps.shop.models import Product
+from apps.shop.pagination import ProductCursorPagination
+from apps.shop.services.seed_services import CatalogSeedService
+
+INDEX_PATTERN = re.compile(r'(?:Index Scan|Index Only Scan|Bitmap Index Scan)(?: Backward)? (?:using|on) (\w+)')
+EXECUTION_TIME_PATTERN = re.compile(r'Execution Time: ([\d.]+) ms')
+
+
+class Command(BaseCommand):
+    help = 'Seed a synthetic catalog and record EXPLAIN ANALYZE timings for every ProductFilter combination.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--products', type=int, default=100_000)
+        parser.add_argument('--vendors', type=int, default=50)
+        parser.add_argument('--runs', type=int, default=5, help='Timings are the median of this many runs.')
+        parser.add_argument('--output', help='Write timings and query plans to this JSON file.')
+        parser.add_argument('--keep', action='store_true', help='Keep the seeded catalog instead of rolling it back.')
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            self.stdout.write(f"Seeding {options['products']} products...")
+            catalog = CatalogSeedService(products=options['products'], vendors=options['vendors']).seed()
+
+            results = []
+            for name, params in self.get_scenarios(catalog).items():
+                result = self.explain(name, params, options['runs'])
+                results.append(result)
+                self.stdout.write(
+                    f"{name:<28} {result['execution_time_ms']:>9.2f} ms  {', '.join(result['indexes']) or 'seq scan'}"
+                )
+
+            if not options['keep']:
+                transaction.set_rollback(True)
+
+        if options['output']:
+            with open(options['output'], 'w') as output:
+                json.dump(results, output, indent=2)
+            self.stdout.write(self.style.SUCCESS(f"Results written to {options['output']}"))
+
+    @staticmethod
+    def get_scenarios(catalog):
+        vendor = str(catalog['vendor_ids'][0])
+        leaf = str(catalog['leaf_category_ids'][0])
+        root = str(catalog['root_category_ids'][0])
+        return {
+            'newest': {},
+            'vendor': {'vendor': vendor},
+            'category leaf': {'category': leaf},
+            'category subtree': {'category': root},
+            'price range': {'min_price': '1000', 'max_price': '2000'},
+            'category + price range': {'category': leaf, 'min_price': '1000', 'max_price': '2000'},
+            'vendor + price range': {'vendor': vendor, 'min_price': '1000', 'max_price': '2000'},
+            'in stock': {'in_stock': 'true'},
+            'category + in stock': {'category': leaf, 'in_stock': 'true'},
+            'search': {'q': 'wireless lamp'},
+        }
+
+    @staticmethod
+    def explain(name, params, runs):
+        queryset = ProductFilter(params, queryset=Product.objects.all()).qs
+        ordering = ProductCursorPagination().get_ordering(None, queryset, None)
+        page = queryset.order_by(*ordering)[:ProductCursorPagination.page_size + 1]
+
+        timings = []
+        for _ in range(runs):
+            plan = page.explain(analyze=True, buffers=True)
+            timings.append(float(EXECUTION_TIME_PATTERN.search(plan).group(1)))
+        return {
+            'name': name,
+            'params': params,
+            'execution_time_ms': statistics.median(timings),
+            'indexes': sorted(set(INDEX_PATTERN.findall(plan))),
+            'plan': plan,
+        }
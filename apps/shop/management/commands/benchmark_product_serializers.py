@@ -0,0 +1,78 @@
+import json
+import statistics
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from apps.shop.models import Product
+from apps.shop.selectors.product_selectors import with_product_relations
+from apps.shop.serializers import ProductRowSerializer, ProductSerializer
+from apps.shop.services.seed_services import CatalogSeedService
+
+
+class Command(BaseCommand):
+    help = 'Seed a synthetic catalog and compare ProductSerializer with the values()-based row serializer.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sizes', type=int, nargs='+', default=[100, 1_000, 10_000])
+        parser.add_argument('--tags', type=int, default=3, help='Tags attached to every seeded product.')
+        parser.add_argument('--runs', type=int, default=5, help='Timings are the median of this many runs.')
+        parser.add_argument('--output', help='Write timings to this JSON file.')
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            self.stdout.write(f"Seeding {max(options['sizes'])} products...")
+            catalog = CatalogSeedService(
+                products=max(options['sizes']), vendors=5, tags_per_product=options['tags']
+            ).seed()
+            queryset = Product.objects.filter(slug__startswith=f"bench-{catalog['token']}-").order_by('-created', '-id')
+
+            results = []
+            for size in options['sizes']:
+                result = self.compare(queryset[:size], size, options['runs'])
+                results.append(result)
+                self.stdout.write(
+                    f"{size:>7} rows  serializer {result['serializer_ms']:>9.2f} ms  "
+                    f"rows {result['rows_ms']:>9.2f} ms  x{result['speedup']:.1f}"
+                )
+            transaction.set_rollback(True)
+
+        if options['output']:
+            with open(options['output'], 'w') as output:
+                json.dump(results, output, indent=2)
+            self.stdout.write(self.style.SUCCESS(f"Results written to {options['output']}"))
+
+    def compare(self, queryset, size, runs):
+        serializer_timings, serializer_data = self.measure(
+            lambda: ProductSerializer(with_product_relations(queryset), many=True).data, runs
+        )
+        row_serializer = ProductRowSerializer()
+        rows_timings, rows_data = self.measure(
+            lambda: row_serializer.to_representation(list(row_serializer.get_rows(queryset))), runs
+        )
+        # Taggit returns tags in its own order; only the set of names is part of the contract.
+        if self.normalize(serializer_data) != self.normalize(rows_data):
+            raise CommandError(f'Serializers disagree at {size} rows.')
+
+        serializer_ms = statistics.median(serializer_timings)
+        rows_ms = statistics.median(rows_timings)
+        return {
+            'rows': size,
+            'serializer_ms': serializer_ms,
+            'rows_ms': rows_ms,
+            'speedup': serializer_ms / rows_ms if rows_ms else 0,
+        }
+
+    @staticmethod
+    def measure(build, runs):
+        timings = []
+        for _ in range(runs):
+            start = time.perf_counter()
+            data = build()
+            timings.append((time.perf_counter() - start) * 1000)
+        return timings, data
+
+    @staticmethod
+    def normalize(data):
+        return [{**item, 'tags': sorted(item['tags'])} for item in json.loads(json.dumps(data))]
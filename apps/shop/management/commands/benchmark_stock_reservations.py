@@ -0,0 +1,52 @@
+import json
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand
+
+from django_redis import get_redis_connection
+
+from apps.shop.services.reservation_services import StockReservationService
+
+
+class Command(BaseCommand):
+    help = 'Replay parallel cart reservations against one hot product and check that none oversell.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--stock', type=int, default=1_000)
+        parser.add_argument('--reservations', type=int, default=5_000, help='Carts reserving one unit each.')
+        parser.add_argument('--workers', type=int, default=16, help='Reservations replayed in parallel.')
+        parser.add_argument('--output', help='Write results to this JSON file.')
+
+    def handle(self, *args, **options):
+        # A made-up product id keeps the run away from the holds of real products.
+        product_id = f'benchmark-{uuid.uuid4().hex}'
+        stock = options['stock']
+
+        def reserve(index):
+            holder = StockReservationService.get_cart_holder(f'benchmark-{index}')
+            shortfalls = StockReservationService.reserve(holder, {product_id: (1, stock)}, ttl=60, relative=True)
+            return not shortfalls[product_id]
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=options['workers']) as executor:
+            granted = sum(executor.map(reserve, range(options['reservations'])))
+        elapsed = time.perf_counter() - start
+        get_redis_connection('default').delete(*StockReservationService.get_keys([product_id]))
+
+        result = {
+            'stock': stock,
+            'reservations': options['reservations'],
+            'reservations_per_second': options['reservations'] / elapsed,
+            'granted': granted,
+            'oversold': max(granted - stock, 0),
+        }
+        self.stdout.write(
+            f"{result['reservations_per_second']:.0f} reservations/s  "
+            f"{granted} granted of {stock} in stock  {result['oversold']} oversold"
+        )
+        if options['output']:
+            with open(options['output'], 'w') as output:
+                json.dump(result, output, indent=2)
+            self.stdout.write(self.style.SUCCESS(f"Results written to {options['output']}"))
@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+
+from apps.shop.models import Product
+from apps.shop.services.thumbnail_services import ProductThumbnailService
+
+
+class Command(BaseCommand):
+    help = 'Generate missing or outdated product picture thumbnails.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--force', action='store_true', help='Regenerate thumbnails of every product with a picture.')
+
+    def handle(self, *args, **options):
+        products = Product.objects.exclude(product_picture='').exclude(product_picture__isnull=True)
+        generated = 0
+        for product in products.only('product_picture', 'thumbnails').iterator(chunk_size=500):
+            if options['force'] or ProductThumbnailService.is_stale(product):
+                ProductThumbnailService.generate(product.pk, force=options['force'])
+                generated += 1
+        self.stdout.write(self.style.SUCCESS(f'Generated thumbnails for {generated} products'))
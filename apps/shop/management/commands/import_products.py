@@ -0,0 +1,30 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.accounts.models import VendorProfile
+from apps.shop.services.import_services import IMPORT_CHUNK_SIZE, ProductImportService
+
+
+class Command(BaseCommand):
+    help = 'Bulk import products of a vendor from a CSV or JSONL file.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('vendor_id', type=int)
+        parser.add_argument('path')
+        parser.add_argument('--format', choices=['csv', 'jsonl'], help='Defaults to the file extension.')
+        parser.add_argument('--chunk-size', type=int, default=IMPORT_CHUNK_SIZE)
+
+    def handle(self, *args, **options):
+        vendor = VendorProfile.objects.filter(pk=options['vendor_id']).first()
+        if vendor is None:
+            raise CommandError(f"Vendor {options['vendor_id']} does not exist")
+
+        file_format = options['format'] or options['path'].rsplit('.', 1)[-1].lower()
+        if file_format not in ['csv', 'jsonl']:
+            raise CommandError('Could not detect the format from the file name, pass --format')
+
+        with open(options['path'], 'rb') as stream:
+            result = ProductImportService(vendor, chunk_size=options['chunk_size']).run(stream, file_format)
+
+        for error in result['errors']:
+            self.stderr.write(f"line {error['line']}: {error['errors']}")
+        self.stdout.write(self.style.SUCCESS(f"Created {result['created']} products, {result['failed']} rows failed"))
@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+
+from apps.shop.services.cache_services import ProductResponseCacheService
+
+
+class Command(BaseCommand):
+    help = 'Show hit/miss counters of the product response cache.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--reset', action='store_true', help='Reset the counters after printing them.')
+
+    def handle(self, *args, **options):
+        stats = ProductResponseCacheService.get_stats()
+        lookups = stats['hits'] + stats['misses']
+        hit_ratio = stats['hits'] / lookups * 100 if lookups else 0
+        for counter, value in stats.items():
+            self.stdout.write(f'{counter}: {value}')
+        self.stdout.write(f'hit ratio: {hit_ratio:.1f}%')
+
+        if options['reset']:
+            ProductResponseCacheService.reset_stats()
+            self.stdout.write(self.style.SUCCESS('Counters reset'))
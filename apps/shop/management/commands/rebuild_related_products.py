@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+
+from apps.shop.services.related_product_services import RelatedProductService
+
+
+class Command(BaseCommand):
+    help = (
+        'Recompute the related products of every product, or of the given category trees. '
+        'Tag edits update the table incrementally; run this after bulk imports or category moves.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--tree', type=int, action='append', dest='trees', help='Only rebuild this category tree id.')
+
+    def handle(self, *args, **options):
+        created = RelatedProductService.rebuild(options['trees'])
+        self.stdout.write(self.style.SUCCESS(f'Stored {created} related products'))
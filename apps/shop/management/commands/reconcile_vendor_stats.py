@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+
+from apps.shop.services.vendor_stats_services import VendorStatsService
+
+
+class Command(BaseCommand):
+    help = (
+        'Rebuild vendor storefront statistics from products and paid orders and correct any drift. '
+        'Schedule it periodically, e.g. nightly from cron.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--vendor', type=int, action='append', dest='vendors', help='Only reconcile these vendors.')
+
+    def handle(self, *args, **options):
+        corrected = VendorStatsService.reconcile(options['vendors'])
+        self.stdout.write(self.style.SUCCESS(f'Corrected {corrected} vendor stats rows'))
@@ -0,0 +1,27 @@
+from django.core.cache import cache
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from apps.shop.services.pricing_services import ProductPricingService
+
+LAST_RUN_KEY = 'effective_prices_last_run'
+
+
+class Command(BaseCommand):
+    help = (
+        'Reprice products whose discounts started or ended since the previous run. '
+        'Schedule it every minute, e.g. from cron.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--all', action='store_true', help='Recompute the effective price of every product.')
+
+    def handle(self, *args, **options):
+        now = timezone.now()
+        since = cache.get(LAST_RUN_KEY)
+        if options['all'] or since is None:
+            updated = ProductPricingService.refresh_effective_prices()
+        else:
+            updated = ProductPricingService.refresh_crossed_discounts(since, now)
+        cache.set(LAST_RUN_KEY, now, timeout=None)
+        self.stdout.write(self.style.SUCCESS(f'Repriced {updated} products'))
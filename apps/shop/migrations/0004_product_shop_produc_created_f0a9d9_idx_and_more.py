@@ -0,0 +1,27 @@
+# Generated by Django 5.1.7 on 2026-10-18 07:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0007_alter_addresses_unique_together'),
+        ('shop', '0003_alter_category_slug_alter_product_slug'),
+        ('taggit', '0006_rename_taggeditem_content_type_object_id_taggit_tagg_content_8fc721_idx'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='product',
+            index=models.Index(fields=['-created', '-id'], name='shop_produc_created_f0a9d9_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='product',
+            index=models.Index(fields=['vendor', '-created', '-id'], name='shop_produc_vendor__d18fda_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='product',
+            index=models.Index(fields=['category', '-created', '-id'], name='shop_produc_categor_6d1074_idx'),
+        ),
+    ]
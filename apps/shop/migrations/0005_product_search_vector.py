@@ -0,0 +1,50 @@
+# Generated by Django 5.1.7 on 2026-10-18 07:14
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.contrib.postgres.aggregates import StringAgg
+from django.contrib.postgres.search import SearchVector
+from django.db import migrations
+from django.db.models import OuterRef, Subquery
+
+
+def populate_search_vector(apps, schema_editor):
+    Product = apps.get_model('shop', 'Product')
+    TaggedItem = apps.get_model('taggit', 'TaggedItem')
+    tag_names = (
+        TaggedItem.objects
+        .filter(content_type__app_label='shop', content_type__model='product', object_id=OuterRef('pk'))
+        .values('object_id')
+        .annotate(names=StringAgg('tag__name', ' '))
+        .values('names')
+    )
+    Product.objects.update(
+        search_vector=(
+            SearchVector('name', weight='A', config='simple')
+            + SearchVector(Subquery(tag_names), weight='B', config='simple')
+            + SearchVector('description', weight='C', config='simple')
+        )
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0007_alter_addresses_unique_together'),
+        ('shop', '0004_product_shop_produc_created_f0a9d9_idx_and_more'),
+        ('taggit', '0006_rename_taggeditem_content_type_object_id_taggit_tagg_content_8fc721_idx'),
+        ('contenttypes', '0002_remove_content_type_name'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='product',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='product',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='shop_produc_search__a4db0b_gin'),
+        ),
+        migrations.RunPython(populate_search_vector, migrations.RunPython.noop),
+    ]
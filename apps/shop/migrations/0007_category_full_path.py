@@ -0,0 +1,30 @@
+# Generated by Django 5.1.7 on 2026-10-18 07:18
+
+from django.db import migrations, models
+
+
+def populate_full_path(apps, schema_editor):
+    Category = apps.get_model('shop', 'Category')
+    paths = {}
+    categories = list(Category.objects.order_by('tree_id', 'lft'))
+    for category in categories:
+        parent_path = paths.get(category.parent_id)
+        category.full_path = f'{parent_path} → {category.name}' if parent_path else category.name
+        paths[category.id] = category.full_path
+    Category.objects.bulk_update(categories, ['full_path'], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('shop', '0006_category_tree_range_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='category',
+            name='full_path',
+            field=models.TextField(blank=True, editable=False),
+        ),
+        migrations.RunPython(populate_full_path, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.1.7 on 2026-10-18 07:39
+
+import apps.shop.models
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('shop', '0008_product_thumbnails'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='product',
+            name='slug',
+            field=apps.shop.models.ProductSlugField(editable=False, populate_from='name', unique=True),
+        ),
+    ]
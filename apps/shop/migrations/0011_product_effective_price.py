@@ -0,0 +1,40 @@
+# Generated by Django 5.1.7 on 2026-10-18 07:46
+
+from django.db import migrations, models
+
+POPULATE_EFFECTIVE_PRICE = '''
+UPDATE shop_product AS product
+SET effective_price = product.price * (100 - LEAST(COALESCE((
+    SELECT MAX(discount.value)
+    FROM shop_discount AS discount
+    JOIN shop_discount_products AS link ON link.discount_id = discount.id
+    WHERE link.product_id = product.id
+      AND discount.is_active
+      AND discount.start_date <= now()
+      AND discount.end_date >= now()
+), 0), 100)) / 100
+'''
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('shop', '0010_product_filter_indexes'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='product',
+            name='shop_product_cat_price_idx',
+        ),
+        migrations.AddField(
+            model_name='product',
+            name='effective_price',
+            field=models.IntegerField(default=0, editable=False),
+            preserve_default=False,
+        ),
+        migrations.RunSQL(POPULATE_EFFECTIVE_PRICE, migrations.RunSQL.noop),
+        migrations.AddIndex(
+            model_name='product',
+            index=models.Index(fields=['category', 'effective_price'], name='shop_product_cat_price_idx'),
+        ),
+    ]
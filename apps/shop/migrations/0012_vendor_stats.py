@@ -0,0 +1,59 @@
+# Generated by Django 5.1.7 on 2026-10-18 07:56
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+POPULATE_VENDOR_STATS = '''
+INSERT INTO shop_vendorstats (vendor_id, product_count, in_stock_count, inventory_value, units_sold, revenue, updated)
+SELECT
+    vendor.id,
+    COALESCE(products.product_count, 0),
+    COALESCE(products.in_stock_count, 0),
+    COALESCE(products.inventory_value, 0),
+    COALESCE(sales.units_sold, 0),
+    COALESCE(sales.revenue, 0),
+    now()
+FROM accounts_vendorprofile AS vendor
+LEFT JOIN (
+    SELECT vendor_id, COUNT(*) AS product_count, COUNT(*) FILTER (WHERE stock > 0) AS in_stock_count,
+           SUM(price::bigint * stock) AS inventory_value
+    FROM shop_product
+    GROUP BY vendor_id
+) AS products ON products.vendor_id = vendor.id
+LEFT JOIN (
+    SELECT product.vendor_id, SUM(item.quantity) AS units_sold, SUM(item.price::bigint * item.quantity) AS revenue
+    FROM orders_orderitem AS item
+    JOIN orders_order AS placed ON placed.id = item.order_id
+    JOIN shop_product AS product ON product.id = item.product_id
+    WHERE placed.paid
+    GROUP BY product.vendor_id
+) AS sales ON sales.vendor_id = vendor.id
+'''
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0007_alter_addresses_unique_together'),
+        ('orders', '0017_rename_user_subscription_buyer'),
+        ('shop', '0011_product_effective_price'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='VendorStats',
+            fields=[
+                ('vendor', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='stats', serialize=False, to='accounts.vendorprofile')),
+                ('product_count', models.IntegerField(default=0)),
+                ('in_stock_count', models.IntegerField(default=0)),
+                ('inventory_value', models.BigIntegerField(default=0)),
+                ('units_sold', models.BigIntegerField(default=0)),
+                ('revenue', models.BigIntegerField(default=0)),
+                ('updated', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Vendor Stats',
+                'verbose_name_plural': 'Vendor Stats',
+            },
+        ),
+        migrations.RunSQL(POPULATE_VENDOR_STATS, migrations.RunSQL.noop),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 5.1.7 on 2026-10-18 07:58
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('shop', '0012_vendor_stats'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RelatedProduct',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('score', models.FloatField()),
+                ('product', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='related_entries', to='shop.product')),
+                ('related', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='related_by', to='shop.product')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['product', '-score'], name='shop_related_product_rank_idx')],
+                'constraints': [models.UniqueConstraint(fields=('product', 'related'), name='shop_related_product_unique')],
+            },
+        ),
+    ]
@@ -1,5 +1,9 @@
 from django.db import models
+from django.db.models import Value
+from django.db.models.functions import Concat, Length, Substr
 from django.utils import timezone
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
 
 from mptt.models import MPTTModel, TreeForeignKey
 from taggit.managers import TaggableManager
@@ -7,10 +11,23 @@ from autoslug import AutoSlugField
 
 from apps.accounts.models import VendorProfile
 
+class ProductSlugField(AutoSlugField):
+    """
+    AutoSlugField that keeps a slug reserved up front by bulk inserts instead of
+    checking its uniqueness with one query per row.
+    """
+    def pre_save(self, instance, add):
+        if add and getattr(instance, '_slug_reserved', False):
+            return getattr(instance, self.attname)
+        return super().pre_save(instance, add)
+
 class Category(MPTTModel):
+    PATH_SEPARATOR = ' → '
+
     name = models.CharField(max_length=100)
     slug = AutoSlugField(populate_from='name', unique=True)
     parent = TreeForeignKey('self', on_delete=models.CASCADE, null=True, blank=True, related_name='children')
+    full_path = models.TextField(editable=False, blank=True)
 
     class MPTTMeta:
         order_insertion_by = ['name']
@@ -18,28 +35,117 @@ class Category(MPTTModel):
     class Meta:
         verbose_name = 'Category'
         verbose_name_plural = 'Categories'
+        indexes = [
+            models.Index(fields=['tree_id', 'lft', 'rght'], name='shop_category_tree_range_idx'),
+        ]
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_path_source = (instance.__dict__.get('name'), instance.__dict__.get('parent_id'))
+        return instance
+
+    def _full_path_changed(self):
+        loaded_path_source = getattr(self, '_loaded_path_source', None)
+        return loaded_path_source is None or loaded_path_source != (self.name, self.parent_id)
+
+    def save(self, *args, **kwargs):
+        if not self._full_path_changed():
+            return super().save(*args, **kwargs)
+
+        old_full_path = None
+        if self.pk:
+            old_full_path = Category.objects.filter(pk=self.pk).values_list('full_path', flat=True).first()
+
+        parent_path = None
+        if self.parent_id:
+            parent_path = Category.objects.filter(pk=self.parent_id).values_list('full_path', flat=True).first()
+        self.full_path = f'{parent_path}{self.PATH_SEPARATOR}{self.name}' if parent_path else self.name
+        if kwargs.get('update_fields') is not None:
+            kwargs['update_fields'] = {*kwargs['update_fields'], 'full_path'}
+
+        super().save(*args, **kwargs)
+        self._loaded_path_source = (self.name, self.parent_id)
+
+        if old_full_path and old_full_path != self.full_path:
+            self.get_descendants().update(
+                full_path=Concat(Value(self.full_path), Substr('full_path', Length(Value(old_full_path)) + 1))
+            )
 
     def __str__(self):
-        return " → ".join(self.get_ancestors(include_self=True).values_list('name', flat=True))
+        return self.full_path
 
 class Product(models.Model):
     name = models.CharField(max_length=100)
     vendor = models.ForeignKey(VendorProfile, on_delete=models.CASCADE, related_name='products')
-    slug = AutoSlugField(populate_from='name', unique=True)
+    slug = ProductSlugField(populate_from='name', unique=True)
     tags = TaggableManager()
     product_picture = models.ImageField(upload_to='product_pictures/', null=True, blank=True)
+    thumbnails = models.JSONField(default=dict, blank=True, editable=False)
     category = models.ForeignKey(Category, on_delete=models.CASCADE, related_name='products')
     price = models.PositiveIntegerField()
+    effective_price = models.IntegerField(editable=False)
     stock = models.PositiveIntegerField()
     weight = models.PositiveIntegerField(default=0)
     description = models.TextField()
     created = models.DateTimeField(auto_now_add=True)
     updated = models.DateTimeField(auto_now=True)
+    search_vector = SearchVectorField(null=True, editable=False)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['-created', '-id']),
+            models.Index(fields=['vendor', '-created', '-id']),
+            models.Index(fields=['category', '-created', '-id']),
+            models.Index(fields=['category', 'effective_price'], name='shop_product_cat_price_idx'),
+            models.Index(fields=['-created', '-id'], condition=models.Q(stock__gt=0), name='shop_product_in_stock_idx'),
+            GinIndex(fields=['search_vector']),
+        ]
+
+    def save(self, *args, **kwargs):
+        # A new product has no discounts yet; existing ones are repriced by the pricing service.
+        if self.effective_price is None:
+            self.effective_price = self.price
+        super().save(*args, **kwargs)
 
     def __str__(self):
         return self.name
 
 
+class RelatedProduct(models.Model):
+    product = models.ForeignKey(Product, on_delete=models.CASCADE, related_name='related_entries')
+    related = models.ForeignKey(Product, on_delete=models.CASCADE, related_name='related_by')
+    score = models.FloatField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['product', 'related'], name='shop_related_product_unique'),
+        ]
+        indexes = [
+            models.Index(fields=['product', '-score'], name='shop_related_product_rank_idx'),
+        ]
+
+    def __str__(self):
+        return f'{self.product_id} -> {self.related_id}'
+
+
+class VendorStats(models.Model):
+    vendor = models.OneToOneField(VendorProfile, on_delete=models.CASCADE, primary_key=True, related_name='stats')
+    product_count = models.IntegerField(default=0)
+    in_stock_count = models.IntegerField(default=0)
+    inventory_value = models.BigIntegerField(default=0)
+    units_sold = models.BigIntegerField(default=0)
+    revenue = models.BigIntegerField(default=0)
+    updated = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = 'Vendor Stats'
+        verbose_name_plural = 'Vendor Stats'
+
+    def __str__(self):
+        return f'stats {self.vendor_id}'
+
+
 class Discount(models.Model):
     products = models.ManyToManyField(Product, related_name='discounts')
     code = models.CharField(max_length=50, unique=True)
@@ -12,4 +12,19 @@ class IsVendor(BasePermission):
        if user.is_authenticated and user.role == ShopUser.Roles.VENDOR and hasattr(user, 'vendor_profile'):
            return user.vendor_profile.status == VendorProfile.Status.APPROVED
 
-       return False
\ No newline at end of file
+       return False
+
+class IsApprovedVendorOrAdmin(BasePermission):
+    def has_permission(self, request, view):
+        user = request.user
+
+        if not user.is_authenticated:
+            return False
+
+        if user.is_staff:
+            return True
+
+        if user.role == ShopUser.Roles.VENDOR and hasattr(user, 'vendor_profile'):
+            return user.vendor_profile.status == VendorProfile.Status.APPROVED
+
+        return False
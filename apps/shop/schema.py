@@ -15,4 +15,38 @@ PRODUCT_NOT_FOUND_EXAMPLES = [
         value={'detail': 'Product not found'},
         description='Example response when the product ID is not found.',
     )
-]
\ No newline at end of file
+]
+
+PRODUCT_EXPORT_FORMAT_PARAMETER = OpenApiParameter(
+    name='export_format',
+    description='File format of the export',
+    required=False,
+    type=OpenApiTypes.STR,
+    enum=['csv', 'jsonl'],
+    default='csv',
+    location=OpenApiParameter.QUERY,
+)
+
+PRODUCT_FIELDS_PARAMETER = OpenApiParameter(
+    name='fields',
+    description='Comma separated product fields to return, e.g. `id,name,price,thumbnails`',
+    required=False,
+    type=OpenApiTypes.STR,
+    location=OpenApiParameter.QUERY,
+)
+
+VENDOR_ID_PARAMETER = OpenApiParameter(
+    name='id',
+    description='ID of the vendor profile',
+    required=True,
+    type=OpenApiTypes.INT,
+    location=OpenApiParameter.PATH,
+)
+
+VENDOR_NOT_FOUND_EXAMPLES = [
+    OpenApiExample(
+        name='Vendor not found',
+        value={'detail': 'Vendor not found'},
+        description='Example response when the vendor does not exist or is not approved.',
+    )
+]
@@ -0,0 +1,12 @@
+from django.db.models import Q
+
+from apps.shop.models import Category
+
+
+def filter_category_ranges_by_ids_or_slugs(ids, slugs):
+    return Category.objects.filter(Q(id__in=ids) | Q(slug__in=slugs)).values_list(
+        'id', 'slug', 'tree_id', 'lft', 'rght'
+    )
+
+def get_category_tree_rows():
+    return Category.objects.order_by('tree_id', 'lft').values('id', 'name', 'slug', 'parent_id')
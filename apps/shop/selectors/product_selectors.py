@@ -0,0 +1,94 @@
+from collections import defaultdict
+
+from django.contrib.contenttypes.models import ContentType
+from django.db.models import Count, Max
+
+from taggit.models import TaggedItem
+
+from apps.shop.models import Product
+
+PRODUCT_SELECT_RELATED = ['category__parent', 'vendor']
+PRODUCT_PREFETCH_RELATED = ['tags']
+PRODUCT_FIELD_COLUMNS = {
+    'category': ['category__name', 'category__parent__name'],
+    'tags': [],
+}
+
+
+def with_product_relations(queryset):
+    return queryset.select_related(*PRODUCT_SELECT_RELATED).prefetch_related(*PRODUCT_PREFETCH_RELATED)
+
+def get_all_products():
+    return with_product_relations(Product.objects.all())
+
+def get_product_columns(fields):
+    # Keyset pagination reads the ordering columns of every row, so they are always loaded.
+    columns = ['id', 'created']
+    for field in fields:
+        columns += PRODUCT_FIELD_COLUMNS.get(field, [field])
+    return columns
+
+def narrow_product_queryset(queryset, fields):
+    queryset = queryset.select_related(None).prefetch_related(None)
+    if 'category' in fields:
+        queryset = queryset.select_related('category__parent')
+    if 'tags' in fields:
+        queryset = queryset.prefetch_related(*PRODUCT_PREFETCH_RELATED)
+    return queryset.only(*get_product_columns(fields))
+
+def get_product_rows(queryset, fields):
+    columns = get_product_columns(fields)
+    if 'search_rank' in queryset.query.annotations:
+        columns.append('search_rank')
+    # Rows are plain dicts, so there is nothing for a prefetch to attach to.
+    return narrow_product_queryset(queryset, fields).prefetch_related(None).values(*dict.fromkeys(columns))
+
+def filter_products_by_ids(product_ids):
+    return with_product_relations(Product.objects.filter(id__in=product_ids))
+
+def filter_cart_products_by_ids(product_ids):
+    return Product.objects.filter(id__in=product_ids).only('id', 'price', 'weight', 'stock')
+
+def get_product_last_modified(product_id):
+    return Product.objects.filter(id=product_id).values_list('updated', flat=True).first()
+
+def aggregate_products_last_modified(queryset):
+    return queryset.order_by().aggregate(last_modified=Max('updated'), count=Count('id'))
+
+def get_product_tag_names(product_ids):
+    tag_names = defaultdict(list)
+    rows = (
+        TaggedItem.objects
+        .filter(content_type=ContentType.objects.get_for_model(Product), object_id__in=product_ids)
+        .order_by('id')
+        .values_list('object_id', 'tag__name')
+    )
+    for product_id, name in rows:
+        tag_names[product_id].append(name)
+    return tag_names
+
+def get_saved_product(product_id):
+    return Product.objects.filter(pk=product_id).only('vendor', 'category', 'price', 'stock').first()
+
+def get_related_products(product_id, limit):
+    return with_product_relations(
+        Product.objects.filter(related_by__product_id=product_id).order_by('-related_by__score', 'id')
+    )[:limit]
+
+def get_product_tag_ids(product_id):
+    return list(
+        TaggedItem.objects
+        .filter(content_type=ContentType.objects.get_for_model(Product), object_id=product_id)
+        .values_list('tag_id', flat=True)
+    )
+
+def filter_tagged_items_by_tree(tree_id):
+    return TaggedItem.objects.filter(
+        content_type=ContentType.objects.get_for_model(Product),
+        object_id__in=Product.objects.filter(category__tree_id=tree_id).values('id'),
+    )
+
+def count_tag_frequencies(tagged_items, tag_ids):
+    return dict(
+        tagged_items.filter(tag_id__in=tag_ids).values('tag_id').annotate(frequency=Count('id')).values_list('tag_id', 'frequency')
+    )
@@ -0,0 +1,49 @@
+from django.db.models import BigIntegerField, Count, F, Q, Sum
+from django.db.models.functions import Cast, Coalesce
+
+from apps.accounts.models import VendorProfile
+from apps.orders.models import OrderItem
+from apps.shop.models import Product, VendorStats
+
+# Cast before multiplying so price * quantity cannot overflow a Postgres integer.
+INVENTORY_VALUE = Cast('price', BigIntegerField()) * F('stock')
+SALE_VALUE = Cast('price', BigIntegerField()) * F('quantity')
+
+
+def get_vendor_stats(vendor_id):
+    return VendorStats.objects.select_related('vendor').filter(vendor_id=vendor_id).first()
+
+
+def filter_vendor_ids(vendor_ids=None):
+    queryset = VendorProfile.objects.order_by('id')
+    if vendor_ids is not None:
+        queryset = queryset.filter(id__in=vendor_ids)
+    return list(queryset.values_list('id', flat=True))
+
+
+def aggregate_product_stats_by_vendor(vendor_ids):
+    return (
+        Product.objects
+        .filter(vendor_id__in=vendor_ids)
+        .values('vendor_id')
+        .annotate(
+            product_count=Count('id'),
+            in_stock_count=Count('id', filter=Q(stock__gt=0)),
+            inventory_value=Coalesce(Sum(INVENTORY_VALUE), 0),
+        )
+        .order_by()
+    )
+
+
+def aggregate_sales_by_vendor(vendor_ids=None, order_id=None):
+    queryset = OrderItem.objects.filter(order__paid=True)
+    if vendor_ids is not None:
+        queryset = queryset.filter(product__vendor_id__in=vendor_ids)
+    if order_id is not None:
+        queryset = queryset.filter(order_id=order_id)
+    return (
+        queryset
+        .values(vendor_id=F('product__vendor_id'))
+        .annotate(units_sold=Coalesce(Sum('quantity'), 0), revenue=Coalesce(Sum(SALE_VALUE), 0))
+        .order_by()
+    )
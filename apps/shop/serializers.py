@@ -1,9 +1,17 @@
+from operator import itemgetter
+
+from django.core.files.storage import default_storage
+
 from rest_framework import serializers
 
 from drf_spectacular.utils import extend_schema_field
 from taggit.serializers import TagListSerializerField, TaggitSerializer
+from taggit.utils import parse_tags
 
-from apps.shop.models import Product, Category
+from apps.shop.models import Product, Category, VendorStats
+from apps.shop.selectors.product_selectors import get_product_rows, get_product_tag_names
+from apps.shop.services.thumbnail_services import ProductThumbnailService
+from apps.shop.sparse_fields import SparseFieldsMixin
 
 class CategorySerializer(serializers.ModelSerializer):
     parent = serializers.SerializerMethodField()
@@ -16,14 +24,59 @@ class CategorySerializer(serializers.ModelSerializer):
     def get_parent(self, obj):
         return obj.parent.name if obj.parent else None
 
-class ProductSerializer(serializers.ModelSerializer):
+class CategoryTreeSerializer(serializers.Serializer):
+    id = serializers.IntegerField()
+    name = serializers.CharField()
+    slug = serializers.SlugField()
+    children = serializers.ListField(child=serializers.DictField())
+
+class ProductSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     tags = TagListSerializerField()
     category = CategorySerializer()
     product_picture = serializers.ImageField(required=False, allow_null=True)
+    thumbnails = serializers.SerializerMethodField()
 
     class Meta:
         model = Product
-        fields = ['id', 'category' ,'name', 'description', 'price', 'stock', 'product_picture', 'tags']
+        fields = ['id', 'category' ,'name', 'description', 'price', 'effective_price', 'stock', 'product_picture', 'thumbnails', 'tags']
+
+    @extend_schema_field(serializers.DictField(child=serializers.DictField(child=serializers.URLField())))
+    def get_thumbnails(self, obj):
+        return ProductThumbnailService.get_urls(obj.thumbnails, self.context.get('request'))
+
+class ProductRowSerializer:
+    """
+    Read-only twin of ProductSerializer for listings. It maps values() rows with a
+    mapper compiled once per request instead of walking DRF fields per product.
+    """
+    def __init__(self, fields=None, request=None):
+        self.fields = [field for field in ProductSerializer.Meta.fields if not fields or field in fields]
+        self.request = request
+
+    def get_rows(self, queryset):
+        return get_product_rows(queryset, self.fields)
+
+    def build_url(self, name):
+        if not name:
+            return None
+        url = default_storage.url(name)
+        return self.request.build_absolute_uri(url) if self.request else url
+
+    def compile(self, tag_names):
+        request = self.request
+        getters = {
+            'category': lambda row: {'parent': row['category__parent__name'], 'name': row['category__name']},
+            'product_picture': lambda row: self.build_url(row['product_picture']),
+            'thumbnails': lambda row: ProductThumbnailService.get_urls(row['thumbnails'], request),
+            'tags': lambda row: tag_names.get(row['id'], []),
+        }
+        mapping = [(field, getters.get(field, itemgetter(field))) for field in self.fields]
+        return lambda row: {field: getter(row) for field, getter in mapping}
+
+    def to_representation(self, rows):
+        tag_names = get_product_tag_names([row['id'] for row in rows]) if 'tags' in self.fields else {}
+        mapper = self.compile(tag_names)
+        return [mapper(row) for row in rows]
 
 class ProductCreateSerializer(TaggitSerializer,serializers.ModelSerializer):
     category = serializers.PrimaryKeyRelatedField(queryset=Category.objects.exclude(parent=None))
@@ -36,4 +89,72 @@ class ProductCreateSerializer(TaggitSerializer,serializers.ModelSerializer):
 
     def create(self, validated_data):
         user = self.context['request'].user
-        return Product.objects.create(vendor=user.vendor_profile, **validated_data)
\ No newline at end of file
+        return Product.objects.create(vendor=user.vendor_profile, **validated_data)
+
+class ProductImportRowSerializer(serializers.ModelSerializer):
+    category = serializers.IntegerField()
+    tags = serializers.ListField(child=serializers.CharField(max_length=100), required=False, default=list)
+
+    class Meta:
+        model = Product
+        fields = ['category', 'name', 'description', 'price', 'stock', 'weight', 'tags']
+
+    def to_internal_value(self, data):
+        tags = data.get('tags')
+        if isinstance(tags, str):
+            data = {**data, 'tags': parse_tags(tags)}
+        return super().to_internal_value(data)
+
+class ProductImportSerializer(serializers.Serializer):
+    file = serializers.FileField()
+    format = serializers.ChoiceField(choices=['csv', 'jsonl'], required=False)
+
+    def validate(self, attrs):
+        if 'format' not in attrs:
+            extension = attrs['file'].name.rsplit('.', 1)[-1].lower()
+            if extension not in ['csv', 'jsonl']:
+                raise serializers.ValidationError({'format': 'Could not detect the format from the file name.'})
+            attrs['format'] = extension
+        return attrs
+
+class ProductImportErrorSerializer(serializers.Serializer):
+    line = serializers.IntegerField()
+    errors = serializers.DictField()
+
+class ProductImportResultSerializer(serializers.Serializer):
+    created = serializers.IntegerField()
+    failed = serializers.IntegerField()
+    errors = ProductImportErrorSerializer(many=True)
+
+class ProductBulkUpdateListSerializer(serializers.ListSerializer):
+    def validate(self, attrs):
+        ids = [item['id'] for item in attrs]
+        if len(ids) != len(set(ids)):
+            raise serializers.ValidationError('Each product may appear only once.')
+        return attrs
+
+class ProductBulkUpdateSerializer(serializers.Serializer):
+    id = serializers.IntegerField()
+    price = serializers.IntegerField(min_value=0, max_value=2147483647, required=False)
+    stock = serializers.IntegerField(min_value=0, max_value=2147483647, required=False)
+
+    class Meta:
+        list_serializer_class = ProductBulkUpdateListSerializer
+
+    def validate(self, attrs):
+        if 'price' not in attrs and 'stock' not in attrs:
+            raise serializers.ValidationError('Provide price or stock.')
+        return attrs
+
+class ProductBulkUpdateResultSerializer(serializers.Serializer):
+    updated = serializers.IntegerField()
+
+
+class VendorStatsSerializer(SparseFieldsMixin, serializers.ModelSerializer):
+    store_name = serializers.CharField(source='vendor.store_name')
+
+    PUBLIC_FIELDS = ['vendor', 'store_name', 'product_count', 'in_stock_count']
+
+    class Meta:
+        model = VendorStats
+        fields = ['vendor', 'store_name', 'product_count', 'in_stock_count', 'inventory_value', 'units_sold', 'revenue', 'updated']
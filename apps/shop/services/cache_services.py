@@ -0,0 +1,150 @@
+import hashlib
+import time
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.core.cache import cache
+
+from apps.shop.selectors.product_selectors import (
+    aggregate_products_last_modified,
+    get_product_last_modified,
+)
+
+CATEGORY_TREE_VERSION_KEY = 'category_tree_version'
+CATALOG_VERSION_KEY = 'catalog_version'
+VENDOR_VERSION_KEY = 'catalog_version:vendor:{}'
+PRODUCT_VERSION_KEY = 'catalog_version:product:{}'
+TAG_VERSION_KEY = 'catalog_version:tags'
+CACHE_STATS_KEY = 'product_response_cache:{}'
+
+
+class CacheVersionService:
+    @staticmethod
+    def get_versions(*keys):
+        versions = cache.get_many(keys)
+        missing = [key for key in keys if key not in versions]
+        if missing:
+            # Seed from the clock so a lost version key never revives old entries.
+            for key in missing:
+                cache.add(key, time.time_ns(), timeout=None)
+            versions.update(cache.get_many(missing))
+        return [versions[key] for key in keys]
+
+    @staticmethod
+    def get_version(key):
+        return CacheVersionService.get_versions(key)[0]
+
+    @staticmethod
+    def bump_versions(*keys):
+        # A fresh clock value changes every key in one round trip, however large the batch.
+        version = time.time_ns()
+        cache.set_many({key: version for key in keys}, timeout=None)
+
+
+class CatalogCacheService:
+    @staticmethod
+    def bump_product_versions(vendor_ids, product_ids):
+        CacheVersionService.bump_versions(
+            CATALOG_VERSION_KEY,
+            *[VENDOR_VERSION_KEY.format(vendor_id) for vendor_id in set(vendor_ids)],
+            *[PRODUCT_VERSION_KEY.format(product_id) for product_id in set(product_ids)],
+        )
+
+    @staticmethod
+    def bump_tag_version():
+        CacheVersionService.bump_versions(TAG_VERSION_KEY)
+
+
+class ProductResponseCacheService:
+    @staticmethod
+    def get_list_versions(vendor_id=None):
+        if vendor_id and str(vendor_id).isdigit():
+            scope_key = VENDOR_VERSION_KEY.format(vendor_id)
+        else:
+            scope_key = CATALOG_VERSION_KEY
+        return CacheVersionService.get_versions(scope_key, CATEGORY_TREE_VERSION_KEY, TAG_VERSION_KEY)
+
+    @staticmethod
+    def get_detail_versions(product_id):
+        return CacheVersionService.get_versions(
+            PRODUCT_VERSION_KEY.format(product_id), CATEGORY_TREE_VERSION_KEY, TAG_VERSION_KEY
+        )
+
+    @staticmethod
+    def build_key(request, action, versions):
+        params = sorted(
+            (name, value)
+            for name in request.query_params
+            for value in request.query_params.getlist(name)
+            if value != ''
+        )
+        url = f'{request.get_host()}{request.path}?{urlencode(params)}'
+        digest = hashlib.md5(url.encode()).hexdigest()
+        return f"product_response:{action}:{':'.join(map(str, versions))}:{digest}"
+
+    @staticmethod
+    def is_bypassed(request):
+        header = settings.PRODUCT_RESPONSE_CACHE['BYPASS_HEADER']
+        return request.headers.get(header, '').lower() in ['1', 'true', 'yes']
+
+    @staticmethod
+    def get(key):
+        data = cache.get(key)
+        ProductResponseCacheService.record('hits' if data is not None else 'misses')
+        return data
+
+    @staticmethod
+    def set(key, data):
+        cache.set(key, data, settings.PRODUCT_RESPONSE_CACHE['TIMEOUT'])
+
+    @staticmethod
+    def record(counter):
+        key = CACHE_STATS_KEY.format(counter)
+        if not cache.add(key, 1, timeout=None):
+            cache.incr(key)
+
+    @staticmethod
+    def get_stats():
+        counters = ['hits', 'misses', 'bypasses']
+        stats = cache.get_many([CACHE_STATS_KEY.format(counter) for counter in counters])
+        return {counter: stats.get(CACHE_STATS_KEY.format(counter), 0) for counter in counters}
+
+    @staticmethod
+    def reset_stats():
+        cache.delete_many([CACHE_STATS_KEY.format(counter) for counter in ['hits', 'misses', 'bypasses']])
+
+
+class ProductConditionalService:
+    """
+    Validators for conditional GETs. Tag and category changes and deletes do not
+    touch `Product.updated`, so the cache versions, which are bump times, are folded
+    into both the ETag and Last-Modified.
+    """
+    @staticmethod
+    def build_etag(versions, *values):
+        payload = ':'.join(map(str, [*versions, *values]))
+        return f'"{hashlib.md5(payload.encode()).hexdigest()}"'
+
+    @staticmethod
+    def build_last_modified(versions, updated):
+        timestamps = [version / 1e9 for version in versions]
+        if updated is not None:
+            timestamps.append(updated.timestamp())
+        return int(max(timestamps))
+
+    @staticmethod
+    def get_detail_validators(product_id, versions):
+        last_modified = get_product_last_modified(product_id) if str(product_id).isdigit() else None
+        if last_modified is None:
+            return None, None
+        etag = ProductConditionalService.build_etag(versions, last_modified.isoformat())
+        return etag, ProductConditionalService.build_last_modified(versions, last_modified)
+
+    @staticmethod
+    def get_list_validators(queryset, versions):
+        aggregate = aggregate_products_last_modified(queryset)
+        last_modified = aggregate['last_modified']
+        etag = ProductConditionalService.build_etag(
+            versions, last_modified.isoformat() if last_modified else '', aggregate['count']
+        )
+        return etag, ProductConditionalService.build_last_modified(versions, last_modified)
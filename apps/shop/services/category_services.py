@@ -0,0 +1,67 @@
+from django.core.cache import cache
+
+from apps.shop.selectors.category_selectors import (
+    filter_category_ranges_by_ids_or_slugs,
+    get_category_tree_rows,
+)
+
+from .cache_services import CATEGORY_TREE_VERSION_KEY, CacheVersionService
+
+CATEGORY_RANGE_TIMEOUT = 60 * 60
+CATEGORY_TREE_TIMEOUT = 60 * 60 * 24
+
+
+class CategoryTreeService:
+    @staticmethod
+    def get_tree_version():
+        return CacheVersionService.get_version(CATEGORY_TREE_VERSION_KEY)
+
+    @staticmethod
+    def bump_tree_version():
+        CacheVersionService.bump_versions(CATEGORY_TREE_VERSION_KEY)
+
+    @staticmethod
+    def resolve_ranges(values):
+        version = CategoryTreeService.get_tree_version()
+        keys = {value: f'category_range:{version}:{value}' for value in values}
+        cached = cache.get_many(keys.values())
+
+        missing = [value for value, key in keys.items() if key not in cached]
+        if missing:
+            ids = [int(value) for value in missing if value.isdigit()]
+            resolved = {value: False for value in missing}
+            for category_id, slug, tree_id, lft, rght in filter_category_ranges_by_ids_or_slugs(ids, missing):
+                for value in (str(category_id), slug):
+                    if value in resolved:
+                        resolved[value] = (tree_id, lft, rght)
+            cache.set_many({keys[value]: tree_range for value, tree_range in resolved.items()}, CATEGORY_RANGE_TIMEOUT)
+            cached.update({keys[value]: tree_range for value, tree_range in resolved.items()})
+
+        return [cached[key] for key in keys.values() if cached[key]]
+
+    @staticmethod
+    def get_tree_etag():
+        return f'"category-tree-{CategoryTreeService.get_tree_version()}"'
+
+    @staticmethod
+    def get_tree():
+        key = f'category_tree:{CategoryTreeService.get_tree_version()}'
+        tree = cache.get(key)
+        if tree is None:
+            tree = CategoryTreeService.build_tree()
+            cache.set(key, tree, CATEGORY_TREE_TIMEOUT)
+        return tree
+
+    @staticmethod
+    def build_tree():
+        # Rows arrive in (tree_id, lft) order, so every parent precedes its children.
+        nodes = {}
+        roots = []
+        for row in get_category_tree_rows():
+            node = {'id': row['id'], 'name': row['name'], 'slug': row['slug'], 'children': []}
+            nodes[row['id']] = node
+            if row['parent_id'] is None:
+                roots.append(node)
+            else:
+                nodes[row['parent_id']]['children'].append(node)
+        return roots
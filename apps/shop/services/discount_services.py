@@ -0,0 +1,73 @@
+import threading
+
+from django.core.cache import cache
+from django.utils import timezone
+
+from apps.shop.models import Discount
+
+from .cache_services import CacheVersionService
+
+DISCOUNT_VERSION_KEY = 'discount_registry_version'
+DISCOUNT_REGISTRY_KEY = 'discount_registry:{}'
+DISCOUNT_REGISTRY_TIMEOUT = 60 * 60 * 24
+
+
+class DiscountRegistry:
+    """
+    Active discount codes and their validity windows, kept in process memory and
+    in Redis. A lookup costs one version read from Redis and no database query.
+    """
+    _local = (None, {})
+    _lock = threading.Lock()
+
+    @classmethod
+    def get_discounts(cls):
+        version = CacheVersionService.get_version(DISCOUNT_VERSION_KEY)
+        local_version, discounts = cls._local
+        if local_version == version:
+            return discounts
+
+        with cls._lock:
+            key = DISCOUNT_REGISTRY_KEY.format(version)
+            discounts = cache.get(key)
+            if discounts is None:
+                discounts = cls.build()
+                cache.set(key, discounts, DISCOUNT_REGISTRY_TIMEOUT)
+            cls._local = (version, discounts)
+        return discounts
+
+    @staticmethod
+    def build():
+        # Expired codes stay out; they can only become valid again through a save, which rebuilds the registry.
+        rows = (
+            Discount.objects
+            .filter(is_active=True, end_date__gte=timezone.now())
+            .values_list('code', 'value', 'start_date', 'end_date')
+        )
+        return {
+            code: {'value': value, 'start_date': start_date, 'end_date': end_date}
+            for code, value, start_date, end_date in rows
+        }
+
+    @classmethod
+    def get(cls, code):
+        if not code:
+            return None
+        return cls.get_discounts().get(code)
+
+    @staticmethod
+    def is_valid(discount, now=None):
+        now = now or timezone.now()
+        return discount['start_date'] <= now <= discount['end_date']
+
+    @classmethod
+    def get_valid(cls, code):
+        discount = cls.get(code)
+        if discount is None or not cls.is_valid(discount):
+            return None
+        return discount
+
+    @classmethod
+    def invalidate(cls):
+        cls._local = (None, {})
+        CacheVersionService.bump_versions(DISCOUNT_VERSION_KEY)
@@ -0,0 +1,79 @@
+import csv
+import json
+
+from django.core.serializers.json import DjangoJSONEncoder
+
+from taggit.utils import edit_string_for_tags
+
+EXPORT_CHUNK_SIZE = 2000
+EXPORT_FIELDS = [
+    'id', 'name', 'slug', 'vendor_id', 'vendor', 'category_id', 'category_path',
+    'price', 'effective_price', 'stock', 'weight', 'description', 'tags', 'created', 'updated',
+]
+EXPORT_CONTENT_TYPES = {
+    'csv': 'text/csv',
+    'jsonl': 'application/x-ndjson',
+}
+
+
+class EchoBuffer:
+    def write(self, value):
+        return value
+
+
+class ProductExportService:
+    @staticmethod
+    def prepare_queryset(queryset):
+        return (
+            queryset
+            .select_related(None)
+            .select_related('category', 'vendor')
+            .prefetch_related(None)
+            .prefetch_related('tags')
+            .defer('search_vector', 'thumbnails')
+            .order_by('id')
+        )
+
+    @staticmethod
+    def iter_rows(queryset, chunk_size=EXPORT_CHUNK_SIZE):
+        # iterator() with a chunk size runs the tags prefetch once per chunk, so memory stays flat.
+        for product in ProductExportService.prepare_queryset(queryset).iterator(chunk_size=chunk_size):
+            yield {
+                'id': product.id,
+                'name': product.name,
+                'slug': product.slug,
+                'vendor_id': product.vendor_id,
+                'vendor': product.vendor.store_name,
+                'category_id': product.category_id,
+                'category_path': product.category.full_path,
+                'price': product.price,
+                'effective_price': product.effective_price,
+                'stock': product.stock,
+                'weight': product.weight,
+                'description': product.description,
+                'tags': list(product.tags.all()),
+                'created': product.created,
+                'updated': product.updated,
+            }
+
+    @staticmethod
+    def stream_csv(queryset):
+        writer = csv.DictWriter(EchoBuffer(), fieldnames=EXPORT_FIELDS)
+        yield writer.writeheader()
+        for row in ProductExportService.iter_rows(queryset):
+            row['tags'] = edit_string_for_tags(row['tags'])
+            row['created'] = row['created'].isoformat()
+            row['updated'] = row['updated'].isoformat()
+            yield writer.writerow(row)
+
+    @staticmethod
+    def stream_jsonl(queryset):
+        for row in ProductExportService.iter_rows(queryset):
+            row['tags'] = sorted(tag.name for tag in row['tags'])
+            yield json.dumps(row, cls=DjangoJSONEncoder, ensure_ascii=False) + '\n'
+
+    @staticmethod
+    def stream(queryset, file_format):
+        if file_format == 'csv':
+            return ProductExportService.stream_csv(queryset)
+        return ProductExportService.stream_jsonl(queryset)
@@ -0,0 +1,166 @@
+import codecs
+import csv
+import json
+from itertools import islice
+
+from django.contrib.contenttypes.models import ContentType
+from django.db import IntegrityError, transaction
+from django.db.models import Q
+
+from autoslug.utils import crop_slug
+from rest_framework.exceptions import ValidationError
+from taggit.models import Tag, TaggedItem
+
+from apps.shop.models import Category, Product
+from apps.shop.serializers import ProductImportRowSerializer
+
+from .cache_services import CatalogCacheService
+from .search_services import ProductSearchService
+from .vendor_stats_services import VendorStatsService
+
+IMPORT_CHUNK_SIZE = 1000
+MAX_REPORTED_ERRORS = 1000
+SLUG_RESERVATION_ATTEMPTS = 3
+
+
+class ProductImportService:
+    def __init__(self, vendor, chunk_size=IMPORT_CHUNK_SIZE):
+        self.vendor = vendor
+        self.chunk_size = chunk_size
+        self.row_serializer = ProductImportRowSerializer()
+        self.created = 0
+        self.failed = 0
+        self.errors = []
+
+    def run(self, stream, file_format):
+        rows = self.read_csv(stream) if file_format == 'csv' else self.read_jsonl(stream)
+        while chunk := list(islice(rows, self.chunk_size)):
+            self.import_chunk(chunk)
+        return {'created': self.created, 'failed': self.failed, 'errors': self.errors}
+
+    @staticmethod
+    def read_csv(stream):
+        reader = csv.DictReader(codecs.iterdecode(stream, 'utf-8-sig'))
+        for row in reader:
+            # Empty cells mean "not provided" so optional columns fall back to their defaults.
+            yield reader.line_num, {key: value for key, value in row.items() if key and value not in ('', None)}
+
+    @staticmethod
+    def read_jsonl(stream):
+        for line_number, line in enumerate(codecs.iterdecode(stream, 'utf-8-sig'), start=1):
+            if not line.strip():
+                continue
+            try:
+                yield line_number, json.loads(line)
+            except ValueError:
+                yield line_number, None
+
+    def import_chunk(self, chunk):
+        valid_rows = []
+        for line_number, row in chunk:
+            if not isinstance(row, dict):
+                self.add_error(line_number, {'non_field_errors': ['Invalid JSON object.']})
+                continue
+            try:
+                valid_rows.append((line_number, self.row_serializer.run_validation(row)))
+            except ValidationError as exc:
+                self.add_error(line_number, exc.detail)
+
+        category_ids = set(
+            Category.objects
+            .filter(id__in={data['category'] for _, data in valid_rows}, parent__isnull=False)
+            .values_list('id', flat=True)
+        )
+        products = []
+        product_tags = []
+        line_numbers = []
+        for line_number, data in valid_rows:
+            if data['category'] not in category_ids:
+                self.add_error(line_number, {'category': [f'Invalid pk "{data["category"]}" - object does not exist.']})
+                continue
+            tags = data.pop('tags')
+            # New products carry no discounts yet, so they sell at their list price.
+            products.append(
+                Product(vendor=self.vendor, category_id=data.pop('category'), effective_price=data['price'], **data)
+            )
+            product_tags.append(tags)
+            line_numbers.append(line_number)
+
+        if not products:
+            return
+
+        # A concurrent import or create can take a reserved slug before the insert; reserve again and retry.
+        for attempt in range(SLUG_RESERVATION_ATTEMPTS):
+            try:
+                self.save_chunk(products, product_tags)
+                break
+            except IntegrityError:
+                if attempt == SLUG_RESERVATION_ATTEMPTS - 1:
+                    for line_number in line_numbers:
+                        self.add_error(line_number, {'slug': ['Could not reserve a unique slug, please retry.']})
+                    return
+        self.created += len(products)
+
+    def save_chunk(self, products, product_tags):
+        with transaction.atomic():
+            self.reserve_slugs(products)
+            Product.objects.bulk_create(products)
+            self.attach_tags(products, product_tags)
+            product_ids = [product.pk for product in products]
+            ProductSearchService.update_search_vector(product_ids)
+            VendorStatsService.record_product_changes(
+                [(None, VendorStatsService.snapshot(product)) for product in products]
+            )
+            transaction.on_commit(lambda: CatalogCacheService.bump_product_versions([self.vendor.pk], []))
+
+    def add_error(self, line_number, errors):
+        self.failed += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append({'line': line_number, 'errors': errors})
+
+    @staticmethod
+    def reserve_slugs(products):
+        field = Product._meta.get_field('slug')
+        base_slugs = [crop_slug(field, field.slugify(product.name)) or Product._meta.model_name for product in products]
+
+        # Exact and prefix lookups can both use the slug indexes, unlike a regex over the whole table.
+        lookups = Q(slug__in=set(base_slugs))
+        for slug in set(base_slugs):
+            lookups |= Q(slug__startswith=f'{slug}{field.index_sep}')
+        taken = set(Product.objects.filter(lookups).values_list('slug', flat=True))
+
+        for product, base_slug in zip(products, base_slugs):
+            slug = base_slug
+            index = 1
+            while slug in taken:
+                index += 1
+                tail = f'{field.index_sep}{index}'
+                slug = f'{base_slug[:field.max_length - len(tail)]}{tail}'
+            taken.add(slug)
+            product.slug = slug
+            product._slug_reserved = True
+
+    @staticmethod
+    def attach_tags(products, product_tags):
+        names = {name for tags in product_tags for name in tags}
+        if not names:
+            return
+
+        tags = dict(Tag.objects.filter(name__in=names).values_list('name', 'id'))
+        missing = names - tags.keys()
+        if missing:
+            Tag.objects.bulk_create([Tag(name=name, slug=Tag().slugify(name)) for name in missing], ignore_conflicts=True)
+            tags.update(Tag.objects.filter(name__in=missing).values_list('name', 'id'))
+            # Names whose slug clashes with an existing tag go through taggit's own slug resolution.
+            for name in missing - tags.keys():
+                tags[name] = Tag.objects.get_or_create(name=name)[0].id
+
+        content_type = ContentType.objects.get_for_model(Product)
+        TaggedItem.objects.bulk_create(
+            [
+                TaggedItem(content_type=content_type, object_id=product.pk, tag_id=tags[name])
+                for product, names in zip(products, product_tags)
+                for name in set(names)
+            ],
+            ignore_conflicts=True,
+        )
@@ -0,0 +1,59 @@
+from django.db.models import ExpressionWrapper, F, IntegerField, Max, OuterRef, Q, Subquery, Value
+from django.db.models.functions import Coalesce, Least
+from django.utils import timezone
+
+from apps.shop.models import Discount, Product
+
+from .cache_services import CatalogCacheService
+
+PRICING_BATCH_SIZE = 1000
+
+
+class ProductPricingService:
+    @staticmethod
+    def build_effective_price(now):
+        best_discount = (
+            Discount.products.through.objects
+            .filter(
+                product=OuterRef('pk'),
+                discount__is_active=True,
+                discount__start_date__lte=now,
+                discount__end_date__gte=now,
+            )
+            .values('product')
+            .annotate(best=Max('discount__value'))
+            .values('best')
+        )
+        percentage = Least(Coalesce(Subquery(best_discount), Value(0)), Value(100))
+        return ExpressionWrapper(F('price') * (Value(100) - percentage) / Value(100), output_field=IntegerField())
+
+    @staticmethod
+    def refresh_effective_prices(product_ids=None):
+        now = timezone.now()
+        queryset = Product.objects.all() if product_ids is None else Product.objects.filter(pk__in=product_ids)
+        products = list(
+            queryset
+            .annotate(new_effective_price=ProductPricingService.build_effective_price(now))
+            .exclude(effective_price=F('new_effective_price'))
+            .only('id', 'vendor_id', 'effective_price', 'updated')
+        )
+        if not products:
+            return 0
+
+        for product in products:
+            product.effective_price = product.new_effective_price
+            product.updated = now
+        Product.objects.bulk_update(products, ['effective_price', 'updated'], batch_size=PRICING_BATCH_SIZE)
+        CatalogCacheService.bump_product_versions(
+            [product.vendor_id for product in products], [product.id for product in products]
+        )
+        return len(products)
+
+    @staticmethod
+    def refresh_crossed_discounts(since, now):
+        # A discount is valid for start_date <= now <= end_date, so it starts in (since, now] and ends in [since, now).
+        crossed = Discount.objects.filter(
+            Q(start_date__gt=since, start_date__lte=now) | Q(end_date__gte=since, end_date__lt=now)
+        )
+        product_ids = Discount.products.through.objects.filter(discount__in=crossed).values('product_id')
+        return ProductPricingService.refresh_effective_prices(product_ids)
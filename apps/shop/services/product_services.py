@@ -0,0 +1,47 @@
+from django.db import transaction
+from django.utils import timezone
+
+from rest_framework.exceptions import ValidationError
+
+from apps.shop.models import Product
+
+from .cache_services import CatalogCacheService
+from .pricing_services import ProductPricingService
+from .vendor_stats_services import VendorStatsService
+
+BULK_UPDATE_BATCH_SIZE = 1000
+
+
+class ProductBulkUpdateService:
+    @staticmethod
+    def update(vendor, items):
+        changes = {item['id']: item for item in items}
+        with transaction.atomic():
+            products = list(
+                Product.objects
+                .select_for_update()
+                .filter(id__in=changes, vendor=vendor)
+                .only('id', 'vendor_id', 'price', 'stock', 'updated')
+            )
+            if len(products) != len(changes):
+                missing = sorted(changes.keys() - {product.id for product in products})
+                raise ValidationError({'id': [f'Products not found: {missing}']})
+
+            now = timezone.now()
+            before = [VendorStatsService.snapshot(product) for product in products]
+            for product in products:
+                for field in ['price', 'stock']:
+                    if field in changes[product.id]:
+                        setattr(product, field, changes[product.id][field])
+                product.updated = now
+            Product.objects.bulk_update(products, ['price', 'stock', 'updated'], batch_size=BULK_UPDATE_BATCH_SIZE)
+            VendorStatsService.record_product_changes(
+                zip(before, [VendorStatsService.snapshot(product) for product in products])
+            )
+            ProductPricingService.refresh_effective_prices(
+                [product_id for product_id, item in changes.items() if 'price' in item]
+            )
+            transaction.on_commit(
+                lambda: CatalogCacheService.bump_product_versions([vendor.pk], list(changes))
+            )
+        return len(products)
@@ -0,0 +1,133 @@
+import math
+from collections import Counter
+
+from django.conf import settings
+from django.contrib.contenttypes.models import ContentType
+from django.db import connection, transaction
+from django.db.models import F, Q, Window
+from django.db.models.functions import RowNumber
+
+from taggit.models import TaggedItem
+
+from apps.shop.models import Category, Product, RelatedProduct
+from apps.shop.selectors.product_selectors import (
+    count_tag_frequencies,
+    filter_tagged_items_by_tree,
+    get_product_tag_ids,
+)
+
+REBUILD_TREE_SQL = '''
+WITH tagged AS (
+    SELECT item.object_id AS product_id, item.tag_id
+    FROM {tagged_item} AS item
+    JOIN {product} AS product ON product.id = item.object_id
+    JOIN {category} AS category ON category.id = product.category_id
+    WHERE item.content_type_id = %(content_type)s AND category.tree_id = %(tree_id)s
+),
+tree AS (
+    SELECT COUNT(DISTINCT product_id) AS size FROM tagged
+),
+weights AS (
+    SELECT tagged.tag_id, LN(1 + tree.size::float / COUNT(*)) AS weight
+    FROM tagged CROSS JOIN tree
+    GROUP BY tagged.tag_id, tree.size
+    HAVING COUNT(*) <= %(max_frequency)s
+),
+pairs AS (
+    SELECT source.product_id, target.product_id AS related_id, SUM(weights.weight) AS score
+    FROM tagged AS source
+    JOIN weights ON weights.tag_id = source.tag_id
+    JOIN tagged AS target ON target.tag_id = source.tag_id AND target.product_id <> source.product_id
+    GROUP BY source.product_id, target.product_id
+),
+ranked AS (
+    SELECT product_id, related_id, score,
+           ROW_NUMBER() OVER (PARTITION BY product_id ORDER BY score DESC, related_id) AS rank
+    FROM pairs
+)
+INSERT INTO {related_product} (product_id, related_id, score)
+SELECT product_id, related_id, score FROM ranked WHERE rank <= %(limit)s
+'''
+
+
+class RelatedProductService:
+    """
+    Maintains the RelatedProduct table: products in the same category tree ranked
+    by the summed weight of shared tags, where rarer tags weigh more.
+    """
+    @staticmethod
+    def get_tag_weight(tree_size, frequency):
+        return math.log(1 + tree_size / frequency)
+
+    @staticmethod
+    def refresh(product_id):
+        tree_id = Product.objects.filter(pk=product_id).values_list('category__tree_id', flat=True).first()
+        limit = settings.RELATED_PRODUCTS['LIMIT']
+        with transaction.atomic():
+            RelatedProduct.objects.filter(Q(product_id=product_id) | Q(related_id=product_id)).delete()
+            if tree_id is None:
+                return
+
+            scores = RelatedProductService.score_candidates(product_id, tree_id)
+            ranked = sorted(scores.items(), key=lambda item: (-item[1], item[0]))
+            RelatedProduct.objects.bulk_create(
+                [RelatedProduct(product_id=product_id, related_id=related_id, score=score) for related_id, score in ranked[:limit]]
+                + [RelatedProduct(product_id=related_id, related_id=product_id, score=score) for related_id, score in ranked]
+            )
+            # The reverse rows may push other products past the limit.
+            RelatedProductService.trim(scores.keys(), limit)
+
+    @staticmethod
+    def score_candidates(product_id, tree_id):
+        tree_items = filter_tagged_items_by_tree(tree_id)
+        tree_size = tree_items.values('object_id').distinct().count()
+        frequencies = count_tag_frequencies(tree_items, get_product_tag_ids(product_id))
+        weights = {
+            tag_id: RelatedProductService.get_tag_weight(tree_size, frequency)
+            for tag_id, frequency in frequencies.items()
+            if frequency <= settings.RELATED_PRODUCTS['MAX_TAG_FREQUENCY']
+        }
+
+        scores = Counter()
+        for related_id, tag_id in tree_items.filter(tag_id__in=weights).exclude(object_id=product_id).values_list('object_id', 'tag_id'):
+            scores[related_id] += weights[tag_id]
+        return scores
+
+    @staticmethod
+    def trim(product_ids, limit):
+        ranked = RelatedProduct.objects.filter(product_id__in=product_ids).annotate(
+            rank=Window(RowNumber(), partition_by=F('product_id'), order_by=[F('score').desc(), F('related_id').asc()])
+        )
+        stale = list(ranked.filter(rank__gt=limit).values_list('id', flat=True))
+        RelatedProduct.objects.filter(id__in=stale).delete()
+
+    @staticmethod
+    def rebuild(tree_ids=None):
+        """
+        Recomputes the whole table, or the given category trees, as one set-based
+        statement per tree so readers keep the old rows until it commits.
+        """
+        sql = REBUILD_TREE_SQL.format(
+            tagged_item=TaggedItem._meta.db_table,
+            product=Product._meta.db_table,
+            category=Category._meta.db_table,
+            related_product=RelatedProduct._meta.db_table,
+        )
+        params = {
+            'content_type': ContentType.objects.get_for_model(Product).id,
+            'max_frequency': settings.RELATED_PRODUCTS['MAX_TAG_FREQUENCY'],
+            'limit': settings.RELATED_PRODUCTS['LIMIT'],
+        }
+        with transaction.atomic():
+            if tree_ids is None:
+                RelatedProduct.objects.all().delete()
+                tree_ids = Category.objects.filter(parent__isnull=True).values_list('tree_id', flat=True)
+            else:
+                RelatedProduct.objects.filter(product__category__tree_id__in=tree_ids).delete()
+
+            created = 0
+            with connection.cursor() as cursor:
+                for tree_id in tree_ids:
+                    cursor.execute(sql, {**params, 'tree_id': tree_id})
+                    created += cursor.rowcount
+        return created
@@ -0,0 +1,172 @@
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from django_redis import get_redis_connection
+
+from apps.shop.models import Product
+
+from .cache_services import CatalogCacheService
+from .vendor_stats_services import VendorStatsService
+
+# Every product keeps a hash of holder -> reserved quantity, a sorted set of holder
+# expiry times and a running total. Each script first drops the expired holds of the
+# products it touches, so a reservation is released as soon as anyone looks at it.
+RELEASE_EXPIRED = '''
+local now = tonumber(redis.call('TIME')[1])
+local function release_expired(quantities, expires, total)
+    local expired = redis.call('ZRANGEBYSCORE', expires, '-inf', now)
+    for _, holder in ipairs(expired) do
+        redis.call('DECRBY', total, redis.call('HGET', quantities, holder) or 0)
+        redis.call('HDEL', quantities, holder)
+    end
+    if #expired > 0 then
+        redis.call('ZREMRANGEBYSCORE', expires, '-inf', now)
+    end
+end
+'''
+
+# ARGV: holder, ttl, strict, relative, then (quantity, stock) per product. A relative
+# quantity is added to the current hold. Growing holds are capped by what is left;
+# strict reserves nothing unless every product fits. Returns the shortfall per product.
+RESERVE_SCRIPT = RELEASE_EXPIRED + '''
+local holder, ttl, strict, relative = ARGV[1], tonumber(ARGV[2]), ARGV[3] == '1', ARGV[4] == '1'
+local holds = {}
+local shortfalls = {}
+local short = false
+for i = 1, #KEYS, 3 do
+    release_expired(KEYS[i], KEYS[i + 1], KEYS[i + 2])
+    local n = (i + 2) / 3
+    local quantity, stock = tonumber(ARGV[3 + n * 2]), tonumber(ARGV[4 + n * 2])
+    local held = tonumber(redis.call('HGET', KEYS[i], holder) or '0')
+    local wanted = math.max(relative and held + quantity or quantity, 0)
+    local granted = wanted
+    if wanted > held then
+        local available = stock - tonumber(redis.call('GET', KEYS[i + 2]) or '0') + held
+        granted = math.max(held, math.min(wanted, available))
+    end
+    holds[n] = {held, granted}
+    shortfalls[n] = wanted - granted
+    short = short or granted < wanted
+end
+if not (strict and short) then
+    for i = 1, #KEYS, 3 do
+        local held, granted = unpack(holds[(i + 2) / 3])
+        redis.call('INCRBY', KEYS[i + 2], granted - held)
+        if granted > 0 then
+            redis.call('HSET', KEYS[i], holder, granted)
+            redis.call('ZADD', KEYS[i + 1], now + ttl, holder)
+        else
+            redis.call('HDEL', KEYS[i], holder)
+            redis.call('ZREM', KEYS[i + 1], holder)
+        end
+    end
+end
+return shortfalls
+'''
+
+# ARGV: source holder, target holder, ttl.
+TRANSFER_SCRIPT = RELEASE_EXPIRED + '''
+local source, target, ttl = ARGV[1], ARGV[2], tonumber(ARGV[3])
+local moved = {}
+for i = 1, #KEYS, 3 do
+    release_expired(KEYS[i], KEYS[i + 1], KEYS[i + 2])
+    local quantity = tonumber(redis.call('HGET', KEYS[i], source) or '0')
+    if quantity > 0 then
+        redis.call('HDEL', KEYS[i], source)
+        redis.call('ZREM', KEYS[i + 1], source)
+        redis.call('HINCRBY', KEYS[i], target, quantity)
+        redis.call('ZADD', KEYS[i + 1], now + ttl, target)
+    end
+    moved[(i + 2) / 3] = quantity
+end
+return moved
+'''
+
+# ARGV: holder.
+RELEASE_SCRIPT = RELEASE_EXPIRED + '''
+for i = 1, #KEYS, 3 do
+    release_expired(KEYS[i], KEYS[i + 1], KEYS[i + 2])
+    redis.call('DECRBY', KEYS[i + 2], redis.call('HGET', KEYS[i], ARGV[1]) or 0)
+    redis.call('HDEL', KEYS[i], ARGV[1])
+    redis.call('ZREM', KEYS[i + 1], ARGV[1])
+end
+'''
+
+
+class StockReservationService:
+    """
+    Holds stock for carts and unpaid orders in Redis, so checking and reserving a hot
+    product never locks its row. Holds expire on their own; paying an order turns its
+    holds into a real stock decrement.
+    """
+    @staticmethod
+    def get_cart_holder(cart_id):
+        return f'cart:{cart_id}'
+
+    @staticmethod
+    def get_order_holder(order_id):
+        return f'order:{order_id}'
+
+    @staticmethod
+    def get_keys(product_ids):
+        keys = []
+        for product_id in product_ids:
+            prefix = f'stock_reservations:{product_id}'
+            keys += [prefix, f'{prefix}:expires', f'{prefix}:total']
+        return keys
+
+    @staticmethod
+    def run(script, product_ids, args):
+        if not product_ids:
+            return []
+        connection = get_redis_connection('default')
+        return connection.register_script(script)(keys=StockReservationService.get_keys(product_ids), args=args)
+
+    @staticmethod
+    def reserve(holder, quantities, ttl, strict=False, relative=False):
+        # `quantities` maps product ids to (quantity, stock); returns how many units each product fell short by.
+        product_ids = list(quantities)
+        args = [holder, ttl, int(strict), int(relative)]
+        for quantity, stock in quantities.values():
+            args += [quantity, stock]
+        return dict(zip(product_ids, StockReservationService.run(RESERVE_SCRIPT, product_ids, args)))
+
+    @staticmethod
+    def transfer(source, target, product_ids, ttl):
+        product_ids = list(product_ids)
+        return dict(zip(product_ids, StockReservationService.run(TRANSFER_SCRIPT, product_ids, [source, target, ttl])))
+
+    @staticmethod
+    def release(holder, product_ids):
+        StockReservationService.run(RELEASE_SCRIPT, list(product_ids), [holder])
+
+    @staticmethod
+    def commit(holder, quantities):
+        # Called inside the payment transaction; the holds go once the decrement is committed.
+        products = list(
+            Product.objects
+            .select_for_update()
+            .filter(id__in=quantities)
+            .order_by('id')
+            .only('id', 'vendor_id', 'price', 'stock', 'updated')
+        )
+        now = timezone.now()
+        before = [VendorStatsService.snapshot(product) for product in products]
+        for product in products:
+            product.stock = max(product.stock - quantities[product.id], 0)
+            product.updated = now
+        Product.objects.bulk_update(products, ['stock', 'updated'])
+        VendorStatsService.record_product_changes(
+            zip(before, [VendorStatsService.snapshot(product) for product in products])
+        )
+
+        vendor_ids = list({product.vendor_id for product in products})
+        product_ids = [product.id for product in products]
+
+        def release():
+            StockReservationService.release(holder, quantities)
+            CatalogCacheService.bump_product_versions(vendor_ids, product_ids)
+
+        transaction.on_commit(release)
+
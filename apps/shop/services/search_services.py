@@ -0,0 +1,45 @@
+from django.contrib.contenttypes.models import ContentType
+from django.contrib.postgres.aggregates import StringAgg
+from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVector
+from django.db.models import F, FloatField, OuterRef, Subquery
+from django.db.models.functions import Cast
+
+from taggit.models import TaggedItem
+
+from apps.shop.models import Product
+
+SEARCH_CONFIG = 'simple'
+
+
+class ProductSearchService:
+    @staticmethod
+    def build_search_vector():
+        tag_names = (
+            TaggedItem.objects
+            .filter(content_type=ContentType.objects.get_for_model(Product), object_id=OuterRef('pk'))
+            .values('object_id')
+            .annotate(names=StringAgg('tag__name', ' '))
+            .values('names')
+        )
+        return (
+            SearchVector('name', weight='A', config=SEARCH_CONFIG)
+            + SearchVector(Subquery(tag_names), weight='B', config=SEARCH_CONFIG)
+            + SearchVector('description', weight='C', config=SEARCH_CONFIG)
+        )
+
+    @staticmethod
+    def update_search_vector(product_ids):
+        Product.objects.filter(pk__in=product_ids).update(
+            search_vector=ProductSearchService.build_search_vector()
+        )
+
+    @staticmethod
+    def search(queryset, value):
+        query = SearchQuery(value, search_type='websearch', config=SEARCH_CONFIG)
+        return (
+            queryset
+            .filter(search_vector=query)
+            # ts_rank is a float4; as a float8 the cursor value compares equal to itself.
+            .annotate(search_rank=Cast(SearchRank(F('search_vector'), query), FloatField()))
+            .order_by('-search_rank', '-id')
+        )
@@ -0,0 +1,114 @@
+import random
+import uuid
+
+from django.db import connection
+
+from apps.accounts.models import ShopUser, VendorProfile
+from apps.shop.models import Category, Product
+
+from .import_services import ProductImportService
+from .search_services import ProductSearchService
+
+SEED_BATCH_SIZE = 5000
+SEED_WORDS = [
+    'red', 'blue', 'green', 'black', 'classic', 'premium', 'compact', 'wireless', 'leather', 'cotton',
+    'shoe', 'lamp', 'chair', 'table', 'phone', 'watch', 'kettle', 'jacket', 'backpack', 'speaker',
+]
+
+
+class CatalogSeedService:
+    """
+    Seeds a synthetic catalog for benchmarks. Every row is tagged with a random
+    token so repeated runs never collide with real data or each other.
+    """
+    def __init__(self, products=100_000, vendors=50, root_categories=10, children_per_root=10, tags_per_product=0, seed=0):
+        self.products = products
+        self.vendors = vendors
+        self.root_categories = root_categories
+        self.children_per_root = children_per_root
+        self.tags_per_product = tags_per_product
+        self.random = random.Random(seed)
+        self.token = uuid.uuid4().hex[:8]
+
+    def seed(self):
+        vendor_ids = self.seed_vendors()
+        root_ids, leaf_ids = self.seed_categories()
+        self.seed_products(vendor_ids, leaf_ids)
+        with connection.cursor() as cursor:
+            cursor.execute(f'ANALYZE {Product._meta.db_table}')
+        return {
+            'token': self.token,
+            'vendor_ids': vendor_ids,
+            'root_category_ids': root_ids,
+            'leaf_category_ids': leaf_ids,
+        }
+
+    def seed_vendors(self):
+        users = ShopUser.objects.bulk_create([
+            ShopUser(
+                first_name='Bench',
+                last_name=f'Vendor {index}',
+                username=f'bench_{self.token}_{index}',
+                phone=f'{self.token[:3]}{index:08d}'[:11],
+                email=f'bench_{self.token}_{index}@example.com',
+                role=ShopUser.Roles.VENDOR,
+                password='!',
+            )
+            for index in range(self.vendors)
+        ])
+        profiles = VendorProfile.objects.bulk_create([
+            VendorProfile(
+                user=user,
+                status=VendorProfile.Status.APPROVED,
+                store_name=f'bench-{self.token}-{index}',
+                is_active=True,
+            )
+            for index, user in enumerate(users)
+        ])
+        return [profile.id for profile in profiles]
+
+    def seed_categories(self):
+        root_ids = []
+        leaf_ids = []
+        for root_index in range(self.root_categories):
+            root = Category.objects.create(name=f'Bench {self.token} {root_index}')
+            root_ids.append(root.id)
+            for child_index in range(self.children_per_root):
+                child = Category.objects.create(name=f'Bench {self.token} {root_index}-{child_index}', parent=root)
+                leaf_ids.append(child.id)
+        return root_ids, leaf_ids
+
+    def seed_products(self, vendor_ids, leaf_ids):
+        for start in range(0, self.products, SEED_BATCH_SIZE):
+            batch = []
+            for index in range(start, min(start + SEED_BATCH_SIZE, self.products)):
+                price = self.random.randint(1, 100_000)
+                product = Product(
+                    name=' '.join(self.random.sample(SEED_WORDS, 3)).title(),
+                    slug=f'bench-{self.token}-{index}',
+                    vendor_id=self.random.choice(vendor_ids),
+                    category_id=self.random.choice(leaf_ids),
+                    price=price,
+                    effective_price=price,
+                    # Roughly one product in five is sold out.
+                    stock=0 if self.random.random() < 0.2 else self.random.randint(1, 500),
+                    weight=self.random.randint(0, 5000),
+                    description=' '.join(self.random.choices(SEED_WORDS, k=12)),
+                )
+                product._slug_reserved = True
+                batch.append(product)
+            Product.objects.bulk_create(batch)
+            if self.tags_per_product:
+                ProductImportService.attach_tags(
+                    batch, [self.random.sample(SEED_WORDS, self.tags_per_product) for _ in batch]
+                )
+
+        seeded = Product.objects.filter(slug__startswith=f'bench-{self.token}-')
+        # auto_now_add stamps every row with the same time; spread them over a year like a real catalog.
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"UPDATE {Product._meta.db_table} SET created = now() - random() * interval '365 days' "
+                f"WHERE slug LIKE %s",
+                [f'bench-{self.token}-%'],
+            )
+        ProductSearchService.update_search_vector(seeded.values('pk'))
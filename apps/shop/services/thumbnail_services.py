@@ -0,0 +1,127 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import close_old_connections, transaction
+from django.utils import timezone
+
+from PIL import Image, ImageOps
+
+from apps.shop.models import Product
+
+from .cache_services import CatalogCacheService
+
+THUMBNAIL_FORMATS = {
+    'webp': 'WEBP',
+    'jpeg': 'JPEG',
+}
+
+_executor = None
+
+
+def _get_executor():
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=settings.PRODUCT_THUMBNAILS['WORKERS'], thread_name_prefix='product-thumbnails'
+        )
+    return _executor
+
+
+class ProductThumbnailService:
+    @staticmethod
+    def get_variant_names(picture_name):
+        # Variants live next to the original: product_pictures/shoe.png -> product_pictures/shoe_small.webp
+        root, _ = os.path.splitext(picture_name)
+        return {
+            size: {extension: f'{root}_{size}.{extension}' for extension in THUMBNAIL_FORMATS}
+            for size in settings.PRODUCT_THUMBNAILS['SIZES']
+        }
+
+    @staticmethod
+    def is_stale(product):
+        if not product.product_picture:
+            return bool(product.thumbnails)
+        return product.thumbnails != ProductThumbnailService.get_variant_names(product.product_picture.name)
+
+    @staticmethod
+    def schedule(product_id):
+        if settings.PRODUCT_THUMBNAILS['ASYNC']:
+            transaction.on_commit(lambda: _get_executor().submit(ProductThumbnailService.run, product_id))
+        else:
+            transaction.on_commit(lambda: ProductThumbnailService.generate(product_id))
+
+    @staticmethod
+    def run(product_id):
+        # Worker threads get their own database connection, which must not outlive the job.
+        close_old_connections()
+        try:
+            ProductThumbnailService.generate(product_id)
+        finally:
+            close_old_connections()
+
+    @staticmethod
+    def generate(product_id, force=False):
+        product = Product.objects.filter(pk=product_id).only('product_picture', 'thumbnails', 'vendor_id').first()
+        if product is None or not (force or ProductThumbnailService.is_stale(product)):
+            return
+
+        picture_name = product.product_picture.name if product.product_picture else ''
+        thumbnails = {}
+        if picture_name:
+            variant_names = ProductThumbnailService.get_variant_names(picture_name)
+            with product.product_picture.open('rb') as picture:
+                image = ImageOps.exif_transpose(Image.open(picture))
+                image.load()
+            for size, (width, height) in settings.PRODUCT_THUMBNAILS['SIZES'].items():
+                variant = image.copy()
+                variant.thumbnail((width, height), Image.LANCZOS)
+                thumbnails[size] = {
+                    extension: ProductThumbnailService.save_variant(variant, variant_names[size][extension], extension)
+                    for extension in THUMBNAIL_FORMATS
+                }
+
+        # Skip the write if the picture changed while we were resizing; that change schedules its own job.
+        updated = Product.objects.filter(pk=product_id, product_picture=picture_name).update(
+            thumbnails=thumbnails, updated=timezone.now()
+        )
+        if updated:
+            ProductThumbnailService.delete_variants(product.thumbnails, exclude=thumbnails)
+            CatalogCacheService.bump_product_versions([product.vendor_id], [product_id])
+        else:
+            ProductThumbnailService.delete_variants(thumbnails)
+
+    @staticmethod
+    def save_variant(image, name, extension):
+        image_format = THUMBNAIL_FORMATS[extension]
+        if image_format == 'JPEG' and image.mode != 'RGB':
+            image = image.convert('RGB')
+        elif image.mode not in ('RGB', 'RGBA'):
+            image = image.convert('RGBA')
+
+        buffer = BytesIO()
+        image.save(buffer, format=image_format, quality=settings.PRODUCT_THUMBNAILS['QUALITY'], optimize=True)
+        if default_storage.exists(name):
+            default_storage.delete(name)
+        return default_storage.save(name, ContentFile(buffer.getvalue()))
+
+    @staticmethod
+    def delete_variants(thumbnails, exclude=None):
+        keep = {name for variants in (exclude or {}).values() for name in variants.values()}
+        for variants in thumbnails.values():
+            for name in variants.values():
+                if name not in keep:
+                    default_storage.delete(name)
+
+    @staticmethod
+    def get_urls(thumbnails, request=None):
+        urls = {}
+        for size, variants in thumbnails.items():
+            urls[size] = {}
+            for extension, name in variants.items():
+                url = default_storage.url(name)
+                urls[size][extension] = request.build_absolute_uri(url) if request else url
+        return urls
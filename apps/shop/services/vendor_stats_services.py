@@ -0,0 +1,87 @@
+from collections import Counter, defaultdict
+
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from apps.shop.models import VendorStats
+from apps.shop.selectors.vendor_stats_selectors import (
+    aggregate_product_stats_by_vendor,
+    aggregate_sales_by_vendor,
+    filter_vendor_ids,
+)
+
+STATS_FIELDS = ['product_count', 'in_stock_count', 'inventory_value', 'units_sold', 'revenue']
+RECONCILE_BATCH_SIZE = 1000
+
+
+class VendorStatsService:
+    """
+    Keeps VendorStats in step with products and paid orders by applying deltas, so
+    reading a storefront never aggregates the catalog. reconcile() rebuilds rows
+    from the source tables and corrects any drift.
+    """
+    @staticmethod
+    def snapshot(product):
+        return product.vendor_id, product.price, product.stock
+
+    @staticmethod
+    def record_product_changes(changes):
+        # `changes` holds (before, after) snapshots; None marks a created or deleted product.
+        deltas = defaultdict(Counter)
+        for before, after in changes:
+            for snapshot, sign in [(before, -1), (after, 1)]:
+                if snapshot is None:
+                    continue
+                vendor_id, price, stock = snapshot
+                deltas[vendor_id]['product_count'] += sign
+                deltas[vendor_id]['in_stock_count'] += sign * (stock > 0)
+                deltas[vendor_id]['inventory_value'] += sign * price * stock
+        VendorStatsService.apply(deltas)
+
+    @staticmethod
+    def record_order_paid(order_id):
+        deltas = {
+            row['vendor_id']: {'units_sold': row['units_sold'], 'revenue': row['revenue']}
+            for row in aggregate_sales_by_vendor(order_id=order_id)
+        }
+        VendorStatsService.apply(deltas)
+
+    @staticmethod
+    def apply(deltas):
+        now = timezone.now()
+        for vendor_id, delta in deltas.items():
+            changes = {field: F(field) + value for field, value in delta.items() if value}
+            # A vendor without a row yet is picked up by the next reconcile.
+            if changes:
+                VendorStats.objects.filter(vendor_id=vendor_id).update(**changes, updated=now)
+
+    @staticmethod
+    def reconcile(vendor_ids=None):
+        vendor_ids = filter_vendor_ids(vendor_ids)
+        corrected = 0
+        for start in range(0, len(vendor_ids), RECONCILE_BATCH_SIZE):
+            corrected += VendorStatsService.reconcile_batch(vendor_ids[start:start + RECONCILE_BATCH_SIZE])
+        return corrected
+
+    @staticmethod
+    def reconcile_batch(vendor_ids):
+        with transaction.atomic():
+            # Locking first makes concurrent deltas wait, then land on top of the rebuilt values.
+            current = {
+                row['vendor_id']: row
+                for row in VendorStats.objects.select_for_update().filter(vendor_id__in=vendor_ids).values('vendor_id', *STATS_FIELDS)
+            }
+            rows = {vendor_id: {'vendor_id': vendor_id, **dict.fromkeys(STATS_FIELDS, 0)} for vendor_id in vendor_ids}
+            for aggregate in [aggregate_product_stats_by_vendor(vendor_ids), aggregate_sales_by_vendor(vendor_ids)]:
+                for row in aggregate:
+                    rows[row['vendor_id']].update(row)
+
+            stale = [row for vendor_id, row in rows.items() if current.get(vendor_id) != row]
+            VendorStats.objects.bulk_create(
+                [VendorStats(**row, updated=timezone.now()) for row in stale],
+                update_conflicts=True,
+                unique_fields=['vendor'],
+                update_fields=[*STATS_FIELDS, 'updated'],
+            )
+        return len(stale)
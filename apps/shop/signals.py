@@ -0,0 +1,101 @@
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete, pre_delete, pre_save, m2m_changed
+from django.dispatch import receiver
+
+from mptt.signals import node_moved
+from taggit.models import Tag
+
+from apps.accounts.models import VendorProfile
+
+from .models import Category, Discount, Product, VendorStats
+from .selectors.product_selectors import get_saved_product
+from .services.cache_services import CatalogCacheService
+from .services.category_services import CategoryTreeService
+from .services.discount_services import DiscountRegistry
+from .services.pricing_services import ProductPricingService
+from .services.related_product_services import RelatedProductService
+from .services.search_services import ProductSearchService
+from .services.thumbnail_services import ProductThumbnailService
+from .services.vendor_stats_services import VendorStatsService
+
+@receiver(pre_save, sender=Product)
+def product_saving(sender, instance, **kwargs):
+    instance._saved = get_saved_product(instance.pk) if instance.pk else None
+
+@receiver(post_save, sender=Product)
+def product_saved(sender, instance, created, **kwargs):
+    ProductSearchService.update_search_vector([instance.pk])
+    saved = getattr(instance, '_saved', None)
+    if not created:
+        ProductPricingService.refresh_effective_prices([instance.pk])
+    if saved is not None and saved.category_id != instance.category_id:
+        RelatedProductService.refresh(instance.pk)
+    before = VendorStatsService.snapshot(saved) if saved is not None else None
+    VendorStatsService.record_product_changes([(before, VendorStatsService.snapshot(instance))])
+    CatalogCacheService.bump_product_versions([instance.vendor_id], [instance.pk])
+    if ProductThumbnailService.is_stale(instance):
+        ProductThumbnailService.schedule(instance.pk)
+
+@receiver(post_delete, sender=Product)
+def product_deleted(sender, instance, **kwargs):
+    VendorStatsService.record_product_changes([(VendorStatsService.snapshot(instance), None)])
+    CatalogCacheService.bump_product_versions([instance.vendor_id], [instance.pk])
+
+@receiver(m2m_changed, sender=Product.tags.through)
+def product_tags_changed(sender, instance, action, **kwargs):
+    if action in ['post_add', 'post_remove', 'post_clear'] and isinstance(instance, Product):
+        ProductSearchService.update_search_vector([instance.pk])
+        RelatedProductService.refresh(instance.pk)
+        CatalogCacheService.bump_product_versions([instance.vendor_id], [instance.pk])
+
+@receiver(post_save, sender=Tag)
+def tag_saved(sender, instance, created, **kwargs):
+    if not created:
+        product_ids = Product.objects.filter(tags=instance).values_list('id', flat=True)
+        ProductSearchService.update_search_vector(product_ids)
+        CatalogCacheService.bump_tag_version()
+
+@receiver(post_delete, sender=Tag)
+def tag_deleted(sender, instance, **kwargs):
+    CatalogCacheService.bump_tag_version()
+
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+@receiver(node_moved, sender=Category)
+def category_tree_changed(sender, **kwargs):
+    CategoryTreeService.bump_tree_version()
+
+@receiver(post_save, sender=VendorProfile)
+def vendor_profile_created(sender, instance, created, **kwargs):
+    if created:
+        VendorStats.objects.get_or_create(vendor=instance)
+
+@receiver(post_save, sender=Discount)
+@receiver(post_delete, sender=Discount)
+def discount_changed(sender, **kwargs):
+    # Invalidate again after commit so a rebuild racing the transaction cannot pin the old rows.
+    DiscountRegistry.invalidate()
+    transaction.on_commit(DiscountRegistry.invalidate)
+
+@receiver(post_save, sender=Discount)
+def discount_saved(sender, instance, **kwargs):
+    ProductPricingService.refresh_effective_prices(instance.products.values('pk'))
+
+@receiver(pre_delete, sender=Discount)
+def discount_deleting(sender, instance, **kwargs):
+    instance._product_ids = list(instance.products.values_list('pk', flat=True))
+
+@receiver(post_delete, sender=Discount)
+def discount_deleted(sender, instance, **kwargs):
+    ProductPricingService.refresh_effective_prices(getattr(instance, '_product_ids', []))
+
+@receiver(m2m_changed, sender=Discount.products.through)
+def discount_products_changed(sender, instance, action, pk_set, **kwargs):
+    if action == 'pre_clear' and isinstance(instance, Discount):
+        instance._cleared_product_ids = list(instance.products.values_list('pk', flat=True))
+    elif action in ['post_add', 'post_remove', 'post_clear']:
+        if isinstance(instance, Product):
+            ProductPricingService.refresh_effective_prices([instance.pk])
+        else:
+            product_ids = instance._cleared_product_ids if action == 'post_clear' else pk_set
+            ProductPricingService.refresh_effective_prices(product_ids)
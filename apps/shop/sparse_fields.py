@@ -0,0 +1,27 @@
+from rest_framework.exceptions import ValidationError
+
+FIELDS_QUERY_PARAM = 'fields'
+
+
+def get_requested_fields(request, serializer_class):
+    value = request.query_params.get(FIELDS_QUERY_PARAM)
+    if not value:
+        return None
+
+    fields = {name.strip() for name in value.split(',') if name.strip()}
+    unknown = fields - set(serializer_class.Meta.fields)
+    if unknown:
+        raise ValidationError({FIELDS_QUERY_PARAM: [f"Unknown fields: {', '.join(sorted(unknown))}"]})
+    return fields
+
+
+class SparseFieldsMixin:
+    """
+    Serializer mixin that drops every field not listed in `context['fields']`.
+    """
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        requested = self.context.get('fields')
+        if requested:
+            for name in set(self.fields) - set(requested):
+                self.fields.pop(name)
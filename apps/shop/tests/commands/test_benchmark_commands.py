@@ -0,0 +1,25 @@
+import json
+
+from django.core.management import call_command
+
+import pytest
+
+from apps.shop.models import Product
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('command, options, field, expected', [
+    ('benchmark_product_filters', {'products': 50, 'vendors': 2}, 'name', {'category + price range', 'in stock'}),
+    ('benchmark_product_serializers', {'sizes': [10, 20], 'tags': 2}, 'rows', {10, 20}),
+    (
+        'benchmark_json_renderers',
+        {'products': 20, 'cart_items': 5, 'orders': 3, 'order_items': 2},
+        'name',
+        {'product list', 'cart', 'order list'},
+    ),
+])
+def test_benchmark_command_rolls_back_seeded_catalog(tmp_path, command, options, field, expected):
+    output = tmp_path / 'benchmark.json'
+    call_command(command, runs=1, output=str(output), **options)
+    results = json.loads(output.read_text())
+    assert {result[field] for result in results} >= expected
+    assert not Product.objects.exists()
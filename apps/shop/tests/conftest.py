@@ -1,3 +1,5 @@
+from django.core.cache import cache
+
 from rest_framework.test import APIRequestFactory, APIClient
 
 import pytest
@@ -12,6 +14,11 @@ from apps.shop.tests.factories import (
 )
 
 
+@pytest.fixture(autouse=True)
+def clear_cache():
+    # Database rollbacks between tests do not fire the signals that bump cache versions.
+    cache.clear()
+
 @pytest.fixture
 def api_client():
     return APIClient()
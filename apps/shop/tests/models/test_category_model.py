@@ -1,5 +1,7 @@
 import pytest
 
+from apps.shop.models import Category
+
 from apps.shop.tests.factories import (
     ParentCategoryFactory,
     CategoryFactory,
@@ -12,4 +14,59 @@ def test_create_category():
     assert category.parent == root_category
     assert root_category.children.count() == 1
     assert root_category.name
-    assert category.name
\ No newline at end of file
+    assert category.name
+
+@pytest.mark.django_db()
+def test_category_full_path():
+    root_category = ParentCategoryFactory(name='Home')
+    category = CategoryFactory(parent=root_category, name='Kitchen')
+    assert root_category.full_path == 'Home'
+    assert category.full_path == 'Home → Kitchen'
+    assert str(category) == 'Home → Kitchen'
+
+@pytest.mark.django_db()
+def test_category_str_does_not_query(django_assert_num_queries):
+    category = CategoryFactory(name='Kitchen')
+    with django_assert_num_queries(0):
+        str(category)
+
+@pytest.mark.django_db()
+def test_category_rename_rewrites_subtree():
+    root_category = ParentCategoryFactory(name='Home')
+    category = CategoryFactory(parent=root_category, name='Kitchen')
+    leaf = CategoryFactory(parent=category, name='Cookware')
+    root_category.name = 'House'
+    root_category.save()
+    category.refresh_from_db()
+    leaf.refresh_from_db()
+    assert category.full_path == 'House → Kitchen'
+    assert leaf.full_path == 'House → Kitchen → Cookware'
+
+@pytest.mark.django_db()
+def test_category_move_rewrites_subtree():
+    home = ParentCategoryFactory(name='Home')
+    garden = ParentCategoryFactory(name='Garden')
+    category = CategoryFactory(parent=home, name='Tools')
+    leaf = CategoryFactory(parent=category, name='Shovels')
+    category.refresh_from_db()
+    garden.refresh_from_db()
+    category.move_to(garden)
+    leaf.refresh_from_db()
+    assert leaf.full_path == 'Garden → Tools → Shovels'
+
+@pytest.mark.django_db()
+def test_category_save_without_path_change_skips_lookups(django_assert_max_num_queries):
+    category = CategoryFactory(parent=ParentCategoryFactory(name='Home'), name='Kitchen')
+    category = Category.objects.get(pk=category.pk)
+    with django_assert_max_num_queries(2):
+        category.save()
+    assert category.full_path == 'Home → Kitchen'
+
+@pytest.mark.django_db()
+def test_category_rename_with_update_fields_saves_full_path():
+    root_category = ParentCategoryFactory(name='Home')
+    category = CategoryFactory(parent=root_category, name='Kitchen')
+    category.name = 'Pantry'
+    category.save(update_fields=['name'])
+    category.refresh_from_db()
+    assert category.full_path == 'Home → Pantry'
@@ -1,5 +1,10 @@
+from django.utils import timezone
+
+from datetime import timedelta
+
 import pytest
 
+from apps.shop.services.discount_services import DiscountRegistry
 from apps.shop.tests.factories import DiscountFactory
 
 
@@ -9,3 +14,35 @@ def test_create_discount():
     assert discount.is_active == True
     assert discount.start_date < discount.end_date
 
+
+@pytest.mark.django_db
+def test_discount_registry_serves_codes_without_queries(django_assert_num_queries):
+    discount = DiscountFactory(value=20)
+    DiscountRegistry.get(discount.code)
+    with django_assert_num_queries(0):
+        assert DiscountRegistry.get_valid(discount.code)['value'] == 20
+        assert DiscountRegistry.get_valid('missing') is None
+
+@pytest.mark.django_db
+def test_discount_registry_invalidated_on_save_and_delete():
+    discount = DiscountFactory(value=20)
+    assert DiscountRegistry.get_valid(discount.code)['value'] == 20
+
+    discount.value = 35
+    discount.save()
+    assert DiscountRegistry.get_valid(discount.code)['value'] == 35
+
+    discount.is_active = False
+    discount.save()
+    assert DiscountRegistry.get(discount.code) is None
+
+    discount.is_active = True
+    discount.save()
+    discount.delete()
+    assert DiscountRegistry.get(discount.code) is None
+
+@pytest.mark.django_db
+def test_discount_registry_respects_validity_window():
+    upcoming = DiscountFactory(start_date=timezone.now() + timedelta(days=1), end_date=timezone.now() + timedelta(days=2))
+    assert DiscountRegistry.get(upcoming.code) is not None
+    assert DiscountRegistry.get_valid(upcoming.code) is None
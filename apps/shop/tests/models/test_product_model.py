@@ -44,4 +44,4 @@ def test_create_product_with_invalid_weight():
     vendor = VendorProfileFactory()
     with pytest.raises(IntegrityError) as excinfo:
         ProductFactory(weight=-1, category=category, vendor=vendor)
-    assert 'shop_product_weight_check' in str(excinfo.value).lower()
\ No newline at end of file
+    assert 'shop_product_weight_check' in str(excinfo.value).lower()
@@ -0,0 +1,91 @@
+from django.core.management import call_command
+from django.urls import reverse
+from django.utils import timezone
+
+from datetime import timedelta
+
+import pytest
+
+from apps.shop.models import Product
+from apps.shop.services.pricing_services import ProductPricingService
+from apps.shop.tests.conftest import api_client
+from apps.shop.tests.factories import DiscountFactory, ProductFactory
+
+@pytest.mark.django_db
+def test_new_product_sells_at_list_price():
+    product = ProductFactory(price=1000)
+    assert product.effective_price == 1000
+
+@pytest.mark.django_db
+def test_best_valid_discount_sets_effective_price():
+    product = ProductFactory(price=1000)
+    DiscountFactory(value=10, products=[product])
+    DiscountFactory(value=25, products=[product])
+    DiscountFactory(value=90, products=[product], is_active=False)
+    product.refresh_from_db()
+    assert product.effective_price == 750
+
+@pytest.mark.django_db
+def test_effective_price_follows_discount_changes():
+    product = ProductFactory(price=1000)
+    discount = DiscountFactory(value=20, products=[product])
+    product.refresh_from_db()
+    assert product.effective_price == 800
+
+    discount.value = 50
+    discount.save()
+    product.refresh_from_db()
+    assert product.effective_price == 500
+
+    discount.products.remove(product)
+    product.refresh_from_db()
+    assert product.effective_price == 1000
+
+    discount.products.add(product)
+    discount.delete()
+    product.refresh_from_db()
+    assert product.effective_price == 1000
+
+@pytest.mark.django_db
+def test_effective_price_follows_price_changes():
+    product = ProductFactory(price=1000)
+    DiscountFactory(value=20, products=[product])
+    product.refresh_from_db()
+    product.price = 2000
+    product.save()
+    product.refresh_from_db()
+    assert product.effective_price == 1600
+
+@pytest.mark.django_db
+def test_refresh_crossed_discounts_flips_prices_at_boundaries():
+    now = timezone.now()
+    starting = ProductFactory(price=1000)
+    ending = ProductFactory(price=1000)
+    DiscountFactory(value=10, products=[starting], start_date=now - timedelta(minutes=1), end_date=now + timedelta(days=1))
+    DiscountFactory(value=10, products=[ending], start_date=now - timedelta(days=1), end_date=now - timedelta(minutes=1))
+    # Signals already priced both products; rewind them to what they were before the boundaries passed.
+    Product.objects.filter(pk=starting.pk).update(effective_price=1000)
+    Product.objects.filter(pk=ending.pk).update(effective_price=900)
+
+    assert ProductPricingService.refresh_crossed_discounts(now - timedelta(minutes=5), now) == 2
+    starting.refresh_from_db()
+    ending.refresh_from_db()
+    assert starting.effective_price == 900
+    assert ending.effective_price == 1000
+
+@pytest.mark.django_db
+def test_refresh_effective_prices_command():
+    product = ProductFactory(price=1000)
+    DiscountFactory(value=10, products=[product])
+    Product.objects.filter(pk=product.pk).update(effective_price=1000)
+    call_command('refresh_effective_prices', '--all')
+    product.refresh_from_db()
+    assert product.effective_price == 900
+
+@pytest.mark.django_db
+def test_price_filters_use_effective_price(api_client):
+    product = ProductFactory(price=1000)
+    DiscountFactory(value=50, products=[product])
+    response = api_client.get(reverse('shop:vendor_products-list'), {'max_price': 600})
+    assert [item['id'] for item in response.data['results']] == [product.id]
+    assert response.data['results'][0]['effective_price'] == 500
@@ -0,0 +1,84 @@
+from io import BytesIO
+
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+
+from PIL import Image
+
+import pytest
+
+from apps.shop.serializers import ProductSerializer
+from apps.shop.tests.factories import ProductFactory
+
+def make_picture(name='shoe.png', size=(1200, 800), mode='RGBA'):
+    buffer = BytesIO()
+    Image.new(mode, size, 'red').save(buffer, format='PNG')
+    return SimpleUploadedFile(name, buffer.getvalue(), content_type='image/png')
+
+@pytest.fixture
+def thumbnail_settings(settings, tmp_path):
+    settings.MEDIA_ROOT = str(tmp_path)
+    settings.PRODUCT_THUMBNAILS = {**settings.PRODUCT_THUMBNAILS, 'ASYNC': False}
+    return settings
+
+@pytest.mark.django_db
+def test_thumbnails_generated_after_commit(thumbnail_settings, django_capture_on_commit_callbacks):
+    with django_capture_on_commit_callbacks(execute=True):
+        product = ProductFactory(product_picture=make_picture())
+    product.refresh_from_db()
+
+    assert set(product.thumbnails) == set(thumbnail_settings.PRODUCT_THUMBNAILS['SIZES'])
+    small = product.thumbnails['small']
+    assert small['webp'] == 'product_pictures/shoe_small.webp'
+    with default_storage.open(small['webp']) as webp, default_storage.open(small['jpeg']) as jpeg:
+        assert Image.open(webp).format == 'WEBP'
+        assert Image.open(jpeg).format == 'JPEG'
+        assert max(Image.open(jpeg).size) == 200
+
+@pytest.mark.django_db
+def test_thumbnails_not_generated_inside_request_transaction(thumbnail_settings, django_capture_on_commit_callbacks):
+    with django_capture_on_commit_callbacks() as callbacks:
+        product = ProductFactory(product_picture=make_picture())
+    product.refresh_from_db()
+    assert product.thumbnails == {}
+    assert len(callbacks) == 1
+
+@pytest.mark.django_db
+def test_thumbnails_regenerated_when_picture_changes(thumbnail_settings, django_capture_on_commit_callbacks):
+    with django_capture_on_commit_callbacks(execute=True):
+        product = ProductFactory(product_picture=make_picture())
+    product.refresh_from_db()
+    old_thumbnail = product.thumbnails['small']['webp']
+
+    with django_capture_on_commit_callbacks(execute=True):
+        product.product_picture = make_picture('boot.png')
+        product.save()
+    product.refresh_from_db()
+    assert product.thumbnails['small']['webp'] == 'product_pictures/boot_small.webp'
+    assert not default_storage.exists(old_thumbnail)
+
+    with django_capture_on_commit_callbacks(execute=True):
+        product.product_picture = None
+        product.save()
+    product.refresh_from_db()
+    assert product.thumbnails == {}
+
+@pytest.mark.django_db
+def test_unrelated_change_does_not_regenerate(thumbnail_settings, django_capture_on_commit_callbacks):
+    with django_capture_on_commit_callbacks(execute=True):
+        product = ProductFactory(product_picture=make_picture())
+    product.refresh_from_db()
+
+    with django_capture_on_commit_callbacks() as callbacks:
+        product.name = 'Renamed'
+        product.save()
+    assert callbacks == []
+
+@pytest.mark.django_db
+def test_product_serializer_exposes_thumbnail_urls(thumbnail_settings, django_capture_on_commit_callbacks):
+    with django_capture_on_commit_callbacks(execute=True):
+        product = ProductFactory(product_picture=make_picture())
+    product.refresh_from_db()
+
+    data = ProductSerializer(product).data
+    assert data['thumbnails']['medium']['jpeg'] == '/media/product_pictures/shoe_medium.jpeg'
@@ -0,0 +1,68 @@
+from django.core.management import call_command
+
+import pytest
+
+from apps.shop.models import RelatedProduct
+from apps.shop.services.related_product_services import RelatedProductService
+from apps.shop.tests.factories import CategoryFactory, ParentCategoryFactory, ProductFactory
+
+def get_related(product):
+    return list(
+        RelatedProduct.objects.filter(product=product).order_by('-score', 'related_id').values_list('related_id', flat=True)
+    )
+
+def get_table():
+    return sorted(
+        (product_id, related_id, round(score, 6))
+        for product_id, related_id, score in RelatedProduct.objects.values_list('product_id', 'related_id', 'score')
+    )
+
+@pytest.fixture
+def tagged_catalog():
+    root = ParentCategoryFactory()
+    first, second = CategoryFactory(parent=root), CategoryFactory(parent=root)
+    products = {
+        'lamp': ProductFactory(category=first),
+        'desk lamp': ProductFactory(category=second),
+        'chair': ProductFactory(category=first),
+        'other tree': ProductFactory(category=CategoryFactory()),
+    }
+    products['lamp'].tags.add('light', 'brass', 'home')
+    products['desk lamp'].tags.add('light', 'brass', 'home')
+    products['chair'].tags.add('home', 'oak')
+    products['other tree'].tags.add('light', 'brass', 'home')
+    return products
+
+@pytest.mark.django_db
+def test_related_products_rank_shared_tags_within_category_tree(tagged_catalog):
+    assert get_related(tagged_catalog['lamp']) == [tagged_catalog['desk lamp'].id, tagged_catalog['chair'].id]
+    assert get_related(tagged_catalog['chair']) == [tagged_catalog['lamp'].id, tagged_catalog['desk lamp'].id]
+    assert get_related(tagged_catalog['other tree']) == []
+
+@pytest.mark.django_db
+def test_related_products_follow_tag_removal(tagged_catalog):
+    tagged_catalog['chair'].tags.remove('home')
+    assert get_related(tagged_catalog['lamp']) == [tagged_catalog['desk lamp'].id]
+    assert get_related(tagged_catalog['chair']) == []
+
+@pytest.mark.django_db
+def test_incremental_refresh_matches_rebuild(tagged_catalog):
+    RelatedProduct.objects.all().delete()
+    call_command('rebuild_related_products')
+    rebuilt = get_table()
+    assert len(rebuilt) == 6
+    # Tag weights drift as the tree grows; once they are current, a refresh reproduces the rebuild.
+    for product in tagged_catalog.values():
+        RelatedProductService.refresh(product.id)
+    assert get_table() == rebuilt
+
+@pytest.mark.django_db
+def test_related_products_skip_common_tags_and_keep_the_limit(settings, tagged_catalog):
+    settings.RELATED_PRODUCTS = {'LIMIT': 1, 'MAX_TAG_FREQUENCY': 2}
+    RelatedProductService.rebuild()
+    # 'home' is on all three products of the tree, so only light and brass relate anything.
+    assert get_related(tagged_catalog['lamp']) == [tagged_catalog['desk lamp'].id]
+    assert get_related(tagged_catalog['chair']) == []
+
+    RelatedProductService.refresh(tagged_catalog['chair'].id)
+    assert RelatedProduct.objects.filter(product=tagged_catalog['lamp']).count() == 1
@@ -0,0 +1,73 @@
+import json
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+
+from django.core.management import call_command
+
+import pytest
+
+from apps.orders.services.payment_services import PaymentService
+from apps.orders.tests.factories import OrderFactory, OrderItemFactory
+from apps.shop.services.reservation_services import StockReservationService
+from apps.shop.tests.factories import ProductFactory
+
+def test_reservations_never_exceed_stock():
+    assert StockReservationService.reserve('cart:a', {1: (3, 5)}, ttl=60) == {1: 0}
+    assert StockReservationService.reserve('cart:b', {1: (4, 5)}, ttl=60) == {1: 2}
+    # Shrinking a hold frees its units for everyone else.
+    assert StockReservationService.reserve('cart:a', {1: (-2, 5)}, ttl=60, relative=True) == {1: 0}
+    assert StockReservationService.reserve('cart:b', {1: (2, 5)}, ttl=60, relative=True) == {1: 0}
+    assert StockReservationService.reserve('cart:c', {1: (1, 5)}, ttl=60) == {1: 1}
+
+def test_strict_reservations_hold_nothing_when_short():
+    StockReservationService.reserve('cart:a', {1: (4, 5)}, ttl=60)
+    assert StockReservationService.reserve('cart:b', {1: (1, 5), 2: (1, 0)}, ttl=60, strict=True) == {1: 0, 2: 1}
+    assert StockReservationService.reserve('cart:c', {1: (1, 5)}, ttl=60) == {1: 0}
+
+def test_expired_reservations_are_released():
+    StockReservationService.reserve('cart:a', {1: (5, 5)}, ttl=0)
+    assert StockReservationService.reserve('cart:b', {1: (5, 5)}, ttl=60) == {1: 0}
+
+def test_released_and_transferred_reservations():
+    StockReservationService.reserve('cart:a', {1: (2, 3), 2: (1, 1)}, ttl=60)
+    assert StockReservationService.transfer('cart:a', 'order:1', [1, 2], ttl=60) == {1: 2, 2: 1}
+    assert StockReservationService.reserve('cart:b', {1: (2, 3)}, ttl=60) == {1: 1}
+    StockReservationService.release('order:1', [1, 2])
+    assert StockReservationService.reserve('cart:b', {1: (2, 3), 2: (1, 1)}, ttl=60) == {1: 0, 2: 0}
+
+def test_parallel_reservations_on_a_hot_product_do_not_oversell():
+    def reserve(index):
+        return StockReservationService.reserve(f'cart:{index}', {1: (1, 50)}, ttl=60, relative=True)[1]
+
+    with ThreadPoolExecutor(max_workers=16) as executor:
+        shortfalls = list(executor.map(reserve, range(300)))
+    assert shortfalls.count(0) == 50
+
+@pytest.mark.django_db
+@patch('apps.orders.services.payment_services.requests.post')
+def test_paying_an_order_turns_its_reservations_into_stock(mocked_post, django_capture_on_commit_callbacks):
+    mocked_post.return_value.json.return_value = {'status': 'success'}
+    product = ProductFactory(stock=5)
+    order = OrderFactory()
+    OrderItemFactory(order=order, product=product, quantity=2)
+    holder = StockReservationService.get_order_holder(order.pk)
+    StockReservationService.reserve(holder, {product.pk: (2, 5)}, ttl=60)
+
+    with django_capture_on_commit_callbacks(execute=True):
+        PaymentService.order_pay_verify(order, '1', 'transid')
+    product.refresh_from_db()
+    assert product.stock == 3
+    # The order's hold is gone, so the remaining units are all free again.
+    assert StockReservationService.reserve('cart:a', {product.pk: (3, product.stock)}, ttl=60) == {product.pk: 0}
+
+    with django_capture_on_commit_callbacks(execute=True):
+        PaymentService.order_pay_verify(order, '1', 'transid')
+    product.refresh_from_db()
+    assert product.stock == 3
+
+def test_benchmark_stock_reservations(tmp_path):
+    output = tmp_path / 'benchmark.json'
+    call_command('benchmark_stock_reservations', stock=20, reservations=100, workers=4, output=str(output))
+    result = json.loads(output.read_text())
+    assert result['granted'] == 20
+    assert result['oversold'] == 0
@@ -0,0 +1,73 @@
+from unittest.mock import patch
+
+from django.core.management import call_command
+
+import pytest
+
+from apps.accounts.tests.factories import VendorProfileFactory
+from apps.orders.services.payment_services import PaymentService
+from apps.orders.tests.factories import OrderFactory, OrderItemFactory
+from apps.shop.models import Product, VendorStats
+from apps.shop.services.product_services import ProductBulkUpdateService
+from apps.shop.services.vendor_stats_services import VendorStatsService
+from apps.shop.tests.factories import ProductFactory
+
+def get_stats(vendor):
+    stats = VendorStats.objects.get(vendor=vendor)
+    return stats.product_count, stats.in_stock_count, stats.inventory_value, stats.units_sold, stats.revenue
+
+@pytest.mark.django_db
+def test_vendor_stats_follow_product_changes():
+    vendor = VendorProfileFactory()
+    assert get_stats(vendor) == (0, 0, 0, 0, 0)
+
+    product = ProductFactory(vendor=vendor, price=100, stock=3)
+    ProductFactory(vendor=vendor, price=50, stock=0)
+    assert get_stats(vendor) == (2, 1, 300, 0, 0)
+
+    product.stock = 0
+    product.save()
+    assert get_stats(vendor) == (2, 0, 0, 0, 0)
+
+    product.delete()
+    assert get_stats(vendor) == (1, 0, 0, 0, 0)
+
+@pytest.mark.django_db
+def test_vendor_stats_move_with_product_vendor():
+    source, target = VendorProfileFactory.create_batch(2)
+    product = ProductFactory(vendor=source, price=10, stock=2)
+    product.vendor = target
+    product.save()
+    assert get_stats(source) == (0, 0, 0, 0, 0)
+    assert get_stats(target) == (1, 1, 20, 0, 0)
+
+@pytest.mark.django_db
+def test_vendor_stats_follow_bulk_updates():
+    vendor = VendorProfileFactory()
+    first, second = ProductFactory.create_batch(2, vendor=vendor, price=100, stock=1)
+    ProductBulkUpdateService.update(vendor, [{'id': first.id, 'price': 200}, {'id': second.id, 'stock': 0}])
+    assert get_stats(vendor) == (2, 1, 200, 0, 0)
+
+@pytest.mark.django_db
+@patch('apps.orders.services.payment_services.requests.post')
+def test_vendor_stats_count_a_paid_order_once(mocked_post):
+    mocked_post.return_value.json.return_value = {'status': 'success'}
+    product = ProductFactory(price=100, stock=5)
+    order = OrderFactory()
+    OrderItemFactory(order=order, product=product, price=100, quantity=2)
+
+    for _ in range(2):
+        assert PaymentService.order_pay_verify(order, '1', 'transid') == {'message': 'Payment successful'}
+    assert get_stats(product.vendor)[3:] == (2, 200)
+
+@pytest.mark.django_db
+def test_reconcile_vendor_stats_corrects_drift():
+    product = ProductFactory(price=100, stock=5)
+    order = OrderFactory(paid=True)
+    OrderItemFactory(order=order, product=product, price=100, quantity=3)
+    VendorStats.objects.filter(vendor=product.vendor).update(product_count=7, revenue=1)
+    Product.objects.filter(pk=product.pk).update(stock=4)
+
+    call_command('reconcile_vendor_stats')
+    assert get_stats(product.vendor) == (1, 1, 400, 3, 300)
+    assert VendorStatsService.reconcile() == 0
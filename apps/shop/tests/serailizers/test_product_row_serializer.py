@@ -0,0 +1,35 @@
+import pytest
+
+from apps.shop.models import Product
+from apps.shop.selectors.product_selectors import with_product_relations
+from apps.shop.serializers import ProductRowSerializer, ProductSerializer
+from apps.shop.tests.factories import CategoryFactory, ParentCategoryFactory, ProductFactory
+
+from apps.shop.tests.conftest import api_factory
+
+@pytest.mark.django_db
+def test_product_row_serializer_matches_product_serializer(api_factory):
+    request = api_factory.get('/vendor-products/')
+    tagged = ProductFactory()
+    tagged.tags.add('grid')
+    Product.objects.filter(pk=tagged.pk).update(product_picture='product_pictures/shoe.jpg')
+    root_product = ProductFactory(category=ParentCategoryFactory())
+    Product.objects.filter(pk=root_product.pk).update(thumbnails={'small': {'webp': 'products/thumbs/a_small.webp'}})
+    ProductFactory(category=CategoryFactory())
+
+    queryset = Product.objects.order_by('-created', '-id')
+    expected = ProductSerializer(with_product_relations(queryset), many=True, context={'request': request}).data
+    row_serializer = ProductRowSerializer(request=request)
+    assert row_serializer.to_representation(list(row_serializer.get_rows(queryset))) == [dict(item) for item in expected]
+
+@pytest.mark.django_db
+def test_product_row_serializer_keeps_requested_fields_in_serializer_order():
+    product = ProductFactory()
+    row_serializer = ProductRowSerializer(fields={'price', 'category', 'id'})
+    assert row_serializer.to_representation(list(row_serializer.get_rows(Product.objects.all()))) == [
+        {
+            'id': product.id,
+            'category': {'parent': product.category.parent.name, 'name': product.category.name},
+            'price': product.price,
+        }
+    ]
@@ -0,0 +1,59 @@
+from django.urls import reverse
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from rest_framework import status
+
+import pytest
+
+from apps.shop.tests.conftest import api_client
+from apps.shop.tests.factories import ParentCategoryFactory, CategoryFactory
+
+@pytest.mark.django_db
+def test_category_tree(api_client):
+    root = ParentCategoryFactory(name='Home')
+    child = CategoryFactory(parent=root, name='Kitchen')
+    grandchild = CategoryFactory(parent=child, name='Cookware')
+    response = api_client.get(reverse('shop:categories-list'))
+    assert response.status_code == status.HTTP_200_OK
+    assert response.data == [
+        {
+            'id': root.id, 'name': 'Home', 'slug': root.slug, 'children': [
+                {
+                    'id': child.id, 'name': 'Kitchen', 'slug': child.slug, 'children': [
+                        {'id': grandchild.id, 'name': 'Cookware', 'slug': grandchild.slug, 'children': []},
+                    ],
+                },
+            ],
+        },
+    ]
+
+@pytest.mark.django_db
+def test_category_tree_is_cached(api_client):
+    CategoryFactory.create_batch(3)
+    api_client.get(reverse('shop:categories-list'))
+    with CaptureQueriesContext(connection) as context:
+        response = api_client.get(reverse('shop:categories-list'))
+    assert response.status_code == status.HTTP_200_OK
+    assert len(context.captured_queries) == 0
+
+@pytest.mark.django_db
+def test_category_tree_not_modified(api_client):
+    CategoryFactory()
+    response = api_client.get(reverse('shop:categories-list'))
+    etag = response.headers['ETag']
+    response = api_client.get(reverse('shop:categories-list'), HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+
+@pytest.mark.django_db
+def test_category_tree_invalidated_on_change(api_client):
+    category = CategoryFactory()
+    response = api_client.get(reverse('shop:categories-list'))
+    etag = response.headers['ETag']
+    CategoryFactory(parent=category.parent)
+    response = api_client.get(reverse('shop:categories-list'), HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == status.HTTP_200_OK
+    assert len(response.data[0]['children']) == 2
+    category.delete()
+    response = api_client.get(reverse('shop:categories-list'))
+    assert len(response.data[0]['children']) == 1
@@ -0,0 +1,60 @@
+import datetime
+import decimal
+import io
+import uuid
+
+from django.urls import reverse
+from django.utils.translation import gettext_lazy
+
+from rest_framework import status
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+
+import pytest
+
+from config import parsers, renderers
+from config.parsers import FastJSONParser
+from config.renderers import FastJSONRenderer
+
+from apps.shop.tests.conftest import api_client
+from apps.shop.tests.factories import ProductFactory
+
+PAYLOAD = {
+    'price': decimal.Decimal('10.50'),
+    'created': datetime.datetime(2025, 1, 2, 3, 4, 5, 678901, tzinfo=datetime.timezone.utc),
+    'day': datetime.date(2025, 1, 2),
+    'id': uuid.UUID('12345678-1234-5678-1234-567812345678'),
+    'label': gettext_lazy('Products'),
+    'text': 'line\u2028separator \u2013 \u00fc',
+    3: [1, 2.5, None, True],
+}
+
+@pytest.mark.parametrize('orjson_installed', [True, False])
+def test_fast_json_renderer_matches_stock_renderer(monkeypatch, orjson_installed):
+    if not orjson_installed:
+        monkeypatch.setattr(renderers, 'orjson', None)
+    assert FastJSONRenderer().render(PAYLOAD) == JSONRenderer().render(PAYLOAD)
+
+def test_fast_json_renderer_keeps_indented_output():
+    media_type = 'application/json; indent=4'
+    assert FastJSONRenderer().render(PAYLOAD, media_type) == JSONRenderer().render(PAYLOAD, media_type)
+
+@pytest.mark.parametrize('orjson_installed', [True, False])
+def test_fast_json_parser_matches_stock_parser(monkeypatch, orjson_installed):
+    if not orjson_installed:
+        monkeypatch.setattr(parsers, 'orjson', None)
+    body = JSONRenderer().render(PAYLOAD)
+    assert FastJSONParser().parse(io.BytesIO(body)) == JSONParser().parse(io.BytesIO(body))
+
+def test_fast_json_parser_rejects_invalid_json():
+    with pytest.raises(ParseError):
+        FastJSONParser().parse(io.BytesIO(b'{"price": '))
+
+@pytest.mark.django_db
+def test_product_endpoint_renders_with_fast_renderer(api_client):
+    product = ProductFactory()
+    response = api_client.get(reverse('shop:vendor_products-detail', args=[product.id]))
+    assert response.status_code == status.HTTP_200_OK
+    assert isinstance(response.accepted_renderer, FastJSONRenderer)
+    assert response.json()['id'] == product.id
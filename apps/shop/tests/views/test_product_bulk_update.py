@@ -0,0 +1,78 @@
+from django.urls import reverse
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from rest_framework import status
+
+import pytest
+
+from apps.shop.tests.conftest import api_client, approved_vendor_user
+from apps.shop.tests.factories import ProductFactory
+
+@pytest.mark.django_db
+def test_bulk_update_price_and_stock(api_client, approved_vendor_user):
+    api_client.force_authenticate(user=approved_vendor_user)
+    vendor = approved_vendor_user.vendor_profile
+    first, second = ProductFactory.create_batch(2, vendor=vendor, price=100, stock=1)
+    data = [{'id': first.id, 'price': 150}, {'id': second.id, 'stock': 7}]
+    response = api_client.patch(reverse('shop:vendor_products-bulk-update'), data, format='json')
+    assert response.status_code == status.HTTP_200_OK
+    assert response.data == {'updated': 2}
+
+    first.refresh_from_db()
+    second.refresh_from_db()
+    assert (first.price, first.stock) == (150, 1)
+    assert (second.price, second.stock) == (100, 7)
+
+@pytest.mark.django_db
+def test_bulk_update_rejects_products_of_other_vendors(api_client, approved_vendor_user):
+    api_client.force_authenticate(user=approved_vendor_user)
+    own = ProductFactory(vendor=approved_vendor_user.vendor_profile, price=100)
+    foreign = ProductFactory(price=100)
+    data = [{'id': own.id, 'price': 1}, {'id': foreign.id, 'price': 1}]
+    response = api_client.patch(reverse('shop:vendor_products-bulk-update'), data, format='json')
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    own.refresh_from_db()
+    foreign.refresh_from_db()
+    assert own.price == 100
+    assert foreign.price == 100
+
+@pytest.mark.django_db
+def test_bulk_update_validates_items(api_client, approved_vendor_user):
+    api_client.force_authenticate(user=approved_vendor_user)
+    product = ProductFactory(vendor=approved_vendor_user.vendor_profile)
+    url = reverse('shop:vendor_products-bulk-update')
+    assert api_client.patch(url, [{'id': product.id}], format='json').status_code == status.HTTP_400_BAD_REQUEST
+    assert api_client.patch(url, [{'id': product.id, 'stock': -1}], format='json').status_code == status.HTTP_400_BAD_REQUEST
+    duplicated = [{'id': product.id, 'stock': 1}, {'id': product.id, 'stock': 2}]
+    assert api_client.patch(url, duplicated, format='json').status_code == status.HTTP_400_BAD_REQUEST
+    assert api_client.patch(url, [], format='json').status_code == status.HTTP_400_BAD_REQUEST
+
+@pytest.mark.django_db
+def test_bulk_update_query_count_is_constant(api_client, approved_vendor_user):
+    api_client.force_authenticate(user=approved_vendor_user)
+    products = ProductFactory.create_batch(10, vendor=approved_vendor_user.vendor_profile)
+
+    def bulk_update_query_count(batch):
+        with CaptureQueriesContext(connection) as context:
+            api_client.patch(
+                reverse('shop:vendor_products-bulk-update'),
+                [{'id': product.id, 'stock': 5} for product in batch],
+                format='json',
+            )
+        return len(context.captured_queries)
+
+    assert bulk_update_query_count(products[:2]) == bulk_update_query_count(products)
+
+@pytest.mark.django_db
+def test_bulk_update_invalidates_cached_detail(api_client, approved_vendor_user, django_capture_on_commit_callbacks):
+    api_client.force_authenticate(user=approved_vendor_user)
+    product = ProductFactory(vendor=approved_vendor_user.vendor_profile, stock=1)
+    detail_url = reverse('shop:vendor_products-detail', args=[product.id])
+    api_client.get(detail_url)
+
+    with django_capture_on_commit_callbacks(execute=True):
+        api_client.patch(reverse('shop:vendor_products-bulk-update'), [{'id': product.id, 'stock': 9}], format='json')
+    response = api_client.get(detail_url)
+    assert response.headers['X-Cache'] == 'MISS'
+    assert response.data['stock'] == 9
@@ -0,0 +1,87 @@
+from django.urls import reverse
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from rest_framework import status
+
+import pytest
+
+from apps.shop.services.cache_services import ProductResponseCacheService
+from apps.shop.tests.conftest import api_client
+from apps.shop.tests.factories import ProductFactory
+
+@pytest.mark.django_db
+def test_product_list_served_from_cache(api_client):
+    ProductFactory.create_batch(3)
+    url = reverse('shop:vendor_products-list')
+    first_response = api_client.get(url)
+    assert first_response.headers['X-Cache'] == 'MISS'
+
+    with CaptureQueriesContext(connection) as context:
+        second_response = api_client.get(url)
+    assert second_response.headers['X-Cache'] == 'HIT'
+    assert second_response.data == first_response.data
+    # Only the conditional GET validator aggregate hits the database.
+    assert len(context.captured_queries) == 1
+    assert ProductResponseCacheService.get_stats()['hits'] == 1
+
+@pytest.mark.django_db
+def test_product_list_cache_key_ignores_param_order(api_client):
+    product = ProductFactory()
+    url = reverse('shop:vendor_products-list')
+    api_client.get(f'{url}?vendor={product.vendor_id}&max_price=5000')
+    response = api_client.get(f'{url}?max_price=5000&vendor={product.vendor_id}')
+    assert response.headers['X-Cache'] == 'HIT'
+
+@pytest.mark.django_db
+def test_product_change_invalidates_list_and_detail(api_client):
+    product = ProductFactory(name='Old name')
+    list_url = reverse('shop:vendor_products-list')
+    detail_url = reverse('shop:vendor_products-detail', args=[product.id])
+    api_client.get(list_url)
+    api_client.get(detail_url)
+
+    product.name = 'New name'
+    product.save()
+    list_response = api_client.get(list_url)
+    detail_response = api_client.get(detail_url)
+    assert list_response.headers['X-Cache'] == 'MISS'
+    assert list_response.data['results'][0]['name'] == 'New name'
+    assert detail_response.headers['X-Cache'] == 'MISS'
+    assert detail_response.data['name'] == 'New name'
+
+@pytest.mark.django_db
+def test_other_vendor_change_keeps_vendor_list_cached(api_client):
+    product = ProductFactory()
+    url = reverse('shop:vendor_products-list')
+    api_client.get(url, {'vendor': product.vendor_id})
+    ProductFactory(category=product.category)
+    response = api_client.get(url, {'vendor': product.vendor_id})
+    assert response.headers['X-Cache'] == 'HIT'
+
+@pytest.mark.django_db
+def test_tag_and_category_changes_invalidate_cache(api_client):
+    product = ProductFactory()
+    url = reverse('shop:vendor_products-detail', args=[product.id])
+    api_client.get(url)
+    product.tags.add('fresh')
+    response = api_client.get(url)
+    assert response.headers['X-Cache'] == 'MISS'
+    assert response.data['tags'] == ['fresh']
+
+    category = product.category
+    category.name = 'Renamed'
+    category.save()
+    response = api_client.get(url)
+    assert response.headers['X-Cache'] == 'MISS'
+    assert response.data['category']['name'] == 'Renamed'
+
+@pytest.mark.django_db
+def test_bypass_header_skips_cache(api_client, settings):
+    settings.PRODUCT_RESPONSE_CACHE = {'TIMEOUT': 60, 'BYPASS_HEADER': 'X-Skip-Cache'}
+    ProductFactory()
+    url = reverse('shop:vendor_products-list')
+    api_client.get(url)
+    response = api_client.get(url, HTTP_X_SKIP_CACHE='true')
+    assert response.headers['X-Cache'] == 'MISS'
+    assert ProductResponseCacheService.get_stats()['bypasses'] == 1
@@ -0,0 +1,117 @@
+import time
+from unittest.mock import patch
+
+from django.urls import reverse
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from rest_framework import status
+
+import pytest
+
+from apps.shop.tests.conftest import api_client
+from apps.shop.tests.factories import ProductFactory
+
+@pytest.mark.django_db
+def test_product_detail_not_modified_with_etag(api_client):
+    product = ProductFactory()
+    url = reverse('shop:vendor_products-detail', args=[product.id])
+    response = api_client.get(url)
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers['ETag']
+    assert response.headers['Last-Modified']
+
+    response = api_client.get(url, HTTP_IF_NONE_MATCH=response.headers['ETag'])
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+    assert response.content == b''
+
+@pytest.mark.django_db
+def test_product_detail_not_modified_since(api_client):
+    product = ProductFactory()
+    url = reverse('shop:vendor_products-detail', args=[product.id])
+    last_modified = api_client.get(url).headers['Last-Modified']
+    response = api_client.get(url, HTTP_IF_MODIFIED_SINCE=last_modified)
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+
+@pytest.mark.django_db
+def test_product_detail_change_returns_new_body(api_client):
+    product = ProductFactory(name='Old name')
+    url = reverse('shop:vendor_products-detail', args=[product.id])
+    etag = api_client.get(url).headers['ETag']
+
+    product.name = 'New name'
+    product.save()
+    response = api_client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == status.HTTP_200_OK
+    assert response.data['name'] == 'New name'
+    assert response.headers['ETag'] != etag
+
+@pytest.mark.django_db
+def test_product_detail_tag_change_returns_new_body(api_client):
+    product = ProductFactory()
+    url = reverse('shop:vendor_products-detail', args=[product.id])
+    etag = api_client.get(url).headers['ETag']
+
+    product.tags.add('fresh')
+    response = api_client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == status.HTTP_200_OK
+
+@pytest.mark.django_db
+def test_product_list_not_modified_without_serializing(api_client):
+    ProductFactory.create_batch(3)
+    url = reverse('shop:vendor_products-list')
+    etag = api_client.get(url).headers['ETag']
+
+    with CaptureQueriesContext(connection) as context:
+        response = api_client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+    assert len(context.captured_queries) == 1
+
+@pytest.mark.django_db
+def test_product_list_validators_follow_filters(api_client):
+    product = ProductFactory()
+    other = ProductFactory()
+    url = reverse('shop:vendor_products-list')
+    etag = api_client.get(url, {'vendor': product.vendor_id}).headers['ETag']
+
+    other.delete()
+    response = api_client.get(url, {'vendor': product.vendor_id}, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+
+    response = api_client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == status.HTTP_200_OK
+
+@pytest.mark.django_db
+def test_product_list_deletion_returns_new_body(api_client):
+    products = ProductFactory.create_batch(2)
+    url = reverse('shop:vendor_products-list')
+    etag = api_client.get(url).headers['ETag']
+
+    products[0].delete()
+    response = api_client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == status.HTTP_200_OK
+    assert len(response.data['results']) == 1
+
+@pytest.mark.django_db
+def test_product_detail_tag_change_is_modified_since(api_client):
+    product = ProductFactory()
+    url = reverse('shop:vendor_products-detail', args=[product.id])
+    last_modified = api_client.get(url).headers['Last-Modified']
+
+    with patch('apps.shop.services.cache_services.time.time_ns', return_value=time.time_ns() + 5 * 10 ** 9):
+        product.tags.add('fresh')
+    response = api_client.get(url, HTTP_IF_MODIFIED_SINCE=last_modified)
+    assert response.status_code == status.HTTP_200_OK
+    assert response.data['tags'] == ['fresh']
+
+@pytest.mark.django_db
+def test_product_list_deletion_is_modified_since(api_client):
+    older, newer = ProductFactory.create_batch(2)
+    url = reverse('shop:vendor_products-list')
+    last_modified = api_client.get(url).headers['Last-Modified']
+
+    with patch('apps.shop.services.cache_services.time.time_ns', return_value=time.time_ns() + 5 * 10 ** 9):
+        older.delete()
+    response = api_client.get(url, HTTP_IF_MODIFIED_SINCE=last_modified)
+    assert response.status_code == status.HTTP_200_OK
+    assert [item['id'] for item in response.data['results']] == [newer.id]
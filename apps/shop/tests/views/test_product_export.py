@@ -0,0 +1,89 @@
+import csv
+import io
+import json
+
+from django.urls import reverse
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from rest_framework import status
+
+import pytest
+
+from apps.accounts.tests.factories import ShopUserFactory
+from apps.shop.tests.conftest import api_client, approved_vendor_user, child_category_factory
+from apps.shop.tests.factories import ProductFactory
+
+def read_stream(response):
+    return b''.join(response.streaming_content).decode()
+
+@pytest.mark.django_db
+def test_export_products_as_csv(api_client, approved_vendor_user, child_category_factory):
+    api_client.force_authenticate(user=approved_vendor_user)
+    product = ProductFactory(vendor=approved_vendor_user.vendor_profile, category=child_category_factory)
+    product.tags.add('red', 'summer sale')
+    response = api_client.get(reverse('shop:vendor_products-export'))
+    assert response.status_code == status.HTTP_200_OK
+    assert response['Content-Type'] == 'text/csv'
+
+    rows = list(csv.DictReader(io.StringIO(read_stream(response))))
+    assert len(rows) == 1
+    assert rows[0]['name'] == product.name
+    assert rows[0]['vendor'] == approved_vendor_user.vendor_profile.store_name
+    assert rows[0]['category_path'] == child_category_factory.full_path
+    assert rows[0]['tags'] == '"summer sale", red'
+
+@pytest.mark.django_db
+def test_export_products_as_jsonl_with_filters(api_client, approved_vendor_user):
+    api_client.force_authenticate(user=approved_vendor_user)
+    vendor = approved_vendor_user.vendor_profile
+    cheap = ProductFactory(vendor=vendor, price=10)
+    ProductFactory(vendor=vendor, price=5000)
+    response = api_client.get(reverse('shop:vendor_products-export'), {'export_format': 'jsonl', 'max_price': 100})
+    assert response['Content-Type'] == 'application/x-ndjson'
+
+    rows = [json.loads(line) for line in read_stream(response).splitlines()]
+    assert [row['id'] for row in rows] == [cheap.id]
+
+@pytest.mark.django_db
+def test_vendor_export_is_scoped_to_own_products(api_client, approved_vendor_user):
+    api_client.force_authenticate(user=approved_vendor_user)
+    own = ProductFactory(vendor=approved_vendor_user.vendor_profile)
+    ProductFactory()
+    response = api_client.get(reverse('shop:vendor_products-export'), {'export_format': 'jsonl'})
+    assert [json.loads(line)['id'] for line in read_stream(response).splitlines()] == [own.id]
+
+@pytest.mark.django_db
+def test_admin_exports_whole_catalog(api_client):
+    api_client.force_authenticate(user=ShopUserFactory(is_staff=True))
+    ProductFactory.create_batch(3)
+    response = api_client.get(reverse('shop:vendor_products-export'), {'export_format': 'jsonl'})
+    assert len(read_stream(response).splitlines()) == 3
+
+@pytest.mark.django_db
+def test_export_requires_vendor_or_admin(api_client):
+    response = api_client.get(reverse('shop:vendor_products-export'))
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+    api_client.force_authenticate(user=ShopUserFactory())
+    response = api_client.get(reverse('shop:vendor_products-export'))
+    assert response.status_code == status.HTTP_403_FORBIDDEN
+
+@pytest.mark.django_db
+def test_export_rejects_unknown_format(api_client, approved_vendor_user):
+    api_client.force_authenticate(user=approved_vendor_user)
+    response = api_client.get(reverse('shop:vendor_products-export'), {'export_format': 'xml'})
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+@pytest.mark.django_db
+def test_export_query_count_is_constant(api_client):
+    api_client.force_authenticate(user=ShopUserFactory(is_staff=True))
+
+    def export_query_count():
+        with CaptureQueriesContext(connection) as context:
+            read_stream(api_client.get(reverse('shop:vendor_products-export')))
+        return len(context.captured_queries)
+
+    ProductFactory.create_batch(2)
+    few_products_queries = export_query_count()
+    ProductFactory.create_batch(8)
+    assert export_query_count() == few_products_queries
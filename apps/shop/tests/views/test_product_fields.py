@@ -0,0 +1,57 @@
+from django.urls import reverse
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from rest_framework import status
+
+import pytest
+
+from apps.shop.tests.conftest import api_client
+from apps.shop.tests.factories import ProductFactory
+
+@pytest.mark.django_db
+def test_product_list_returns_requested_fields_only(api_client):
+    product = ProductFactory()
+    product.tags.add('grid')
+    response = api_client.get(reverse('shop:vendor_products-list'), {'fields': 'id,name,price,thumbnails'})
+    assert response.status_code == status.HTTP_200_OK
+    assert response.data['results'] == [
+        {'id': product.id, 'name': product.name, 'price': product.price, 'thumbnails': {}}
+    ]
+
+@pytest.mark.django_db
+def test_product_list_sparse_fields_skip_relations(api_client):
+    ProductFactory.create_batch(3)
+    with CaptureQueriesContext(connection) as context:
+        api_client.get(reverse('shop:vendor_products-list'), {'fields': 'id,name,price'})
+    page_queries = [query['sql'] for query in context.captured_queries if 'LIMIT' in query['sql']]
+    assert len(page_queries) == 1
+    assert 'shop_category' not in page_queries[0]
+    assert '"shop_product"."description"' not in page_queries[0]
+    assert not [query for query in context.captured_queries if 'taggit' in query['sql']]
+
+@pytest.mark.django_db
+def test_product_list_sparse_fields_keep_requested_relations(api_client):
+    ProductFactory.create_batch(3)
+    product = ProductFactory()
+    product.tags.add('grid')
+    with CaptureQueriesContext(connection) as context:
+        response = api_client.get(reverse('shop:vendor_products-list'), {'fields': 'id,category,tags'})
+    # One query for the page and one for its tags, however many categories are on it.
+    assert len([query for query in context.captured_queries if 'LIMIT' in query['sql'] or 'taggit' in query['sql']]) == 2
+    assert response.data['results'][0]['tags'] == ['grid']
+    assert response.data['results'][0]['category'] == {
+        'parent': product.category.parent.name, 'name': product.category.name
+    }
+
+@pytest.mark.django_db
+def test_product_detail_returns_requested_fields_only(api_client):
+    product = ProductFactory()
+    response = api_client.get(reverse('shop:vendor_products-detail', args=[product.id]), {'fields': 'id,stock'})
+    assert response.data == {'id': product.id, 'stock': product.stock}
+
+@pytest.mark.django_db
+def test_product_list_rejects_unknown_fields(api_client):
+    response = api_client.get(reverse('shop:vendor_products-list'), {'fields': 'id,vendor'})
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert 'fields' in response.data
@@ -0,0 +1,133 @@
+import json
+from unittest.mock import patch
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.urls import reverse
+from django.db import IntegrityError, connection
+from django.test.utils import CaptureQueriesContext
+
+from rest_framework import status
+
+import pytest
+
+from apps.shop.models import Product
+from apps.shop.services.import_services import ProductImportService
+from apps.shop.tests.conftest import api_client, approved_vendor_user, child_category_factory
+from apps.shop.tests.factories import ProductFactory
+
+def csv_file(lines, name='products.csv'):
+    return SimpleUploadedFile(name, '\n'.join(lines).encode(), content_type='text/csv')
+
+@pytest.mark.django_db
+def test_import_products_from_csv(api_client, approved_vendor_user, child_category_factory):
+    api_client.force_authenticate(user=approved_vendor_user)
+    category = child_category_factory
+    file = csv_file([
+        'name,description,price,stock,weight,category,tags',
+        f'Red shoe,Leather,1000,5,300,{category.id},"shoes, red"',
+        f'Blue shoe,Canvas,900,3,,{category.id},shoes',
+    ])
+    response = api_client.post(reverse('shop:vendor_products-import-products'), {'file': file}, format='multipart')
+    assert response.status_code == status.HTTP_200_OK
+    assert response.data == {'created': 2, 'failed': 0, 'errors': []}
+
+    red_shoe = Product.objects.get(name='Red shoe')
+    assert red_shoe.vendor == approved_vendor_user.vendor_profile
+    assert red_shoe.slug == 'red-shoe'
+    assert set(red_shoe.tags.names()) == {'shoes', 'red'}
+    assert Product.objects.get(name='Blue shoe').weight == 0
+    assert Product.objects.filter(search_vector='red').count() == 1
+
+@pytest.mark.django_db
+def test_import_products_reports_row_errors(api_client, approved_vendor_user, child_category_factory):
+    api_client.force_authenticate(user=approved_vendor_user)
+    category = child_category_factory
+    lines = [
+        json.dumps({'name': 'Lamp', 'description': 'Desk lamp', 'price': 50, 'stock': 1, 'category': category.id}),
+        json.dumps({'name': 'Chair', 'description': 'Oak', 'price': -1, 'stock': 1, 'category': category.id}),
+        '{not json',
+        json.dumps({'name': 'Table', 'description': 'Oak', 'price': 10, 'stock': 1, 'category': category.parent.id}),
+    ]
+    file = SimpleUploadedFile('products.jsonl', '\n'.join(lines).encode())
+    response = api_client.post(reverse('shop:vendor_products-import-products'), {'file': file}, format='multipart')
+    assert response.status_code == status.HTTP_200_OK
+    assert response.data['created'] == 1
+    assert response.data['failed'] == 3
+    assert [error['line'] for error in response.data['errors']] == [2, 3, 4]
+    assert 'price' in response.data['errors'][0]['errors']
+    assert 'category' in response.data['errors'][2]['errors']
+
+@pytest.mark.django_db
+def test_import_products_resolves_slug_collisions(api_client, approved_vendor_user, child_category_factory):
+    api_client.force_authenticate(user=approved_vendor_user)
+    category = child_category_factory
+    ProductFactory(name='Mug', category=category)
+    file = csv_file(['name,description,price,stock,category'] + [f'Mug,Cup,10,1,{category.id}'] * 3)
+    api_client.post(reverse('shop:vendor_products-import-products'), {'file': file}, format='multipart')
+    assert sorted(Product.objects.filter(name='Mug').values_list('slug', flat=True)) == [
+        'mug', 'mug-2', 'mug-3', 'mug-4'
+    ]
+
+@pytest.mark.django_db
+def test_import_products_retries_slugs_taken_concurrently(api_client, approved_vendor_user, child_category_factory):
+    api_client.force_authenticate(user=approved_vendor_user)
+    category = child_category_factory
+    ProductFactory(name='Vase', category=category)
+    reserve_slugs = ProductImportService.reserve_slugs
+    calls = []
+
+    def reserve_from_stale_snapshot(products):
+        # The first reservation misses the product created since, as a concurrent import would.
+        calls.append(products)
+        reserve_slugs(products)
+        if len(calls) == 1:
+            products[0].slug = 'vase'
+
+    file = csv_file(['name,description,price,stock,category'] + [f'Vase,Glass,10,1,{category.id}'] * 2)
+    with patch.object(ProductImportService, 'reserve_slugs', side_effect=reserve_from_stale_snapshot):
+        response = api_client.post(reverse('shop:vendor_products-import-products'), {'file': file}, format='multipart')
+    assert response.data == {'created': 2, 'failed': 0, 'errors': []}
+    assert len(calls) == 2
+    assert sorted(Product.objects.filter(name='Vase').values_list('slug', flat=True)) == ['vase', 'vase-2', 'vase-3']
+
+@pytest.mark.django_db
+def test_import_products_reports_rows_whose_slugs_keep_clashing(api_client, approved_vendor_user, child_category_factory):
+    api_client.force_authenticate(user=approved_vendor_user)
+    category = child_category_factory
+    file = csv_file(['name,description,price,stock,category'] + [f'Bowl,Clay,10,1,{category.id}'] * 2)
+    with patch.object(Product.objects, 'bulk_create', side_effect=IntegrityError):
+        response = api_client.post(reverse('shop:vendor_products-import-products'), {'file': file}, format='multipart')
+    assert response.status_code == status.HTTP_200_OK
+    assert response.data['created'] == 0
+    assert [error['line'] for error in response.data['errors']] == [2, 3]
+    assert 'slug' in response.data['errors'][0]['errors']
+
+@pytest.mark.django_db
+def test_import_products_query_count_is_constant(api_client, approved_vendor_user, child_category_factory):
+    api_client.force_authenticate(user=approved_vendor_user)
+    category = child_category_factory
+
+    def import_query_count(count):
+        rows = [f'Item {index},Thing,10,1,{category.id},"tag{index}, common"' for index in range(count)]
+        file = csv_file(['name,description,price,stock,category,tags'] + rows)
+        with CaptureQueriesContext(connection) as context:
+            api_client.post(reverse('shop:vendor_products-import-products'), {'file': file}, format='multipart')
+        return len(context.captured_queries)
+
+    assert import_query_count(2) == import_query_count(20)
+
+@pytest.mark.django_db
+def test_import_products_requires_known_format(api_client, approved_vendor_user):
+    api_client.force_authenticate(user=approved_vendor_user)
+    file = SimpleUploadedFile('products.txt', b'name')
+    response = api_client.post(reverse('shop:vendor_products-import-products'), {'file': file}, format='multipart')
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+@pytest.mark.django_db
+def test_import_products_command(tmp_path, approved_vendor_user, child_category_factory):
+    category = child_category_factory
+    path = tmp_path / 'products.csv'
+    path.write_text('name,description,price,stock,category\n' + f'Kettle,Steel,30,2,{category.id}\n' * 5)
+    call_command('import_products', approved_vendor_user.vendor_profile.id, str(path), chunk_size=2)
+    assert Product.objects.filter(name='Kettle').count() == 5
@@ -1,4 +1,6 @@
 from  django.urls import reverse
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 
 from rest_framework import status
 
@@ -11,7 +13,7 @@ from apps.shop.tests.conftest import (
     approved_vendor_user,
     child_category_factory
 )
-from apps.shop.tests.factories import ProductFactory
+from apps.shop.tests.factories import ProductFactory, ParentCategoryFactory, CategoryFactory
 
 @pytest.mark.django_db
 def test_product_list_authenticated_vendor(api_client, vendor_factory):
@@ -20,7 +22,7 @@ def test_product_list_authenticated_vendor(api_client, vendor_factory):
     ProductFactory.create_batch(5)
     response = api_client.get(reverse('shop:vendor_products-list'))
     assert response.status_code == status.HTTP_200_OK
-    assert len(response.data) == 5
+    assert len(response.data['results']) == 5
 
 @pytest.mark.django_db
 def test_product_list_unauthenticated(api_client):
@@ -28,6 +30,158 @@ def test_product_list_unauthenticated(api_client):
     response = api_client.get(reverse('shop:vendor_products-list'))
     assert response.status_code == status.HTTP_200_OK
 
+@pytest.mark.django_db
+def test_product_list_cursor_pagination(api_client):
+    products = ProductFactory.create_batch(5)
+    url = reverse('shop:vendor_products-list')
+    first_page = api_client.get(url, {'page_size': 3})
+    assert first_page.status_code == status.HTTP_200_OK
+    assert first_page.data['previous'] is None
+    assert [item['id'] for item in first_page.data['results']] == [p.id for p in products[::-1][:3]]
+
+    second_page = api_client.get(first_page.data['next'])
+    assert second_page.data['next'] is None
+    assert [item['id'] for item in second_page.data['results']] == [p.id for p in products[::-1][3:]]
+
+    previous_page = api_client.get(second_page.data['previous'])
+    assert [item['id'] for item in previous_page.data['results']] == [p.id for p in products[::-1][:3]]
+
+@pytest.mark.django_db
+def test_product_list_cursor_pagination_with_filter(api_client, vendor_factory):
+    vendor = vendor_factory
+    vendor_products = ProductFactory.create_batch(3, vendor=vendor)
+    ProductFactory.create_batch(3)
+    url = reverse('shop:vendor_products-list')
+    first_page = api_client.get(url, {'vendor': vendor.id, 'page_size': 2})
+    second_page = api_client.get(first_page.data['next'])
+    ids = [item['id'] for item in first_page.data['results'] + second_page.data['results']]
+    assert ids == [p.id for p in vendor_products[::-1]]
+
+@pytest.mark.django_db
+def test_product_list_invalid_cursor(api_client):
+    response = api_client.get(reverse('shop:vendor_products-list'), {'cursor': 'cD1ub3RhZGF0ZQ=='})
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+
+@pytest.mark.django_db
+def test_product_list_query_count_is_constant(api_client):
+    def list_products_query_count():
+        with CaptureQueriesContext(connection) as context:
+            response = api_client.get(reverse('shop:vendor_products-list'))
+        assert response.status_code == status.HTTP_200_OK
+        return len(context.captured_queries)
+
+    for product in ProductFactory.create_batch(2):
+        product.tags.add('first_tag', 'second_tag')
+    few_products_queries = list_products_query_count()
+
+    for product in ProductFactory.create_batch(8):
+        product.tags.add('first_tag', 'second_tag')
+    many_products_queries = list_products_query_count()
+
+    assert few_products_queries == many_products_queries
+
+@pytest.mark.django_db
+def test_product_search_ranks_name_matches_first(api_client):
+    description_match = ProductFactory(name='Leather wallet', description='Fits next to your phone')
+    name_match = ProductFactory(name='Phone case', description='Hard shell')
+    ProductFactory(name='Desk lamp', description='Warm light')
+    response = api_client.get(reverse('shop:vendor_products-list'), {'q': 'phone'})
+    assert response.status_code == status.HTTP_200_OK
+    assert [item['id'] for item in response.data['results']] == [name_match.id, description_match.id]
+
+@pytest.mark.django_db
+def test_product_search_matches_tags(api_client):
+    product = ProductFactory(name='Mug', description='Ceramic')
+    ProductFactory(name='Plate', description='Ceramic')
+    product.tags.add('kitchenware')
+    response = api_client.get(reverse('shop:vendor_products-list'), {'q': 'kitchenware'})
+    assert [item['id'] for item in response.data['results']] == [product.id]
+
+    product.tags.clear()
+    response = api_client.get(reverse('shop:vendor_products-list'), {'q': 'kitchenware'})
+    assert response.data['results'] == []
+
+@pytest.mark.django_db
+def test_product_search_paginates_by_rank(api_client):
+    products = [ProductFactory(name=f'Chair {i}', description='chair ' * i) for i in range(1, 5)]
+    url = reverse('shop:vendor_products-list')
+    first_page = api_client.get(url, {'q': 'chair', 'page_size': 2})
+    second_page = api_client.get(first_page.data['next'])
+    ids = [item['id'] for item in first_page.data['results'] + second_page.data['results']]
+    assert sorted(ids) == sorted(p.id for p in products)
+    assert second_page.data['next'] is None
+
+@pytest.mark.django_db
+def test_product_search_paginates_tied_ranks(api_client):
+    products = [ProductFactory(name='Lamp', description='') for _ in range(5)]
+    url = reverse('shop:vendor_products-list')
+    response = api_client.get(url, {'q': 'lamp', 'page_size': 2})
+    ids = [item['id'] for item in response.data['results']]
+    for _ in range(len(products)):
+        if response.data['next'] is None:
+            break
+        response = api_client.get(response.data['next'])
+        ids += [item['id'] for item in response.data['results']]
+    assert response.data['next'] is None
+    assert sorted(ids) == sorted(p.id for p in products)
+
+@pytest.mark.django_db
+def test_product_filter_by_category_subtree(api_client):
+    root = ParentCategoryFactory(name='Electronics')
+    child = CategoryFactory(parent=root, name='Phones')
+    grandchild = CategoryFactory(parent=child, name='Smartphones')
+    root_product = ProductFactory(category=root)
+    grandchild_product = ProductFactory(category=grandchild)
+    ProductFactory()
+    url = reverse('shop:vendor_products-list')
+
+    response = api_client.get(url, {'category': root.slug})
+    assert {item['id'] for item in response.data['results']} == {root_product.id, grandchild_product.id}
+
+    response = api_client.get(url, {'category': child.id})
+    assert [item['id'] for item in response.data['results']] == [grandchild_product.id]
+
+@pytest.mark.django_db
+def test_product_filter_by_multiple_categories(api_client):
+    first_product = ProductFactory()
+    second_product = ProductFactory()
+    ProductFactory()
+    categories = f'{first_product.category.slug},{second_product.category.parent.id}'
+    response = api_client.get(reverse('shop:vendor_products-list'), {'category': categories})
+    assert {item['id'] for item in response.data['results']} == {first_product.id, second_product.id}
+
+@pytest.mark.django_db
+def test_product_filter_in_stock(api_client):
+    in_stock = ProductFactory(stock=3)
+    sold_out = ProductFactory(stock=0)
+    url = reverse('shop:vendor_products-list')
+    response = api_client.get(url, {'in_stock': 'true'})
+    assert [item['id'] for item in response.data['results']] == [in_stock.id]
+    response = api_client.get(url, {'in_stock': 'false'})
+    assert [item['id'] for item in response.data['results']] == [sold_out.id]
+
+@pytest.mark.django_db
+def test_product_filter_by_unknown_category(api_client):
+    ProductFactory()
+    response = api_client.get(reverse('shop:vendor_products-list'), {'category': 'no-such-category'})
+    assert response.status_code == status.HTTP_200_OK
+    assert response.data['results'] == []
+
+@pytest.mark.django_db
+def test_product_filter_by_category_after_tree_change(api_client):
+    root = ParentCategoryFactory()
+    other_root = ParentCategoryFactory()
+    child = CategoryFactory(parent=other_root)
+    product = ProductFactory(category=child)
+    url = reverse('shop:vendor_products-list')
+    assert api_client.get(url, {'category': root.slug}).data['results'] == []
+
+    root.refresh_from_db()
+    child.refresh_from_db()
+    child.move_to(root)
+    response = api_client.get(url, {'category': root.slug})
+    assert [item['id'] for item in response.data['results']] == [product.id]
+
 @pytest.mark.django_db
 def test_create_product_success(api_client, validate_product, approved_vendor_user):
     user = approved_vendor_user
@@ -0,0 +1,26 @@
+from django.urls import reverse
+
+from rest_framework import status
+
+import pytest
+
+from apps.shop.tests.factories import CategoryFactory, ParentCategoryFactory, ProductFactory
+
+from apps.shop.tests.conftest import api_client
+
+@pytest.mark.django_db
+def test_related_products_endpoint(api_client):
+    category = CategoryFactory(parent=ParentCategoryFactory())
+    product, closest, other = ProductFactory.create_batch(3, category=category)
+    product.tags.add('light', 'brass')
+    closest.tags.add('light', 'brass')
+    other.tags.add('light')
+    response = api_client.get(reverse('shop:vendor_products-related', args=[product.id]))
+    assert response.status_code == status.HTTP_200_OK
+    assert [item['id'] for item in response.data] == [closest.id, other.id]
+    assert sorted(response.data[0]['tags']) == ['brass', 'light']
+
+@pytest.mark.django_db
+def test_related_products_endpoint_unknown_product(api_client):
+    response = api_client.get(reverse('shop:vendor_products-related', args=[0]))
+    assert response.status_code == status.HTTP_404_NOT_FOUND
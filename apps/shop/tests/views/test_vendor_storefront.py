@@ -0,0 +1,47 @@
+from django.urls import reverse
+
+from rest_framework import status
+
+import pytest
+
+from apps.accounts.models import VendorProfile
+from apps.accounts.tests.factories import VendorProfileFactory
+from apps.shop.models import VendorStats
+from apps.shop.tests.factories import ProductFactory
+
+from apps.shop.tests.conftest import api_client, approved_vendor_user
+
+@pytest.mark.django_db
+def test_storefront_shows_public_counts(api_client):
+    vendor = VendorProfileFactory(status=VendorProfile.Status.APPROVED)
+    ProductFactory(vendor=vendor, price=100, stock=2)
+    response = api_client.get(reverse('shop:storefronts-detail', args=[vendor.id]))
+    assert response.status_code == status.HTTP_200_OK
+    assert response.data == {
+        'vendor': vendor.id, 'store_name': vendor.store_name, 'product_count': 1, 'in_stock_count': 1
+    }
+
+@pytest.mark.django_db
+def test_storefront_shows_inventory_and_sales_to_owner(api_client, approved_vendor_user):
+    vendor = approved_vendor_user.vendor_profile
+    ProductFactory(vendor=vendor, price=100, stock=2)
+    api_client.force_authenticate(user=approved_vendor_user)
+    response = api_client.get(reverse('shop:storefronts-detail', args=[vendor.id]))
+    assert response.status_code == status.HTTP_200_OK
+    assert response.data['inventory_value'] == 200
+    assert response.data['revenue'] == 0
+
+@pytest.mark.django_db
+def test_storefront_hides_pending_vendor(api_client):
+    vendor = VendorProfileFactory()
+    response = api_client.get(reverse('shop:storefronts-detail', args=[vendor.id]))
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+
+@pytest.mark.django_db
+def test_storefront_rebuilds_missing_stats(api_client):
+    vendor = VendorProfileFactory(status=VendorProfile.Status.APPROVED)
+    ProductFactory(vendor=vendor, price=100, stock=2)
+    VendorStats.objects.filter(vendor=vendor).delete()
+    response = api_client.get(reverse('shop:storefronts-detail', args=[vendor.id]))
+    assert response.status_code == status.HTTP_200_OK
+    assert response.data['product_count'] == 1
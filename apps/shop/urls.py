@@ -5,6 +5,8 @@ from . import views as api_views
 app_name = 'shop'
 router = DefaultRouter()
 router.register(r'vendor-products', api_views.ProductsViewSet, basename='vendor_products')
+router.register(r'categories', api_views.CategoryViewSet, basename='categories')
+router.register(r'storefronts', api_views.VendorStorefrontViewSet, basename='storefronts')
 
 urlpatterns = [
     path('', include(router.urls)),
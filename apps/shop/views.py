@@ -1,34 +1,65 @@
+from django.conf import settings
+from django.http import StreamingHttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.decorators import method_decorator
+from django.utils.http import http_date
+from django.views.decorators.http import condition
+
 from drf_spectacular.types import OpenApiTypes
-from rest_framework import viewsets
+from rest_framework import viewsets, status
+from rest_framework.decorators import action
+from rest_framework.parsers import MultiPartParser
+from rest_framework.permissions import AllowAny
+from rest_framework.response import Response
 from django_filters.rest_framework import DjangoFilterBackend
 
 from drf_spectacular.utils import extend_schema_view, extend_schema, OpenApiResponse
 
 from .schema import (
     PRODUCT_ID_PARAMETER,
-    PRODUCT_NOT_FOUND_EXAMPLES
+    PRODUCT_NOT_FOUND_EXAMPLES,
+    PRODUCT_EXPORT_FORMAT_PARAMETER,
+    PRODUCT_FIELDS_PARAMETER,
+    VENDOR_ID_PARAMETER,
+    VENDOR_NOT_FOUND_EXAMPLES,
 )
 
+from apps.accounts.models import VendorProfile
+
 from .serializers import *
 from .filters import *
 from .permissions import *
+from .pagination import ProductCursorPagination
+from .selectors.product_selectors import get_all_products, get_related_products, narrow_product_queryset
+from .services.cache_services import ProductConditionalService, ProductResponseCacheService
+from .services.category_services import CategoryTreeService
+from .sparse_fields import get_requested_fields
+from .services.export_services import EXPORT_CONTENT_TYPES, ProductExportService
+from .services.import_services import ProductImportService
+from .selectors.vendor_stats_selectors import get_vendor_stats
+from .services.product_services import ProductBulkUpdateService
+from .services.vendor_stats_services import VendorStatsService
 
 @extend_schema_view(
     list=extend_schema(
+        parameters=[PRODUCT_FIELDS_PARAMETER],
         summary='List products',
-        description='List all products.',
+        description='List products newest first, paginated with an opaque `cursor`. '
+                    'Supports `If-None-Match` and `If-Modified-Since`.',
         request=ProductSerializer(many=True),
         responses={
             200: ProductSerializer(many=True),
+            304: OpenApiResponse(description='Not Modified'),
         },
     ),
     retrieve=extend_schema(
-        parameters=[PRODUCT_ID_PARAMETER],
+        parameters=[PRODUCT_ID_PARAMETER, PRODUCT_FIELDS_PARAMETER],
         summary='Retrieve product',
-        description='Retrieve a single product by ID.',
+        description='Retrieve a single product by ID. Supports `If-None-Match` and `If-Modified-Since`.',
         request=ProductSerializer,
         responses={
             200: ProductSerializer,
+            304: OpenApiResponse(description='Not Modified'),
             404: OpenApiResponse(
                 response=OpenApiTypes.OBJECT,
                 description='Product not found',
@@ -87,17 +118,214 @@ from .permissions import *
     )
 )
 class ProductsViewSet(viewsets.ModelViewSet):
-    queryset = Product.objects.all()
+    queryset = get_all_products()
     permission_classes = [IsVendor]
     filter_backends = [DjangoFilterBackend]
     filterset_class = ProductFilter
+    pagination_class = ProductCursorPagination
+
+    def get_requested_fields(self):
+        if self.action not in ['list', 'retrieve']:
+            return None
+        return get_requested_fields(self.request, ProductSerializer)
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        fields = self.get_requested_fields()
+        if fields:
+            queryset = narrow_product_queryset(queryset, fields)
+        return queryset
 
     def get_serializer_context(self):
         context = super().get_serializer_context()
         context['user'] = self.request.user
+        context['fields'] = self.get_requested_fields()
         return context
 
     def get_serializer_class(self):
         if self.action == 'create':
             return ProductCreateSerializer
-        return ProductSerializer
\ No newline at end of file
+        if self.action == 'import_products':
+            return ProductImportSerializer
+        if self.action == 'bulk_update':
+            return ProductBulkUpdateSerializer
+        return ProductSerializer
+
+    def list(self, request, *args, **kwargs):
+        versions = ProductResponseCacheService.get_list_versions(request.query_params.get('vendor'))
+        etag, last_modified = ProductConditionalService.get_list_validators(
+            self.filter_queryset(self.get_queryset()), versions
+        )
+        return self.get_conditional_response(
+            request, versions, etag, last_modified, self.list_rows, *args, **kwargs
+        )
+
+    def list_rows(self, request, *args, **kwargs):
+        row_serializer = ProductRowSerializer(self.get_requested_fields(), request)
+        page = self.paginate_queryset(row_serializer.get_rows(self.filter_queryset(self.get_queryset())))
+        return self.get_paginated_response(row_serializer.to_representation(page))
+
+    def retrieve(self, request, *args, **kwargs):
+        versions = ProductResponseCacheService.get_detail_versions(kwargs['pk'])
+        etag, last_modified = ProductConditionalService.get_detail_validators(kwargs['pk'], versions)
+        return self.get_conditional_response(
+            request, versions, etag, last_modified, super().retrieve, *args, **kwargs
+        )
+
+    @extend_schema(
+        summary='Import products',
+        description='Bulk create products of the current vendor from a CSV or JSONL file. '
+                    'Valid rows are created, invalid rows are reported by line number.',
+        request=ProductImportSerializer,
+        responses={
+            200: ProductImportResultSerializer,
+        },
+    )
+    @action(detail=False, methods=['post'], url_path='import', parser_classes=[MultiPartParser])
+    def import_products(self, request):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        result = ProductImportService(request.user.vendor_profile).run(
+            serializer.validated_data['file'], serializer.validated_data['format']
+        )
+        return Response(ProductImportResultSerializer(result).data, status=status.HTTP_200_OK)
+
+    @extend_schema(
+        summary='Bulk update price and stock',
+        description='Update `price` and/or `stock` of many products of the current vendor in one transaction.',
+        request=ProductBulkUpdateSerializer(many=True),
+        responses={
+            200: ProductBulkUpdateResultSerializer,
+        },
+    )
+    @action(detail=False, methods=['patch'], url_path='bulk-update')
+    def bulk_update(self, request):
+        serializer = self.get_serializer(data=request.data, many=True, allow_empty=False)
+        serializer.is_valid(raise_exception=True)
+        updated = ProductBulkUpdateService.update(request.user.vendor_profile, serializer.validated_data)
+        return Response(ProductBulkUpdateResultSerializer({'updated': updated}).data, status=status.HTTP_200_OK)
+
+    @extend_schema(
+        parameters=[PRODUCT_EXPORT_FORMAT_PARAMETER],
+        summary='Export products',
+        description='Stream the catalog as CSV or JSONL. Accepts the product list filters. '
+                    'Vendors export their own products, admins the whole catalog.',
+        responses={
+            (200, 'text/csv'): OpenApiTypes.STR,
+            (200, 'application/x-ndjson'): OpenApiTypes.STR,
+        },
+    )
+    @action(detail=False, methods=['get'], url_path='export', permission_classes=[IsApprovedVendorOrAdmin])
+    def export(self, request):
+        file_format = request.query_params.get('export_format', 'csv')
+        if file_format not in EXPORT_CONTENT_TYPES:
+            return Response({'export_format': ['Choose csv or jsonl.']}, status=status.HTTP_400_BAD_REQUEST)
+
+        queryset = self.filter_queryset(self.get_queryset())
+        if not request.user.is_staff:
+            queryset = queryset.filter(vendor=request.user.vendor_profile)
+
+        response = StreamingHttpResponse(
+            ProductExportService.stream(queryset, file_format), content_type=EXPORT_CONTENT_TYPES[file_format]
+        )
+        response['Content-Disposition'] = f'attachment; filename="products.{file_format}"'
+        return response
+
+    @extend_schema(
+        parameters=[PRODUCT_ID_PARAMETER],
+        summary='Related products',
+        description='Products of the same category tree ranked by shared tags, rarer tags weighing more.',
+        responses={
+            200: ProductSerializer(many=True),
+            404: OpenApiResponse(
+                response=OpenApiTypes.OBJECT,
+                description='Product not found',
+                examples=PRODUCT_NOT_FOUND_EXAMPLES
+            ),
+        },
+    )
+    @action(detail=True, methods=['get'], url_path='related')
+    def related(self, request, pk=None):
+        product = self.get_object()
+        related = get_related_products(product.pk, settings.RELATED_PRODUCTS['LIMIT'])
+        return Response(self.get_serializer(related, many=True).data, status=status.HTTP_200_OK)
+
+    def get_conditional_response(self, request, versions, etag, last_modified, view_method, *args, **kwargs):
+        not_modified = get_conditional_response(request, etag=etag, last_modified=last_modified)
+        if not_modified is not None:
+            return not_modified
+
+        response = self.get_cached_response(request, versions, view_method, *args, **kwargs)
+        if response.status_code == status.HTTP_200_OK:
+            if etag:
+                response['ETag'] = etag
+            if last_modified:
+                response['Last-Modified'] = http_date(last_modified)
+        return response
+
+    def get_cached_response(self, request, versions, view_method, *args, **kwargs):
+        key = ProductResponseCacheService.build_key(request, self.action, versions)
+
+        if ProductResponseCacheService.is_bypassed(request):
+            ProductResponseCacheService.record('bypasses')
+        else:
+            data = ProductResponseCacheService.get(key)
+            if data is not None:
+                return Response(data, status=status.HTTP_200_OK, headers={'X-Cache': 'HIT'})
+
+        response = view_method(request, *args, **kwargs)
+        if response.status_code == status.HTTP_200_OK:
+            ProductResponseCacheService.set(key, response.data)
+        response['X-Cache'] = 'MISS'
+        return response
+
+
+class CategoryViewSet(viewsets.ViewSet):
+    permission_classes = [AllowAny]
+    authentication_classes = []
+
+    @extend_schema(
+        summary='Category tree',
+        description='Retrieve the whole category tree. Supports `If-None-Match` with the returned `ETag`.',
+        responses={
+            200: CategoryTreeSerializer(many=True),
+            304: OpenApiResponse(description='Not Modified'),
+        },
+    )
+    @method_decorator(condition(etag_func=lambda request: CategoryTreeService.get_tree_etag()))
+    def list(self, request):
+        return Response(CategoryTreeService.get_tree(), status=status.HTTP_200_OK)
+
+
+class VendorStorefrontViewSet(viewsets.ViewSet):
+    permission_classes = [AllowAny]
+
+    @extend_schema(
+        parameters=[VENDOR_ID_PARAMETER],
+        summary='Vendor storefront',
+        description='Product and stock counts of an approved vendor. The vendor and admins also get '
+                    'inventory value and sales.',
+        responses={
+            200: VendorStatsSerializer,
+            404: OpenApiResponse(
+                response=OpenApiTypes.OBJECT,
+                description='Vendor not found',
+                examples=VENDOR_NOT_FOUND_EXAMPLES
+            ),
+        },
+    )
+    def retrieve(self, request, pk=None):
+        if not str(pk).isdigit():
+            return Response({'detail': 'Vendor not found'}, status=status.HTTP_404_NOT_FOUND)
+
+        stats = get_vendor_stats(pk)
+        if stats is None:
+            VendorStatsService.reconcile([pk])
+            stats = get_vendor_stats(pk)
+
+        is_owner = stats is not None and (request.user.is_staff or request.user == stats.vendor.user)
+        if stats is None or not (is_owner or stats.vendor.status == VendorProfile.Status.APPROVED):
+            return Response({'detail': 'Vendor not found'}, status=status.HTTP_404_NOT_FOUND)
+
+        fields = None if is_owner else VendorStatsSerializer.PUBLIC_FIELDS
+        return Response(VendorStatsSerializer(stats, context={'fields': fields}).data, status=status.HTTP_200_OK)
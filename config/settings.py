@@ -41,6 +41,7 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',
     'rest_framework',
     'django_extensions',
     'rest_framework_simplejwt.token_blacklist',
@@ -155,6 +156,15 @@ REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
         'rest_framework_simplejwt.authentication.JWTAuthentication',
     ),
+    'DEFAULT_RENDERER_CLASSES': (
+        'config.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ),
+    'DEFAULT_PARSER_CLASSES': (
+        'config.parsers.FastJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ),
     'DEFAULT_SCHEMA_CLASS': 'drf_spectacular.openapi.AutoSchema'
 }
 
@@ -177,6 +187,41 @@ CACHES = {
     }
 }
 
+PRODUCT_RESPONSE_CACHE = {
+    'TIMEOUT': env.int('PRODUCT_RESPONSE_CACHE_TIMEOUT', default=60 * 5),
+    'BYPASS_HEADER': env('PRODUCT_RESPONSE_CACHE_BYPASS_HEADER', default='X-Cache-Bypass'),
+}
+
+PRODUCT_THUMBNAILS = {
+    'SIZES': {
+        'small': (200, 200),
+        'medium': (480, 480),
+        'large': (960, 960),
+    },
+    'QUALITY': env.int('PRODUCT_THUMBNAILS_QUALITY', default=80),
+    'WORKERS': env.int('PRODUCT_THUMBNAILS_WORKERS', default=2),
+    'ASYNC': env.bool('PRODUCT_THUMBNAILS_ASYNC', default=True),
+}
+
+RELATED_PRODUCTS = {
+    'LIMIT': env.int('RELATED_PRODUCTS_LIMIT', default=20),
+    # Tags on more products than this in one category tree are too common to relate anything.
+    'MAX_TAG_FREQUENCY': env.int('RELATED_PRODUCTS_MAX_TAG_FREQUENCY', default=1000),
+}
+
+CART = {
+    # Anonymous carts only; signed-in users always get the database-backed UserCartBackend.
+    # apps.cart.backends.SessionCartBackend keeps the whole cart inside the session instead.
+    'BACKEND': env('CART_BACKEND', default='apps.cart.backends.RedisCartBackend'),
+    'TTL': env.int('CART_TTL', default=60 * 60 * 24 * 14),
+}
+
+STOCK_RESERVATIONS = {
+    # How long a cart holds stock after its last change, and an order until it is paid.
+    'CART_TTL': env.int('STOCK_RESERVATION_CART_TTL', default=60 * 15),
+    'ORDER_TTL': env.int('STOCK_RESERVATION_ORDER_TTL', default=60 * 60),
+}
+
 SESSION_ENGINE = 'django.contrib.sessions.backends.cache'
 SESSION_CACHE_ALIAS = 'default'
 